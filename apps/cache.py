@@ -0,0 +1,70 @@
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LocalTTLCache:
+    """Thread safe, in-process LRU cache whose entries expire after ``ttl``
+    seconds."""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                return default
+
+            expires, value = entry
+
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        with self._lock:
+            self._set(key, value, ttl, time.monotonic())
+
+    def add(self, key: Hashable, value: Any, ttl: float | None = None) -> bool:
+        """Sets the key only if it is missing or expired, returns whether it
+        was set."""
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is not None and entry[0] > now:
+                return False
+
+            self._set(key, value, ttl, now)
+
+            return True
+
+    def _set(self, key: Hashable, value: Any, ttl: float | None, now: float) -> None:
+        self._data[key] = (now + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
@@ -6,10 +6,11 @@ from django.contrib.auth import get_user_model
 from drf_spectacular.utils import extend_schema_field
 from drf_spectacular.types import OpenApiTypes
 
+from apps.metrics.serializers import MeasuredSerializerMixin
 from apps.drivers.models import Drivers
 
 
-class DriverSerializer(serializers.ModelSerializer):
+class DriverSerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
     user = serializers.SerializerMethodField()
 
     class Meta:
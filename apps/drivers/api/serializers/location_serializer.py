@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import serializers
+
+
+class DriverLocationPointSerializer(serializers.Serializer):
+    longitude = serializers.FloatField(min_value=-180, max_value=180)
+    latitude = serializers.FloatField(min_value=-90, max_value=90)
+    recorded_time = serializers.DateTimeField(required=False)
+
+    def validate_recorded_time(self, value):
+        # Tolerates some clock skew between the devices and the server.
+        if value > timezone.now() + timedelta(minutes=1):
+            raise serializers.ValidationError(_("The time is in the future."))
+
+        return value
+
+    def validate(self, attrs):
+        attrs.setdefault("recorded_time", timezone.now())
+
+        return attrs
+
+
+class DriverLocationBatchSerializer(serializers.Serializer):
+    points = DriverLocationPointSerializer(many=True, allow_empty=False)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # Read on every instance, the settings can change after the import.
+        fields["points"].max_length = settings.DRIVER_LOCATION["MAX_BATCH_SIZE"]
+
+        return fields
@@ -5,11 +5,12 @@ from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import extend_schema_field
 from drf_spectacular.types import OpenApiTypes
 
+from apps.metrics.serializers import MeasuredSerializerMixin
 from apps.drivers.models import Vehicles
 from apps.drivers.exceptions import TooManyVehiclesException
 
 
-class VehiclesSerializer(serializers.ModelSerializer):
+class VehiclesSerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
     driver = serializers.SerializerMethodField()
 
     class Meta:
@@ -12,11 +12,16 @@ from apps.drivers.service import (
     set_user_driver_active,
     set_user_driver_inactive,
     get_driver_by_user_id,
+    ingest_driver_locations,
 )
 from apps.drivers.api.serializers.driver_serializer import (
     DriverSerializer,
     CreateDriverSerializer,
 )
+from apps.drivers.api.serializers.location_serializer import (
+    DriverLocationBatchSerializer,
+)
+from apps.travels.permissions import IsDriverActivePermission
 from apps.drivers.models import Drivers
 
 
@@ -100,3 +105,25 @@ class InactiveDriverApiView(APIView):
         serializer = DriverSerializer(driver)
 
         return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+
+class DriverLocationApiView(APIView):
+    permission_classes = (
+        IsAuthenticated,
+        TokenHasReadWriteScope,
+        IsDriverActivePermission,
+    )
+
+    @extend_schema(
+        request=DriverLocationBatchSerializer,
+        responses={204: None},
+        description="Reports a batch of driver locations, the newest one is the "
+        "driver location",
+    )
+    def post(self, request):
+        serializer = DriverLocationBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        ingest_driver_locations(request.user.id, serializer.validated_data["points"])
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
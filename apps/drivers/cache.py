@@ -0,0 +1,81 @@
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import caches
+
+from apps.cache import LocalTTLCache
+from apps.drivers.service import check_user_driver_eligibility
+
+_local_cache: LocalTTLCache | None = None
+
+
+def _get_config() -> dict:
+    return getattr(settings, "DRIVER_ELIGIBILITY_CACHE", {})
+
+
+def _get_local_cache() -> LocalTTLCache:
+    global _local_cache
+
+    if _local_cache is None:
+        config = _get_config()
+        _local_cache = LocalTTLCache(
+            max_size=config.get("MAX_SIZE", 10000),
+            ttl=config.get("LOCAL_TTL", 5),
+        )
+
+    return _local_cache
+
+
+def _get_shared_cache():
+    alias = _get_config().get("CACHE_ALIAS", None)
+
+    return caches[alias] if alias else None
+
+
+def _make_key(user_id: UUID) -> str:
+    return "driver_eligibility:{0}".format(user_id)
+
+
+def get_user_driver_eligibility(user_id: UUID) -> bool:
+    """Cached ``check_user_driver_eligibility``.
+
+    Looks up the local cache, then the shared Django cache (if configured) and
+    finally the database.
+    """
+    config = _get_config()
+
+    if not config.get("ENABLED", False):
+        return check_user_driver_eligibility(user_id)
+
+    key = _make_key(user_id)
+    local_cache = _get_local_cache()
+    eligible = local_cache.get(key)
+
+    if eligible is not None:
+        return eligible
+
+    shared_cache = _get_shared_cache()
+
+    if shared_cache is not None:
+        eligible = shared_cache.get(key)
+
+    if eligible is None:
+        eligible = check_user_driver_eligibility(user_id)
+
+        if shared_cache is not None:
+            shared_cache.set(key, eligible, config.get("CACHE_TTL", 300))
+
+    local_cache.set(key, eligible)
+
+    return eligible
+
+
+def invalidate_user_driver_eligibility(user_id: UUID) -> None:
+    key = _make_key(user_id)
+
+    _get_local_cache().delete(key)
+
+    shared_cache = _get_shared_cache()
+
+    if shared_cache is not None:
+        shared_cache.delete(key)
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:00
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("drivers", "0003_alter_vehicles_driver_alter_vehicles_year"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DriverLocation",
+            fields=[
+                (
+                    "driver",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="location",
+                        serialize=False,
+                        to="drivers.drivers",
+                    ),
+                ),
+                (
+                    "point",
+                    django.contrib.gis.db.models.fields.PointField(
+                        geography=True, spatial_index=False, srid=4326
+                    ),
+                ),
+                (
+                    "updated_time",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GistIndex(
+                        fields=["point"], name="drivers_location_point_gist"
+                    )
+                ],
+            },
+        ),
+    ]
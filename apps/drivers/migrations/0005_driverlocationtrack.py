@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:00
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("drivers", "0004_driverlocation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DriverLocationTrack",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "point",
+                    django.contrib.gis.db.models.fields.PointField(
+                        geography=True, spatial_index=False, srid=4326
+                    ),
+                ),
+                ("recorded_time", models.DateTimeField()),
+                (
+                    "driver",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="location_track",
+                        to="drivers.drivers",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.BrinIndex(
+                        fields=["recorded_time"], name="drivers_track_time_brin"
+                    ),
+                    models.Index(
+                        fields=["driver", "recorded_time"],
+                        name="drivers_track_driver_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
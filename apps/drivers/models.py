@@ -3,8 +3,11 @@ import uuid
 from typing import Any
 
 from django.utils.translation import gettext_lazy as _
+from django.utils.timezone import now
 from django.db import models
 from django.conf import settings
+from django.contrib.gis.db.models import PointField
+from django.contrib.postgres.indexes import BrinIndex, GistIndex
 
 from apps.drivers.exceptions import TooManyVehiclesException
 
@@ -80,6 +83,56 @@ class Vehicles(models.Model):
         return f"{self.model} {self.year} {self.color}"
 
 
+class DriverLocation(models.Model):
+    """Last known position of a driver, one row per driver updated in place
+    so the ``Drivers`` rows aren't rewritten by the location updates."""
+
+    driver = models.OneToOneField(
+        Drivers,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="location",
+    )
+    # Indexed by the named GiST index below, not by the field's default one.
+    point = PointField(srid=4326, geography=True, spatial_index=False)
+    updated_time = models.DateTimeField(default=now)
+
+    class Meta:
+        indexes = [GistIndex(fields=["point"], name="drivers_location_point_gist")]
+
+    def __str__(self) -> str:
+        return "DriverLocation driver {0}, point: {1}".format(
+            self.driver_id, self.point.coords
+        )
+
+
+class DriverLocationTrack(models.Model):
+    """Append only history of the driver locations, enabled with
+    ``DRIVER_LOCATION["TRACK_ENABLED"]``."""
+
+    id = models.BigAutoField(primary_key=True)
+    driver = models.ForeignKey(
+        Drivers, on_delete=models.CASCADE, related_name="location_track"
+    )
+    # Only read by driver and time, a spatial index would just slow the inserts.
+    point = PointField(srid=4326, geography=True, spatial_index=False)
+    recorded_time = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # The rows are appended in time order, a BRIN index stays tiny.
+            BrinIndex(fields=["recorded_time"], name="drivers_track_time_brin"),
+            models.Index(
+                fields=["driver", "recorded_time"], name="drivers_track_driver_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return "DriverLocationTrack driver {0}, point: {1}".format(
+            self.driver_id, self.point.coords
+        )
+
+
 # class Rating(models.Model):
 #     driver = models.ForeignKey(Driver, on_delete=models.CASCADE)
 #     from_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -1,6 +1,17 @@
+from contextlib import nullcontext
+from operator import itemgetter
 from uuid import UUID
 
-from apps.drivers.models import Drivers, Vehicles
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+
+from apps.drivers.models import (
+    Drivers,
+    DriverLocation,
+    DriverLocationTrack,
+    Vehicles,
+)
 from apps.drivers.exceptions import (
     DriverDoesNotHaveVehiclesException,
     DriverIsActiveException,
@@ -11,7 +22,7 @@ from apps.drivers.exceptions import (
 
 def get_driver_by_user_id(user_id: UUID) -> Drivers:
     try:
-        driver = Drivers.objects.get(user__id=user_id)
+        driver = Drivers.objects.select_related("user").get(user__id=user_id)
     except Drivers.DoesNotExist:
         raise DriverDoesNotExistException
 
@@ -42,6 +53,26 @@ def set_user_driver_inactive(user_id: UUID) -> Drivers:
     return driver
 
 
+def check_user_driver_eligibility(user_id: UUID) -> bool:
+    """Returns True if the user is an active driver with vehicles, an active
+    driver without vehicles is set inactive."""
+    driver = (
+        Drivers.objects.filter(user__id=user_id)
+        .annotate(with_vehicles=Exists(Vehicles.objects.filter(driver=OuterRef("pk"))))
+        .values("is_active", "with_vehicles")
+        .first()
+    )
+
+    if driver is None:
+        return False
+
+    if driver["is_active"] and not driver["with_vehicles"]:
+        set_user_driver_inactive(user_id)
+        return False
+
+    return driver["is_active"]
+
+
 def delete_vehicle_by_id_and_driver_id(vehicle_id: UUID, driver_id: UUID) -> None:
     try:
         Vehicles.objects.get(id=vehicle_id, driver__id=driver_id).delete()
@@ -56,3 +87,62 @@ def get_vehicle_by_id(vehicle_id: UUID) -> Vehicles:
         raise VehicleDoesNotExistsException
 
     return vehicle
+
+
+def ingest_driver_locations(user_id: UUID, points: list[dict]) -> None:
+    """Stores the newest of ``points`` as the location of the user's driver and,
+    if the track is enabled, appends all of them to the track.
+
+    ``points`` are dicts with ``longitude``, ``latitude`` and
+    ``recorded_time``. Each table is written with a single statement keyed by
+    the user id, without loading the driver, and an older point never
+    overwrites a newer location.
+    """
+    latest = max(points, key=itemgetter("recorded_time"))
+
+    drivers_table = Drivers._meta.db_table
+    location_table = DriverLocation._meta.db_table
+    track_table = DriverLocationTrack._meta.db_table
+
+    track_enabled = settings.DRIVER_LOCATION["TRACK_ENABLED"]
+
+    # A single statement does not need a transaction of its own.
+    with transaction.atomic() if track_enabled else nullcontext():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {location_table} (driver_id, point, updated_time)
+                SELECT id, ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography, %s
+                FROM {drivers_table} WHERE user_id = %s
+                ON CONFLICT (driver_id) DO UPDATE
+                SET point = EXCLUDED.point, updated_time = EXCLUDED.updated_time
+                WHERE {location_table}.updated_time < EXCLUDED.updated_time
+                """,
+                [
+                    latest["longitude"],
+                    latest["latitude"],
+                    latest["recorded_time"],
+                    user_id,
+                ],
+            )
+
+            if track_enabled:
+                cursor.execute(
+                    f"""
+                    INSERT INTO {track_table} (driver_id, point, recorded_time)
+                    SELECT
+                        d.id,
+                        ST_SetSRID(ST_MakePoint(p.longitude, p.latitude), 4326)::geography,
+                        p.recorded_time
+                    FROM {drivers_table} d,
+                        unnest(%s::float8[], %s::float8[], %s::timestamptz[])
+                        AS p(longitude, latitude, recorded_time)
+                    WHERE d.user_id = %s
+                    """,
+                    [
+                        [point["longitude"] for point in points],
+                        [point["latitude"] for point in points],
+                        [point["recorded_time"] for point in points],
+                        user_id,
+                    ],
+                )
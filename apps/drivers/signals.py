@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.drivers.models import Drivers, Vehicles
+from apps.drivers.cache import invalidate_user_driver_eligibility
+
+
+def _invalidate(user_id):
+    # Invalidated now and again on commit, so a concurrent request can not
+    # cache the old state while the transaction is still open.
+    invalidate_user_driver_eligibility(user_id)
+    transaction.on_commit(lambda: invalidate_user_driver_eligibility(user_id))
+
+
+def _get_vehicle_user_id(vehicle: Vehicles):
+    if Vehicles.driver.is_cached(vehicle):
+        return vehicle.driver.user_id
+
+    return (
+        Drivers.objects.filter(id=vehicle.driver_id)
+        .values_list("user_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Drivers)
+@receiver(post_delete, sender=Drivers)
+def invalidate_driver_eligibility(sender, instance, **kwargs):
+    _invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=Vehicles)
+@receiver(post_delete, sender=Vehicles)
+def invalidate_vehicle_driver_eligibility(sender, instance, **kwargs):
+    user_id = _get_vehicle_user_id(instance)
+
+    if user_id is not None:
+        _invalidate(user_id)
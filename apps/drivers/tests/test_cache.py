@@ -0,0 +1,148 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.auth import get_user_model
+
+from apps.cache import LocalTTLCache
+from apps.drivers.cache import get_user_driver_eligibility
+from apps.drivers.models import Drivers, Vehicles
+
+USER_MODEL = get_user_model()
+
+
+class LocalTTLCacheTestCase(SimpleTestCase):
+    def test_get_set_delete(self):
+        local_cache = LocalTTLCache(max_size=10, ttl=60)
+        local_cache.set("key", True)
+
+        self.assertTrue(local_cache.get("key"))
+
+        local_cache.delete("key")
+
+        self.assertIsNone(local_cache.get("key"))
+
+    def test_lru_eviction(self):
+        local_cache = LocalTTLCache(max_size=2, ttl=60)
+        local_cache.set("a", 1)
+        local_cache.set("b", 2)
+        local_cache.get("a")
+        local_cache.set("c", 3)
+
+        self.assertEqual(local_cache.get("a"), 1)
+        self.assertIsNone(local_cache.get("b"))
+        self.assertEqual(local_cache.get("c"), 3)
+        self.assertEqual(len(local_cache), 2)
+
+    @patch("apps.cache.time.monotonic")
+    def test_add(self, mock):
+        mock.return_value = 100
+        local_cache = LocalTTLCache(max_size=10, ttl=5)
+
+        self.assertTrue(local_cache.add("key", 1))
+        self.assertFalse(local_cache.add("key", 2))
+        self.assertEqual(local_cache.get("key"), 1)
+
+        mock.return_value = 105
+
+        self.assertTrue(local_cache.add("key", 3))
+        self.assertEqual(local_cache.get("key"), 3)
+
+    @patch("apps.cache.time.monotonic")
+    def test_ttl_expiration(self, mock):
+        mock.return_value = 100
+        local_cache = LocalTTLCache(max_size=10, ttl=5)
+        local_cache.set("key", True)
+
+        mock.return_value = 104
+        self.assertTrue(local_cache.get("key"))
+
+        mock.return_value = 105
+        self.assertIsNone(local_cache.get("key"))
+
+
+class GetUserDriverEligibilityTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user = USER_MODEL.objects.create_user(
+            username="te122stpepe",
+            email="trest21@gmail.com",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.driver = Drivers.objects.create(user=self.user, is_active=True)
+        self.vehicle = Vehicles.objects.create(
+            driver=self.driver,
+            plate_number="1234",
+            model="asas",
+            year=1234,
+            color="blue",
+        )
+
+    def test_cached_eligibility(self):
+        self.assertTrue(get_user_driver_eligibility(self.user.id))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(get_user_driver_eligibility(self.user.id))
+
+    def test_two_vehicles(self):
+        Vehicles.objects.create(
+            driver=self.driver,
+            plate_number="4321",
+            model="asas",
+            year=1234,
+            color="red",
+        )
+
+        self.assertTrue(get_user_driver_eligibility(self.user.id))
+
+    def test_not_driver(self):
+        self.driver.delete()
+
+        self.assertFalse(get_user_driver_eligibility(self.user.id))
+
+    def test_invalidated_on_driver_inactive(self):
+        self.assertTrue(get_user_driver_eligibility(self.user.id))
+
+        self.driver.set_inactive()
+
+        self.assertFalse(get_user_driver_eligibility(self.user.id))
+
+        self.driver.set_active()
+
+        self.assertTrue(get_user_driver_eligibility(self.user.id))
+
+    def test_invalidated_on_vehicle_delete(self):
+        self.assertTrue(get_user_driver_eligibility(self.user.id))
+
+        Vehicles.objects.get(id=self.vehicle.id).delete()
+
+        self.assertFalse(get_user_driver_eligibility(self.user.id))
+        self.assertFalse(Drivers.objects.get(id=self.driver.id).is_active)
+
+    def test_invalidated_on_driver_delete(self):
+        self.assertTrue(get_user_driver_eligibility(self.user.id))
+
+        self.user.delete()
+
+        self.assertFalse(get_user_driver_eligibility(self.user.id))
+
+    @override_settings(
+        DRIVER_ELIGIBILITY_CACHE={"ENABLED": True, "CACHE_ALIAS": "default"}
+    )
+    def test_shared_cache(self):
+        self.assertTrue(get_user_driver_eligibility(self.user.id))
+        self.assertTrue(cache.get("driver_eligibility:{0}".format(self.user.id)))
+
+        self.driver.set_inactive()
+
+        self.assertIsNone(cache.get("driver_eligibility:{0}".format(self.user.id)))
+        self.assertFalse(get_user_driver_eligibility(self.user.id))
+
+    @override_settings(DRIVER_ELIGIBILITY_CACHE={"ENABLED": False})
+    def test_disabled(self):
+        self.assertTrue(get_user_driver_eligibility(self.user.id))
+
+        with self.assertNumQueries(1):
+            self.assertTrue(get_user_driver_eligibility(self.user.id))
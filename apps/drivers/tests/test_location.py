@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.urls import reverse_lazy
+from django.utils import timezone
+
+from apps.drivers.models import Drivers, DriverLocation, DriverLocationTrack, Vehicles
+from apps.drivers.tests.core import BaseViewTestCase
+from apps.metrics.testing import QueryBudgetTestMixin
+
+LOCATION_SETTINGS = {"MAX_BATCH_SIZE": 100, "TRACK_ENABLED": True}
+
+
+class DriverLocationApiViewTestCase(QueryBudgetTestMixin, BaseViewTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.driver = Drivers.objects.create(user=self.user, is_active=True)
+        Vehicles.objects.create(
+            driver=self.driver,
+            plate_number="1234",
+            model="asas",
+            year=1234,
+            color="blue",
+        )
+        self.url = reverse_lazy("drivers:driver_location")
+
+    def _post(self, points):
+        return self.client.post(
+            self.url,
+            {"points": points},
+            format="json",
+            headers={"Authorization": self.authorization},
+        )
+
+    def test_upsert_latest_location(self):
+        now = timezone.now()
+
+        res = self._post(
+            [
+                {"longitude": 1, "latitude": 1, "recorded_time": now.isoformat()},
+                {
+                    "longitude": 2,
+                    "latitude": 2,
+                    "recorded_time": (now - timedelta(seconds=5)).isoformat(),
+                },
+            ]
+        )
+
+        self.assertEqual(res.status_code, 204)
+        self.assertWithinQueryBudget(res)
+        self.assertEqual(DriverLocation.objects.get().point.coords, (1, 1))
+
+        res = self._post([{"longitude": 3, "latitude": 3}])
+        location = DriverLocation.objects.get()
+
+        self.assertEqual(location.point.coords, (3, 3))
+        self.assertGreater(location.updated_time, now)
+
+    def test_older_point_does_not_overwrite(self):
+        self._post([{"longitude": 1, "latitude": 1}])
+        self._post(
+            [
+                {
+                    "longitude": 2,
+                    "latitude": 2,
+                    "recorded_time": (
+                        timezone.now() - timedelta(minutes=1)
+                    ).isoformat(),
+                }
+            ]
+        )
+
+        self.assertEqual(DriverLocation.objects.get().point.coords, (1, 1))
+
+    @override_settings(DRIVER_LOCATION=LOCATION_SETTINGS)
+    def test_track(self):
+        self._post([{"longitude": 1, "latitude": 1}, {"longitude": 2, "latitude": 2}])
+
+        self.assertEqual(
+            DriverLocationTrack.objects.filter(driver=self.driver).count(), 2
+        )
+
+    def test_track_disabled(self):
+        self._post([{"longitude": 1, "latitude": 1}])
+
+        self.assertFalse(DriverLocationTrack.objects.exists())
+
+    def test_invalid_points(self):
+        self.assertEqual(self._post([]).status_code, 400)
+        self.assertEqual(
+            self._post([{"longitude": 200, "latitude": 1}]).status_code, 400
+        )
+        self.assertEqual(
+            self._post(
+                [
+                    {
+                        "longitude": 1,
+                        "latitude": 1,
+                        "recorded_time": (
+                            timezone.now() + timedelta(hours=1)
+                        ).isoformat(),
+                    }
+                ]
+            ).status_code,
+            400,
+        )
+        self.assertEqual(
+            self._post([{"longitude": 1, "latitude": 1}] * 101).status_code, 400
+        )
+
+    @override_settings(DRIVER_LOCATION={**LOCATION_SETTINGS, "MAX_BATCH_SIZE": 2})
+    def test_max_batch_size_setting(self):
+        points = [{"longitude": 1, "latitude": 1}]
+
+        self.assertEqual(self._post(points * 3).status_code, 400)
+        self.assertEqual(self._post(points * 2).status_code, 204)
+
+    def test_inactive_driver(self):
+        self.driver.set_inactive()
+
+        res = self._post([{"longitude": 1, "latitude": 1}])
+
+        self.assertEqual(res.status_code, 403)
+        self.assertFalse(DriverLocation.objects.exists())
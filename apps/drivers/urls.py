@@ -6,6 +6,7 @@ from apps.drivers.api.views.drivers_views import (
     DriverInfoApiView,
     DriverMeInfoApiView,
     CreateDriverApiView,
+    DriverLocationApiView,
 )
 from apps.drivers.api.views.vehicles_views import (
     VehiclesCreationApiView,
@@ -21,6 +22,7 @@ driver_urlpatterns = [
     path("driverme/", DriverMeInfoApiView.as_view(), name="driver_me_info"),
     path("activate/", ActivateDriverApiView.as_view(), name="driver_activate"),
     path("inactive/", InactiveDriverApiView.as_view(), name="driver_inactivate"),
+    path("location/", DriverLocationApiView.as_view(), name="driver_location"),
     path("driver/<str:username>/", DriverInfoApiView.as_view(), name="driver_info"),
 ]
 
@@ -0,0 +1,20 @@
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Returns the process wide broker configured by ``EVENTS_BROKER``."""
+    global _broker
+
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                config = settings.EVENTS_BROKER
+                _broker = import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+    return _broker
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import logging
+import threading
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Messages published to the channels, read from the event loop which
+    subscribed.
+
+    When the consumer falls ``max_size`` messages behind the subscription is
+    marked as overflowed and stops receiving messages, the consumer must
+    subscribe again and reload its state.
+    """
+
+    def __init__(self, broker, channels: tuple[str, ...], max_size: int) -> None:
+        self.broker = broker
+        self.channels = channels
+        self.overflowed = False
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(max_size)
+
+    def put(self, message: dict) -> None:
+        """Thread safe, it can be called from outside the event loop."""
+        try:
+            self._loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # The event loop is closed, the consumer is gone.
+            self.close()
+
+    def _put(self, message: dict) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning(f"Subscription to {', '.join(self.channels)} overflowed")
+            self.overflowed = True
+            self.close()
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        """Returns the next message, or ``None`` after ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class InMemoryBroker:
+    """Publish/subscribe between the threads and event loops of a single
+    process."""
+
+    def __init__(self, max_size: int = 1000) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, set[Subscription]] = {}
+
+    def subscribe(self, *channels: str) -> Subscription:
+        subscription = Subscription(self, channels, self.max_size)
+
+        with self._lock:
+            for channel in channels:
+                self._subscriptions.setdefault(channel, set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for channel in subscription.channels:
+                subscriptions = self._subscriptions.get(channel, set())
+                subscriptions.discard(subscription)
+
+                if not subscriptions:
+                    self._subscriptions.pop(channel, None)
+
+    def publish(self, channel: str, message: dict) -> None:
+        with self._lock:
+            subscriptions = tuple(self._subscriptions.get(channel, ()))
+
+        for subscription in subscriptions:
+            subscription.put(message)
+
+
+class RedisSubscription(Subscription):
+    def __init__(self, broker, channels: tuple[str, ...], max_size: int) -> None:
+        super().__init__(broker, channels, max_size)
+        self._reader = self._loop.create_task(self._read())
+
+    async def _read(self) -> None:
+        from redis import asyncio as aioredis
+
+        client = aioredis.Redis.from_url(self.broker.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+
+        try:
+            # A single connection for all the channels.
+            await pubsub.subscribe(*self.channels)
+
+            async for message in pubsub.listen():
+                self._put(json.loads(message["data"]))
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+
+class RedisBroker:
+    """Publish/subscribe between processes through Redis channels, the
+    messages must be JSON serializable."""
+
+    def __init__(self, url: str, max_size: int = 1000) -> None:
+        import redis
+
+        self.url = url
+        self.max_size = max_size
+        self._client = redis.Redis.from_url(url)
+
+    def subscribe(self, *channels: str) -> RedisSubscription:
+        return RedisSubscription(self, channels, self.max_size)
+
+    def unsubscribe(self, subscription: RedisSubscription) -> None:
+        subscription._reader.cancel()
+
+    def publish(self, channel: str, message: dict) -> None:
+        self._client.publish(channel, json.dumps(message, cls=DjangoJSONEncoder))
@@ -0,0 +1,48 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+
+from django.db import connections
+
+
+def close_old_connections() -> None:
+    """``django.db.close_old_connections``, except for the connections in an
+    atomic block (as the tests run) which are left to their transaction."""
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close_if_unusable_or_obsolete()
+
+
+def database_sync_to_async(func):
+    """``sync_to_async`` for the ORM calls made outside of the request cycle,
+    as the websockets do. The thread's connections past ``CONN_MAX_AGE`` or
+    broken are closed before and after the call, as ``request_started`` and
+    ``request_finished`` do for the requests."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(wrapper)
+
+
+async def sync_iterator_to_async(iterator):
+    """Iterates a sync ``iterator`` that reads the database from the event loop,
+    as ``StreamingHttpResponse`` needs under ASGI. Every step runs in the
+    request's sync thread, so a server side cursor keeps its connection."""
+    iterator = iter(iterator)
+    next_item = sync_to_async(next, thread_sensitive=True)
+    end = object()
+
+    while True:
+        item = await next_item(iterator, end)
+
+        if item is end:
+            return
+
+        yield item
@@ -0,0 +1,27 @@
+from django.urls import URLPattern
+
+
+class WebSocketRouter:
+    """ASGI application dispatching the websocket connections to the consumer
+    of the first matching pattern, eg:
+
+    WebSocketRouter([path("ws/travel/<int:travel_id>/", consumer)])
+
+    The consumers are called as ``consumer(scope, receive, send, **kwargs)``.
+    """
+
+    def __init__(self, patterns: list[URLPattern]) -> None:
+        self.patterns = patterns
+
+    async def __call__(self, scope, receive, send):
+        path = scope["path"].lstrip("/")
+
+        for pattern in self.patterns:
+            match = pattern.resolve(path)
+
+            if match is not None:
+                return await match.func(scope, receive, send, **match.kwargs)
+
+        # Unknown path, reject the handshake.
+        await receive()
+        await send({"type": "websocket.close", "code": 4404})
@@ -0,0 +1,140 @@
+import hashlib
+import json
+
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from drf_spectacular.openapi import OpenApiParameter, OpenApiTypes
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name=IDEMPOTENCY_KEY_HEADER,
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description="Retries sent with the same key get the response of the first request",
+)
+
+# Stored while the first request with a key is running.
+_IN_PROGRESS = "in_progress"
+
+
+class InvalidIdempotencyKey(APIException):
+    status_code = 400
+    default_detail = _("The Idempotency-Key header is empty or too long")
+    default_code = "idempotency_error"
+
+
+class IdempotencyKeyInProgress(APIException):
+    status_code = 409
+    default_detail = _("A request with this Idempotency-Key is in progress")
+    default_code = "idempotency_error"
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = 422
+    default_detail = _("The Idempotency-Key was used with another request")
+    default_code = "idempotency_error"
+
+
+def _get_config() -> dict:
+    return getattr(settings, "IDEMPOTENCY", {})
+
+
+def _get_store():
+    """The shared Django cache of the keys, a per process store would miss the
+    retries reaching another worker."""
+    alias = _get_config().get("CACHE_ALIAS", None)
+
+    if not alias:
+        raise ImproperlyConfigured(
+            "IDEMPOTENCY['CACHE_ALIAS'] is required to enable the idempotency keys"
+        )
+
+    return caches[alias]
+
+
+def _make_key(user_id, idempotency_key: str) -> str:
+    return "idempotency:{0}:{1}".format(
+        user_id, hashlib.sha256(idempotency_key.encode()).hexdigest()
+    )
+
+
+def _get_fingerprint(request) -> str:
+    payload = json.dumps(
+        [request.method, request.path, request.data], sort_keys=True, default=str
+    )
+
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def idempotent(handler):
+    """Replays the stored response of the requests retried with the same
+    ``Idempotency-Key`` header by the same user, without running ``handler``.
+
+    The responses (including the client errors, but not the server errors) are
+    kept for ``IDEMPOTENCY["TTL"]`` seconds. A key reused with another method,
+    path or body fails with 422 and a key whose first request is still running
+    fails with 409.
+    """
+
+    @wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        config = _get_config()
+        idempotency_key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+
+        if not config.get("ENABLED", False) or idempotency_key is None:
+            return handler(view, request, *args, **kwargs)
+
+        if not idempotency_key or len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise InvalidIdempotencyKey
+
+        store = _get_store()
+        key = _make_key(request.user.id, idempotency_key)
+        fingerprint = _get_fingerprint(request)
+
+        if not store.add(key, _IN_PROGRESS, config.get("LOCK_TTL", 30)):
+            stored = store.get(key)
+
+            if stored is None or stored == _IN_PROGRESS:
+                raise IdempotencyKeyInProgress
+
+            stored_fingerprint, status_code, data = stored
+
+            if stored_fingerprint != fingerprint:
+                raise IdempotencyKeyReused
+
+            return Response(
+                data, status=status_code, headers={IDEMPOTENT_REPLAYED_HEADER: "true"}
+            )
+
+        try:
+            response = handler(view, request, *args, **kwargs)
+        except APIException as exc:
+            response = view.handle_exception(exc)
+        except Exception:
+            store.delete(key)
+            raise
+
+        if response.status_code < 500:
+            store.set(
+                key,
+                (fingerprint, response.status_code, response.data),
+                config.get("TTL", 86400),
+            )
+        else:
+            store.delete(key)
+
+        return response
+
+    return wrapper
@@ -0,0 +1,52 @@
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+logger = logging.getLogger(__name__)
+
+
+def make_email(subject: str, message: str, recipient_list: list[str]) -> dict:
+    """JSON serializable email for ``send_emails``."""
+    return {"subject": subject, "message": message, "recipient_list": recipient_list}
+
+
+def send_emails(emails: list[dict], connection=None) -> list[dict]:
+    """Sends the ``make_email`` emails over a single connection of the email
+    backend, instead of a connection (and a handshake) per email as
+    ``send_mail`` does.
+
+    Each email is sent on its own, so a failure doesn't stop the rest and the
+    sent ones aren't sent again by a retry. Returns the failed emails.
+    """
+    if not emails:
+        return []
+
+    if connection is None:
+        connection = get_connection(fail_silently=False)
+
+    failed = []
+    # Opened once here, send_messages would open and close it on every call.
+    opened = connection.open()
+
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email["subject"],
+                body=email["message"],
+                from_email=settings.EMAIL_HOST_USER,
+                to=email["recipient_list"],
+            )
+
+            try:
+                connection.send_messages([message])
+            except Exception:
+                logger.warning(
+                    "Email to %s failed", email["recipient_list"], exc_info=True
+                )
+                failed.append(email)
+    finally:
+        if opened:
+            connection.close()
+
+    return failed
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.db import connection
+
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from apps.cache import LocalTTLCache
+from apps.outbox.models import OutboxMessage
+from apps.travels.models import RequestTravel, Travel
+
+_database_values = LocalTTLCache(max_size=1)
+
+
+def _count_database_values() -> dict:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COALESCE(state, 'unknown'), COUNT(*) FROM pg_stat_activity "
+            "WHERE datname = current_database() GROUP BY 1"
+        )
+        connections = cursor.fetchall()
+
+    return {
+        "connections": connections,
+        "request_travels_pending": RequestTravel.objects.pending().count(),
+        "travels_in_course": Travel.objects.filter(status=Travel.IN_COURSE).count(),
+        "outbox_messages": OutboxMessage.objects.count(),
+    }
+
+
+def get_database_values() -> dict:
+    """The database counts, refreshed at most every
+    ``METRICS["REFRESH_SECONDS"]`` however often the metrics are scraped."""
+    values = _database_values.get("values")
+
+    if values is None:
+        values = _count_database_values()
+        _database_values.set("values", values, settings.METRICS["REFRESH_SECONDS"])
+
+    return values
+
+
+class DatabaseCollector(Collector):
+    """Collects the database gauges when the metrics are scraped, so they cost
+    a few queries per refresh and nothing per request."""
+
+    def collect(self):
+        values = get_database_values()
+
+        connections = GaugeMetricFamily(
+            "riding_db_connections",
+            "Connections to the database by state.",
+            labels=["state"],
+        )
+
+        for state, count in values["connections"]:
+            connections.add_metric([state], count)
+
+        yield connections
+
+        yield GaugeMetricFamily(
+            "riding_request_travels_pending",
+            "Pending and not expired request travels.",
+            value=values["request_travels_pending"],
+        )
+
+        travels = GaugeMetricFamily(
+            "riding_travels", "Travels by status.", labels=["status"]
+        )
+        travels.add_metric([Travel.IN_COURSE], values["travels_in_course"])
+
+        yield travels
+
+        yield GaugeMetricFamily(
+            "riding_outbox_messages",
+            "Outbox messages waiting for the relay.",
+            value=values["outbox_messages"],
+        )
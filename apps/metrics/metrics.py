@@ -0,0 +1,59 @@
+from prometheus_client import Counter, Histogram
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+QUERIES_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+REQUEST_LATENCY = Histogram(
+    "riding_http_request_duration_seconds",
+    "Wall time of the requests.",
+    ["view", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "riding_http_request_db_queries",
+    "Database queries issued by the requests.",
+    ["view"],
+    buckets=QUERIES_BUCKETS,
+)
+REQUEST_SQL_TIME = Histogram(
+    "riding_http_request_db_duration_seconds",
+    "Time spent in the database by the requests.",
+    ["view"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_SERIALIZER_TIME = Histogram(
+    "riding_http_request_serializer_duration_seconds",
+    "Time spent serializing the responses.",
+    ["view"],
+    buckets=LATENCY_BUCKETS,
+)
+
+CELERY_TASK_DURATION = Histogram(
+    "riding_celery_task_duration_seconds",
+    "Run time of the Celery tasks.",
+    ["task", "state"],
+    buckets=LATENCY_BUCKETS + (30.0, 60.0, 300.0),
+)
+CELERY_TASK_RETRIES = Counter(
+    "riding_celery_task_retries_total",
+    "Retries of the Celery tasks.",
+    ["task"],
+)
+CELERY_TASK_FAILURES = Counter(
+    "riding_celery_task_failures_total",
+    "Failures of the Celery tasks.",
+    ["task"],
+)
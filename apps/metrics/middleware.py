@@ -0,0 +1,120 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from apps.metrics.metrics import (
+    REQUEST_LATENCY,
+    REQUEST_QUERIES,
+    REQUEST_SQL_TIME,
+    REQUEST_SERIALIZER_TIME,
+)
+from apps.metrics.recorder import QueryRecorder, record_request_metrics
+
+logger = logging.getLogger(__name__)
+
+UNRESOLVED_VIEW_NAME = "<unresolved>"
+
+
+class RequestMetricsMiddleware:
+    """Records the query count, SQL time, serializer time and wall time of
+    every request by resolved URL name.
+
+    The measurements are attached to the response as ``request_metrics``,
+    exposed as ``Server-Timing`` headers when ``DEBUG`` is on and aggregated
+    in the metrics endpoint histograms.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+
+        with record_request_metrics() as metrics:
+            with connection.execute_wrapper(QueryRecorder(metrics)):
+                response = self.get_response(request)
+
+        metrics.view_name = self._get_view_name(request)
+        response.request_metrics = metrics
+
+        if response.streaming:
+            # The content is produced as it is sent, after the view returned,
+            # the request is observed once it is fully sent.
+            response.streaming_content = self._observe_stream(
+                request, response, metrics, start
+            )
+
+            return response
+
+        self._finish(request, response, metrics, start)
+
+        if settings.DEBUG:
+            response["X-Query-Count"] = metrics.queries
+            response["Server-Timing"] = (
+                "db;dur={0:.2f}, serializer;dur={1:.2f}, total;dur={2:.2f}".format(
+                    metrics.sql_time * 1000,
+                    metrics.serializer_time * 1000,
+                    metrics.wall_time * 1000,
+                )
+            )
+
+        return response
+
+    def _observe_stream(self, request, response, metrics, start):
+        content = response.streaming_content
+
+        if response.is_async:
+
+            async def observe():
+                try:
+                    async for chunk in content:
+                        yield chunk
+                finally:
+                    self._finish(request, response, metrics, start)
+
+        else:
+
+            def observe():
+                try:
+                    yield from content
+                finally:
+                    self._finish(request, response, metrics, start)
+
+        return observe()
+
+    def _finish(self, request, response, metrics, start) -> None:
+        metrics.wall_time = time.perf_counter() - start
+
+        self._observe(request, response, metrics)
+        self._check_query_budget(metrics)
+
+    def _get_view_name(self, request) -> str:
+        resolver_match = getattr(request, "resolver_match", None)
+
+        if resolver_match is None:
+            return UNRESOLVED_VIEW_NAME
+
+        return resolver_match.view_name
+
+    def _observe(self, request, response, metrics) -> None:
+        view_name = metrics.view_name
+
+        REQUEST_LATENCY.labels(view_name, request.method, response.status_code).observe(
+            metrics.wall_time
+        )
+        REQUEST_QUERIES.labels(view_name).observe(metrics.queries)
+        REQUEST_SQL_TIME.labels(view_name).observe(metrics.sql_time)
+        REQUEST_SERIALIZER_TIME.labels(view_name).observe(metrics.serializer_time)
+
+    def _check_query_budget(self, metrics) -> None:
+        budget = settings.QUERY_BUDGETS.get(metrics.view_name, None)
+
+        if budget is not None and metrics.queries > budget:
+            logger.warning(
+                "%s issued %s queries, its budget is %s",
+                metrics.view_name,
+                metrics.queries,
+                budget,
+            )
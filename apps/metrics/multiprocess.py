@@ -0,0 +1,39 @@
+import os
+
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+
+from apps.metrics.collectors import DatabaseCollector
+
+
+def is_multiprocess() -> bool:
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+def get_registry() -> CollectorRegistry:
+    """Registry to scrape. With ``PROMETHEUS_MULTIPROC_DIR`` set, the metrics
+    of every process (gunicorn and Celery workers sharing the directory) are
+    merged from their files."""
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = CollectorRegistry()
+        registry.register(_DefaultRegistryCollector())
+
+    registry.register(DatabaseCollector())
+
+    return registry
+
+
+class _DefaultRegistryCollector:
+    def collect(self):
+        return REGISTRY.collect()
+
+
+def child_exit(server, worker):
+    """Gunicorn ``child_exit`` hook, eg: in the gunicorn config file
+
+    from apps.metrics.multiprocess import child_exit
+    """
+    if is_multiprocess():
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,109 @@
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connection
+
+
+class RequestMetrics:
+    """Measurements of a single request."""
+
+    __slots__ = (
+        "view_name",
+        "queries",
+        "sql_time",
+        "serializer_time",
+        "wall_time",
+        "_serializing",
+    )
+
+    def __init__(self) -> None:
+        self.view_name = None
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.wall_time = 0.0
+        self._serializing = False
+
+
+_current_metrics: ContextVar[RequestMetrics | None] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def get_current_metrics() -> RequestMetrics | None:
+    return _current_metrics.get()
+
+
+@contextmanager
+def record_request_metrics():
+    metrics = RequestMetrics()
+    token = _current_metrics.set(metrics)
+
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+class QueryRecorder:
+    """Database execute wrapper that counts and times the queries."""
+
+    def __init__(self, metrics: RequestMetrics) -> None:
+        self.metrics = metrics
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.metrics.queries += 1
+            self.metrics.sql_time += time.perf_counter() - start
+
+
+_STREAM_END = object()
+
+
+def record_stream_queries(iterator):
+    """Counts in the current request metrics the queries issued while
+    ``iterator`` is consumed, for the content streamed after the view returned.
+    Each step runs with the recorder on the connection of the thread running it.
+    """
+    metrics = _current_metrics.get()
+
+    if metrics is None:
+        return iterator
+
+    return _record_stream_queries(iter(iterator), metrics)
+
+
+def _record_stream_queries(iterator, metrics: RequestMetrics):
+    while True:
+        with connection.execute_wrapper(QueryRecorder(metrics)):
+            item = next(iterator, _STREAM_END)
+
+        if item is _STREAM_END:
+            return
+
+        yield item
+
+
+@contextmanager
+def record_serializer_time():
+    metrics = _current_metrics.get()
+
+    # Nested serializers are already accounted by the outermost one.
+    if metrics is None or metrics._serializing:
+        yield
+        return
+
+    metrics._serializing = True
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - start
+        metrics._serializing = False
@@ -0,0 +1,11 @@
+from apps.metrics.recorder import record_serializer_time
+
+
+class MeasuredSerializerMixin:
+    """Adds the time spent building the representation to the request
+    metrics, it also covers ``many=True`` since the list serializer calls the
+    child ``to_representation`` for every item."""
+
+    def to_representation(self, instance):
+        with record_serializer_time():
+            return super().to_representation(instance)
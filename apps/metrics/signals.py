@@ -0,0 +1,38 @@
+import time
+
+from celery import signals
+
+from apps.metrics.metrics import (
+    CELERY_TASK_DURATION,
+    CELERY_TASK_FAILURES,
+    CELERY_TASK_RETRIES,
+)
+
+_task_started: dict[str, float] = {}
+
+
+@signals.task_prerun.connect
+def task_prerun_handler(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@signals.task_postrun.connect
+def task_postrun_handler(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+
+    if started is None:
+        return
+
+    CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(
+        time.perf_counter() - started
+    )
+
+
+@signals.task_retry.connect
+def task_retry_handler(sender=None, **kwargs):
+    CELERY_TASK_RETRIES.labels(sender.name).inc()
+
+
+@signals.task_failure.connect
+def task_failure_handler(sender=None, **kwargs):
+    CELERY_TASK_FAILURES.labels(sender.name).inc()
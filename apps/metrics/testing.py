@@ -0,0 +1,22 @@
+from django.conf import settings
+
+
+class QueryBudgetTestMixin:
+    """TestCase mixin to check the query budgets declared in
+    ``settings.QUERY_BUDGETS``, it needs ``RequestMetricsMiddleware``.
+
+    Eg: self.assertWithinQueryBudget(self.client.get(url))
+    """
+
+    def assertWithinQueryBudget(self, response, budget: int | None = None):
+        metrics = response.request_metrics
+
+        if budget is None:
+            budget = settings.QUERY_BUDGETS[metrics.view_name]
+
+        if metrics.queries > budget:
+            self.fail(
+                "{0} issued {1} queries, its budget is {2}".format(
+                    metrics.view_name, metrics.queries, budget
+                )
+            )
@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.test import TestCase
+
+from prometheus_client import REGISTRY, CollectorRegistry
+
+from apps.metrics.collectors import DatabaseCollector, _database_values
+from apps.travels.models import RequestTravel
+from apps.travels.tasks import clear_expired_req_travels, send_email_to_users
+
+USER_MODEL = get_user_model()
+
+
+class DatabaseCollectorTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user = USER_MODEL.objects.create_user(
+            username="te122stpepe",
+            email="trest21@gmail.com",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.registry = CollectorRegistry()
+        self.registry.register(DatabaseCollector())
+        _database_values.clear()
+
+    def tearDown(self) -> None:
+        _database_values.clear()
+
+    def test_collect(self):
+        RequestTravel.objects.create(
+            user=self.user, origin=Point(0, 0), destination=Point(0, 0)
+        )
+        RequestTravel.objects.create(
+            user=self.user,
+            origin=Point(0, 0),
+            destination=Point(0, 0),
+            status=RequestTravel.TAKED,
+        )
+
+        self.assertEqual(
+            self.registry.get_sample_value("riding_request_travels_pending"), 1
+        )
+        self.assertEqual(
+            self.registry.get_sample_value("riding_travels", {"status": "I"}), 0
+        )
+        self.assertEqual(self.registry.get_sample_value("riding_outbox_messages"), 0)
+        self.assertGreaterEqual(
+            self.registry.get_sample_value(
+                "riding_db_connections", {"state": "active"}
+            ),
+            1,
+        )
+
+    def test_collect_cached(self):
+        self.registry.get_sample_value("riding_request_travels_pending")
+
+        RequestTravel.objects.create(
+            user=self.user, origin=Point(0, 0), destination=Point(0, 0)
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.registry.get_sample_value("riding_request_travels_pending"), 0
+            )
+
+
+class CeleryTaskMetricsTestCase(TestCase):
+    def _get_sample_value(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_task_duration(self):
+        task = clear_expired_req_travels.name
+        before = self._get_sample_value(
+            "riding_celery_task_duration_seconds_count", task=task, state="SUCCESS"
+        )
+
+        clear_expired_req_travels.apply()
+
+        self.assertEqual(
+            self._get_sample_value(
+                "riding_celery_task_duration_seconds_count", task=task, state="SUCCESS"
+            ),
+            before + 1,
+        )
+
+    @patch("apps.travels.tasks.send_mail", side_effect=ConnectionError)
+    def test_task_retries(self, send_mail):
+        task = send_email_to_users.name
+        retries = self._get_sample_value("riding_celery_task_retries_total", task=task)
+
+        send_email_to_users.apply(args=("subject", "message", ["test@gmail.com"]))
+
+        self.assertGreater(
+            self._get_sample_value("riding_celery_task_retries_total", task=task),
+            retries,
+        )
@@ -0,0 +1,80 @@
+from django.urls import reverse_lazy
+from django.contrib.gis.geos import Point
+from django.test import override_settings
+
+from apps.metrics.testing import QueryBudgetTestMixin
+from apps.travels.models import RequestTravel
+from apps.travels.tests.core import BaseViewTestCase
+
+
+class RequestMetricsMiddlewareTestCase(QueryBudgetTestMixin, BaseViewTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        RequestTravel.objects.create(
+            user=self.user, origin=Point(0, 0), destination=Point(0, 0)
+        )
+        self.url = reverse_lazy("travels:request_travel_user_list")
+
+    def test_request_metrics(self):
+        res = self.client.get(self.url, headers={"Authorization": self.authorization})
+        metrics = res.request_metrics
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(metrics.view_name, "travels:request_travel_user_list")
+        self.assertGreater(metrics.queries, 0)
+        self.assertGreater(metrics.sql_time, 0)
+        self.assertGreater(metrics.serializer_time, 0)
+        self.assertGreaterEqual(
+            metrics.wall_time, metrics.sql_time + metrics.serializer_time
+        )
+        self.assertNotIn("Server-Timing", res.headers)
+
+    def test_stream_metrics(self):
+        res = self.client.get(
+            self.url, {"stream": "true"}, headers={"Authorization": self.authorization}
+        )
+        metrics = res.request_metrics
+        queries = metrics.queries
+
+        b"".join(res.streaming_content)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertGreater(metrics.queries, queries)
+        self.assertGreater(metrics.wall_time, metrics.sql_time)
+        self.assertWithinQueryBudget(res)
+
+    @override_settings(DEBUG=True)
+    def test_debug_headers(self):
+        res = self.client.get(self.url, headers={"Authorization": self.authorization})
+
+        self.assertEqual(int(res.headers["X-Query-Count"]), res.request_metrics.queries)
+        self.assertIn("db;dur=", res.headers["Server-Timing"])
+        self.assertIn("serializer;dur=", res.headers["Server-Timing"])
+        self.assertIn("total;dur=", res.headers["Server-Timing"])
+
+    def test_unresolved_view_name(self):
+        res = self.client.get("/not-found/")
+
+        self.assertEqual(res.status_code, 404)
+        self.assertEqual(res.request_metrics.view_name, "<unresolved>")
+
+    def test_query_budget(self):
+        res = self.client.get(self.url, headers={"Authorization": self.authorization})
+
+        self.assertWithinQueryBudget(res)
+
+        with self.assertRaises(AssertionError):
+            self.assertWithinQueryBudget(res, budget=0)
+
+    def test_metrics_endpoint(self):
+        self.client.get(self.url, headers={"Authorization": self.authorization})
+
+        res = self.client.get(reverse_lazy("metrics:metrics"))
+        content = res.content.decode()
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("riding_http_request_duration_seconds_bucket", content)
+        self.assertIn('view="travels:request_travel_user_list"', content)
+        self.assertIn("riding_http_request_db_queries_bucket", content)
+        self.assertIn("riding_http_request_serializer_duration_seconds_bucket", content)
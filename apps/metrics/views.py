@@ -0,0 +1,44 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from apps.metrics.multiprocess import get_registry
+
+
+def _get_client_ip(request) -> str | None:
+    header = settings.METRICS["CLIENT_IP_HEADER"]
+
+    if not header:
+        return request.META.get("REMOTE_ADDR")
+
+    # The proxy appends the address it got the request from, the previous
+    # ones are sent by the client.
+    value = request.headers.get(header, "")
+
+    return value.split(",")[-1].strip() or None
+
+
+def _is_allowed(request) -> bool:
+    config = settings.METRICS
+
+    if _get_client_ip(request) in config["ALLOWED_IPS"]:
+        return True
+
+    token = config["TOKEN"]
+    authorization = request.headers.get("Authorization", "")
+
+    return bool(token) and hmac.compare_digest(
+        authorization.encode(), "Bearer {0}".format(token).encode()
+    )
+
+
+def metrics_view(request):
+    if not _is_allowed(request):
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
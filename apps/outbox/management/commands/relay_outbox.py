@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.outbox.services import relay_outbox_messages
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends the outbox messages to the Celery broker until it is stopped, "
+        "it waits between runs only when the outbox is drained."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.OUTBOX["BATCH_SIZE"]
+        )
+        parser.add_argument(
+            "--interval", type=float, default=settings.OUTBOX["RELAY_INTERVAL"]
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        while True:
+            sent_num = relay_outbox_messages(batch_size)
+
+            if sent_num:
+                self.stdout.write("Sent {0} outbox messages".format(sent_num))
+
+            if sent_num < batch_size:
+                time.sleep(options["interval"])
@@ -0,0 +1,17 @@
+from django.db import models
+from django.utils.timezone import now
+from django.utils.translation import gettext_lazy as _
+
+
+class OutboxMessage(models.Model):
+    """A Celery task call saved with the transaction that caused it, the relay
+    sends it to the broker once the transaction is committed."""
+
+    id = models.BigAutoField(primary_key=True)
+    task = models.CharField(_("task name"), max_length=255)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    created_time = models.DateTimeField(default=now)
+
+    def __str__(self):
+        return "OutboxMessage id {0}, task: {1}".format(self.id, self.task)
@@ -0,0 +1,97 @@
+import logging
+
+from contextlib import nullcontext
+
+from celery import current_app
+from celery.exceptions import NotRegistered
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.outbox.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_task(task: str, *args, **kwargs) -> OutboxMessage:
+    """Saves a call of the Celery ``task`` name in the current transaction,
+    the relay sends it only if the transaction is committed.
+
+    The arguments must be JSON serializable.
+    """
+    return OutboxMessage.objects.create(task=task, args=list(args), kwargs=kwargs)
+
+
+def _acquire_producer():
+    # Eager tasks run in place, they don't need a broker connection.
+    if current_app.conf.task_always_eager:
+        return nullcontext()
+
+    return current_app.producer_or_acquire()
+
+
+def _coalesce(messages: list[OutboxMessage]) -> list[tuple[str, list, dict, list]]:
+    """Groups the messages in ``(task, args, kwargs, message ids)`` calls.
+
+    The messages of each ``OUTBOX["COALESCED_TASKS"]`` task are merged in a
+    single call, their only argument is a list and the call gets all the
+    lists concatenated.
+    """
+    coalesced_tasks = settings.OUTBOX["COALESCED_TASKS"]
+    coalesced = {}
+    calls = []
+
+    for message in messages:
+        if message.task not in coalesced_tasks:
+            calls.append((message.task, message.args, message.kwargs, [message.id]))
+            continue
+
+        if message.task not in coalesced:
+            coalesced[message.task] = ([], [])
+            items, ids = coalesced[message.task]
+            calls.append((message.task, [items], {}, ids))
+
+        items, ids = coalesced[message.task]
+        items.extend(message.args[0])
+        ids.append(message.id)
+
+    return calls
+
+
+def relay_outbox_messages(batch_size: int | None = None) -> int:
+    """Sends the oldest outbox messages to the broker through a single
+    producer and deletes them, returns the number of sent messages.
+
+    Concurrent relays skip the locked messages. A message is sent at least
+    once, it is sent again if the relay fails before deleting it.
+    """
+    if batch_size is None:
+        batch_size = settings.OUTBOX["BATCH_SIZE"]
+
+    sent = []
+
+    with transaction.atomic():
+        queryset = OutboxMessage.objects.select_for_update(skip_locked=True)
+        messages = list(queryset.order_by("id")[:batch_size])
+
+        with _acquire_producer() as producer:
+            for task_name, args, kwargs, message_ids in _coalesce(messages):
+                try:
+                    task = current_app.tasks[task_name]
+                except NotRegistered:
+                    # Kept until a release registers the task.
+                    logger.error(f"Outbox messages {message_ids} task is unknown")
+                    continue
+
+                try:
+                    task.apply_async(args=args, kwargs=kwargs, producer=producer)
+                except Exception as e:
+                    # The rest of the batch is left for the next run.
+                    logger.exception(f"Outbox messages {message_ids} not sent: {e}")
+                    break
+
+                sent.extend(message_ids)
+
+        OutboxMessage.objects.filter(id__in=sent).delete()
+
+    return len(sent)
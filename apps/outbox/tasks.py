@@ -0,0 +1,10 @@
+from celery import shared_task
+
+from apps.outbox.services import relay_outbox_messages
+
+
+@shared_task
+def relay_outbox():
+    sent_num = relay_outbox_messages()
+
+    return "Sent {0} outbox messages".format(sent_num)
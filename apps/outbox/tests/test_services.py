@@ -0,0 +1,93 @@
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from apps.mail import make_email
+from apps.outbox.models import OutboxMessage
+from apps.outbox.services import enqueue_task, relay_outbox_messages
+from apps.users.tasks import send_emails_to_users
+
+from riding.celery import app
+
+SEND_EMAIL_TASK = "apps.travels.tasks.send_email_to_users"
+
+
+class CountingEmailBackend(EmailBackend):
+    connections_num = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingEmailBackend.connections_num += 1
+
+
+class OutboxTestCase(TestCase):
+    def setUp(self) -> None:
+        app.conf.update(CELERY_TASK_ALWAYS_EAGER=True)
+
+    def test_enqueue_task(self):
+        message = enqueue_task(SEND_EMAIL_TASK, "subject", "message", ["a@gmail.com"])
+
+        self.assertEqual(message.task, SEND_EMAIL_TASK)
+        self.assertEqual(message.args, ["subject", "message", ["a@gmail.com"]])
+        self.assertEqual(message.kwargs, {})
+
+    def test_enqueue_task_rollback(self):
+        try:
+            with transaction.atomic():
+                enqueue_task(SEND_EMAIL_TASK, "subject", "message", ["a@gmail.com"])
+                raise ValueError
+        except ValueError:
+            pass
+
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_relay(self):
+        for i in range(3):
+            enqueue_task(
+                SEND_EMAIL_TASK, "subject {0}".format(i), "message", ["a@gmail.com"]
+            )
+
+        self.assertEqual(relay_outbox_messages(batch_size=2), 2)
+        self.assertEqual(
+            [email.subject for email in mail.outbox], ["subject 0", "subject 1"]
+        )
+
+        self.assertEqual(relay_outbox_messages(batch_size=2), 1)
+        self.assertEqual(relay_outbox_messages(batch_size=2), 0)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_relay_unknown_task(self):
+        enqueue_task("apps.unknown.tasks.task")
+        enqueue_task(SEND_EMAIL_TASK, "subject", "message", ["a@gmail.com"])
+
+        self.assertEqual(relay_outbox_messages(), 1)
+        self.assertEqual(
+            list(OutboxMessage.objects.values_list("task", flat=True)),
+            ["apps.unknown.tasks.task"],
+        )
+
+    @override_settings(
+        EMAIL_BACKEND="apps.outbox.tests.test_services.CountingEmailBackend"
+    )
+    def test_relay_coalesced_emails(self):
+        CountingEmailBackend.connections_num = 0
+
+        for i in range(3):
+            enqueue_task(
+                send_emails_to_users.name,
+                [make_email("subject {0}".format(i), "message", ["a@gmail.com"])],
+            )
+
+        enqueue_task(SEND_EMAIL_TASK, "other", "message", ["a@gmail.com"])
+
+        self.assertEqual(relay_outbox_messages(), 4)
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(
+            [email.subject for email in mail.outbox][:3],
+            ["subject 0", "subject 1", "subject 2"],
+        )
+        # One connection for the coalesced emails and one for the other task.
+        self.assertEqual(CountingEmailBackend.connections_num, 2)
+        self.assertFalse(OutboxMessage.objects.exists())
@@ -0,0 +1,122 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework.throttling import BaseThrottle
+
+from apps.cache import LocalTTLCache
+
+_local_cache: LocalTTLCache | None = None
+_local_lock = threading.Lock()
+
+
+def _get_config() -> dict:
+    return getattr(settings, "THROTTLING", {})
+
+
+def _get_local_cache() -> LocalTTLCache:
+    global _local_cache
+
+    if _local_cache is None:
+        _local_cache = LocalTTLCache(max_size=_get_config().get("MAX_SIZE", 100000))
+
+    return _local_cache
+
+
+def _get_shared_cache():
+    alias = _get_config().get("CACHE_ALIAS", None)
+
+    return caches[alias] if alias else None
+
+
+def take_token(
+    bucket: tuple[float, float] | None,
+    now: float,
+    rate: float,
+    capacity: float,
+    cost: float = 1,
+) -> tuple[bool, tuple[float, float]]:
+    """Refills the ``(tokens, updated)`` bucket, full if ``None``, at ``rate``
+    tokens per second up to ``capacity`` and takes ``cost`` tokens from it.
+    Returns whether there were enough tokens and the new bucket."""
+    if bucket is None:
+        tokens = capacity
+    else:
+        tokens, updated = bucket
+        tokens = min(capacity, tokens + (now - updated) * rate)
+
+    if tokens < cost:
+        return False, (tokens, now)
+
+    return True, (tokens - cost, now)
+
+
+class ScopedTokenBucketThrottle(BaseThrottle):
+    """Token bucket per user (or client ip for the anonymous requests) and the
+    ``throttle_scope`` of the view, the views without scope aren't throttled.
+
+    Each bucket holds up to ``CAPACITY`` requests and refills ``RATE`` requests
+    per second, configured by scope in ``settings.THROTTLING["SCOPES"]``. A
+    request takes one token, or ``view.get_throttle_cost(request)`` tokens (up
+    to ``CAPACITY``) if the view defines it. The buckets live in the process
+    memory, or in the ``CACHE_ALIAS`` cache to share them between processes. A
+    bucket left alone until it is full again is evicted, so the memory only
+    holds the active clients.
+    """
+
+    def __init__(self) -> None:
+        self.wait_seconds = None
+
+    def allow_request(self, request, view) -> bool:
+        config = _get_config()
+        scope = getattr(view, "throttle_scope", None)
+
+        if not config.get("ENABLED", False) or scope not in config.get("SCOPES", {}):
+            return True
+
+        rate = config["SCOPES"][scope]["RATE"]
+        capacity = config["SCOPES"][scope]["CAPACITY"]
+
+        if request.user and request.user.is_authenticated:
+            ident = request.user.id
+        else:
+            ident = self.get_ident(request)
+
+        cost = 1
+
+        if hasattr(view, "get_throttle_cost"):
+            cost = min(max(view.get_throttle_cost(request), 1), capacity)
+
+        key = "throttle:{0}:{1}".format(scope, ident)
+        # Time for an emptied bucket to be full, when it is the same as missing.
+        ttl = capacity / rate
+        shared_cache = _get_shared_cache()
+
+        if shared_cache is None:
+            local_cache = _get_local_cache()
+
+            with _local_lock:
+                now = time.monotonic()
+                allowed, bucket = take_token(
+                    local_cache.get(key), now, rate, capacity, cost
+                )
+                local_cache.set(key, bucket, ttl)
+        else:
+            # Concurrent requests of a client in several processes may take
+            # the same token, as with the rest framework throttles.
+            now = time.time()
+            allowed, bucket = take_token(
+                shared_cache.get(key), now, rate, capacity, cost
+            )
+            shared_cache.set(key, bucket, math.ceil(ttl))
+
+        if not allowed:
+            self.wait_seconds = (cost - bucket[0]) / rate
+
+        return allowed
+
+    def wait(self) -> float | None:
+        return self.wait_seconds
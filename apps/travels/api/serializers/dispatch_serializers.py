@@ -0,0 +1,15 @@
+from rest_framework.serializers import ModelSerializer
+
+from apps.metrics.serializers import MeasuredSerializerMixin
+from apps.travels.models import DispatchOffer
+from apps.travels.api.serializers.request_travel_serializer import (
+    RequestTravelSerializer,
+)
+
+
+class DispatchOfferSerializer(MeasuredSerializerMixin, ModelSerializer):
+    request_travel = RequestTravelSerializer(read_only=True)
+
+    class Meta:
+        model = DispatchOffer
+        fields = "__all__"
@@ -0,0 +1,14 @@
+from rest_framework.serializers import FloatField
+
+
+class DistanceMetersField(FloatField):
+    """Meters of a ``Distance`` annotation, ``None`` if the instance isn't
+    annotated."""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        kwargs["allow_null"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return value.m
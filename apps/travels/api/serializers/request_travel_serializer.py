@@ -1,19 +1,124 @@
 from datetime import timedelta
 
+from django.contrib.gis.measure import D
 from django.utils.timezone import now
 
-from rest_framework.serializers import Serializer, IntegerField, FloatField
+from rest_framework.serializers import (
+    Serializer,
+    IntegerField,
+    FloatField,
+    DateTimeField,
+    ListField,
+)
 from rest_framework_gis.serializers import ModelSerializer
 
+from apps.metrics.recorder import record_serializer_time
+from apps.metrics.serializers import MeasuredSerializerMixin
+from apps.travels.functions import GeographyX, GeographyY
 from apps.travels.models import RequestTravel
+from apps.travels.geo import haversine_km
+from apps.travels.api.serializers.fields import DistanceMetersField
 
 
-class RequestTravelSerializer(ModelSerializer):
+class RequestTravelSerializer(MeasuredSerializerMixin, ModelSerializer):
+    trip_distance_m = DistanceMetersField(source="trip_distance")
+    driver_distance_m = DistanceMetersField(source="distance")
+
     class Meta:
         model = RequestTravel
         fields = "__all__"
 
 
+class RequestTravelReadSerializer:
+    """Read only and faster version of ``RequestTravelSerializer`` for the
+    listings, it builds the same representation without the per field
+    serializer machinery nor the GEOS to GeoJSON conversion.
+
+    It accepts instances and the rows of ``get_values(queryset)``, whose
+    coordinates are read in SQL.
+
+    Eg: RequestTravelReadSerializer(RequestTravelReadSerializer.get_values(qs))
+    """
+
+    values_fields = ("id", "user_id", "created_time", "status", "expires")
+
+    def __init__(self, instances) -> None:
+        self.instances = instances
+        self._datetime_field = DateTimeField()
+
+    @classmethod
+    def get_values(cls, queryset, *annotations):
+        if "trip_distance" not in queryset.query.annotations:
+            queryset = queryset.with_trip_distance()
+
+        return queryset.values(
+            *cls.values_fields,
+            "trip_distance",
+            *annotations,
+            origin_x=GeographyX("origin"),
+            origin_y=GeographyY("origin"),
+            destination_x=GeographyX("destination"),
+            destination_y=GeographyY("destination"),
+        )
+
+    def _row_from_instance(self, instance: RequestTravel) -> dict:
+        row = {field: getattr(instance, field) for field in self.values_fields}
+        row["origin_x"], row["origin_y"] = instance.origin.coords
+        row["destination_x"], row["destination_y"] = instance.destination.coords
+        row["distance"] = getattr(instance, "distance", None)
+
+        try:
+            row["trip_distance"] = instance.trip_distance
+        except AttributeError:
+            # The spatial index instances added by the signals aren't
+            # annotated, the spherical distance is close enough.
+            row["trip_distance"] = D(
+                km=haversine_km(
+                    row["origin_x"],
+                    row["origin_y"],
+                    row["destination_x"],
+                    row["destination_y"],
+                )
+            )
+
+        return row
+
+    def to_representation(self, row: dict) -> dict:
+        datetime_to_representation = self._datetime_field.to_representation
+        trip_distance = row.get("trip_distance")
+        distance = row.get("distance")
+
+        return {
+            "id": row["id"],
+            "trip_distance_m": trip_distance.m if trip_distance is not None else None,
+            "driver_distance_m": distance.m if distance is not None else None,
+            "user": row["user_id"],
+            "origin": {
+                "type": "Point",
+                "coordinates": [row["origin_x"], row["origin_y"]],
+            },
+            "destination": {
+                "type": "Point",
+                "coordinates": [row["destination_x"], row["destination_y"]],
+            },
+            "created_time": datetime_to_representation(row["created_time"]),
+            "status": row["status"],
+            "expires": datetime_to_representation(row["expires"]),
+        }
+
+    def iter_data(self):
+        for row in self.instances:
+            if not isinstance(row, dict):
+                row = self._row_from_instance(row)
+
+            yield self.to_representation(row)
+
+    @property
+    def data(self) -> list[dict]:
+        with record_serializer_time():
+            return list(self.iter_data())
+
+
 class RequestTravelQuerySerializer(Serializer):
     radius = IntegerField(max_value=RequestTravel.MAX_RADIUS, min_value=0)
     latitude = FloatField()
@@ -36,3 +141,7 @@ class RequestTravelCreationSerializer(ModelSerializer):
     class Meta:
         model = RequestTravel
         fields = ("origin", "destination")
+
+
+class RequestTravelBulkCreationResultSerializer(Serializer):
+    ids = ListField(child=IntegerField())
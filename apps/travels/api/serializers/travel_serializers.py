@@ -6,11 +6,16 @@ from rest_framework.serializers import (
     FloatField,
 )
 
+from apps.metrics.serializers import MeasuredSerializerMixin
 from apps.travels.models import Travel, ConfirmationTravel
+from apps.travels.api.serializers.fields import DistanceMetersField
 from apps.drivers.models import Vehicles
 
 
-class TravelSerializer(ModelSerializer):
+class TravelSerializer(MeasuredSerializerMixin, ModelSerializer):
+    trip_distance_m = DistanceMetersField(source="trip_distance")
+    driver_distance_m = DistanceMetersField(source="driver_distance")
+
     class Meta:
         model = Travel
         fields = "__all__"
@@ -22,7 +27,7 @@ class TakeRequestTravelSerializer(Serializer):
     vehicle_id = UUIDField()
 
 
-class ConfirmationTravelSerializer(ModelSerializer):
+class ConfirmationTravelSerializer(MeasuredSerializerMixin, ModelSerializer):
     class Meta:
         model = ConfirmationTravel
         fields = "__all__"
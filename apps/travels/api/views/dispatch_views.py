@@ -0,0 +1,96 @@
+from django.db import transaction
+from django.utils import timezone
+
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+from oauth2_provider.contrib.rest_framework.permissions import TokenHasReadWriteScope
+
+from drf_spectacular.utils import extend_schema
+
+from apps.outbox.services import enqueue_task
+from apps.travels.api.serializers.dispatch_serializers import DispatchOfferSerializer
+from apps.travels.api.serializers.travel_serializers import (
+    TravelSerializer,
+    TakeRequestTravelSerializer,
+)
+from apps.travels.dispatch import get_open_dispatch_offer, reject_dispatch_offer
+from apps.travels.models import DispatchOffer
+from apps.travels.permissions import IsDriverActivePermission
+from apps.travels.services import take_request_travel
+from apps.travels.tasks import dispatch_request_travel
+
+
+class ListDispatchOfferApiView(APIView):
+    permission_classes = (
+        IsAuthenticated,
+        TokenHasReadWriteScope,
+        IsDriverActivePermission,
+    )
+
+    @extend_schema(
+        responses={200: DispatchOfferSerializer(many=True)},
+        description="Retrieves the request travels currently offered to the driver",
+    )
+    def get(self, request):
+        offers = DispatchOffer.objects.select_related("request_travel").filter(
+            driver__user=request.user,
+            status=DispatchOffer.OFFERED,
+            expires__gt=timezone.now(),
+        )
+
+        serializer = DispatchOfferSerializer(offers, many=True)
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AcceptDispatchOfferApiView(APIView):
+    permission_classes = (
+        IsAuthenticated,
+        TokenHasReadWriteScope,
+        IsDriverActivePermission,
+    )
+    throttle_scope = "travel_take"
+
+    @extend_schema(
+        request=TakeRequestTravelSerializer,
+        responses={200: TravelSerializer},
+        description="Takes the request travel of an offer",
+    )
+    def post(self, request, offer_id: int):
+        serializer = TakeRequestTravelSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        offer = get_open_dispatch_offer(offer_id, request.user.id)
+
+        travel = take_request_travel(
+            offer.request_travel_id,
+            request.user.id,
+            serializer.data["longitude"],
+            serializer.data["latitude"],
+            serializer.data["vehicle_id"],
+        )
+        return Response(TravelSerializer(travel).data, status=status.HTTP_200_OK)
+
+
+class RejectDispatchOfferApiView(APIView):
+    permission_classes = (
+        IsAuthenticated,
+        TokenHasReadWriteScope,
+        IsDriverActivePermission,
+    )
+
+    @extend_schema(
+        request=None,
+        responses={200: DispatchOfferSerializer},
+        description="Rejects an offer, the request travel is offered to the next "
+        "driver",
+    )
+    def post(self, request, offer_id: int):
+        with transaction.atomic():
+            offer = reject_dispatch_offer(offer_id, request.user.id)
+            enqueue_task(dispatch_request_travel.name, offer.request_travel_id)
+
+        return Response(DispatchOfferSerializer(offer).data, status=status.HTTP_200_OK)
@@ -1,11 +1,12 @@
-from datetime import timedelta
-
-from django.db.models import Q
-from django.utils import timezone
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 
 from rest_framework.views import APIView
 from rest_framework.generics import GenericAPIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
 
@@ -16,17 +17,28 @@ from drf_spectacular.utils import extend_schema
 
 from django_filters.utils import translate_validation
 
+from apps.events.database import sync_iterator_to_async
+from apps.idempotency import IDEMPOTENCY_KEY_PARAMETER, idempotent
+from apps.metrics.recorder import record_stream_queries
 from apps.travels.permissions import IsDriverActivePermission, IsOwnerPermission
 from apps.travels.models import RequestTravel
 from apps.travels.api.serializers.request_travel_serializer import (
     RequestTravelSerializer,
     RequestTravelCreationSerializer,
+    RequestTravelBulkCreationResultSerializer,
+    RequestTravelQuerySerializer,
+    RequestTravelReadSerializer,
 )
+from apps.travels.events import NearbyRequestTravelStream
+from apps.travels.exceptions import StreamRequiresAsgi
+from apps.travels.renderers import EventStreamRenderer, stream_json_array
+from apps.travels.pagination import RequestTravelDistanceCursorPagination
 from apps.travels.filters import (
     RequestTravelDistanceToRadiusFilter,
     RequestTravelFilter,
 )
 from apps.travels.services import (
+    bulk_create_request_travels,
     get_request_travel_by_id,
     delete_request_travel_by_id_and_user_id,
 )
@@ -39,9 +51,11 @@ class ListRequestTravelApiView(GenericAPIView):
         IsDriverActivePermission,
     )
     filter_backends = (RequestTravelDistanceToRadiusFilter,)
+    pagination_class = RequestTravelDistanceCursorPagination
+    throttle_scope = "request_travel_list"
 
     @extend_schema(
-        responses={200: RequestTravelSerializer},
+        responses={200: RequestTravelSerializer(many=True)},
         parameters=[
             OpenApiParameter(
                 name="radius",
@@ -64,60 +78,176 @@ class ListRequestTravelApiView(GenericAPIView):
                 required=True,
             ),
         ],
-        description="Retrieves all request travels near a point with a radius",
+        description="Retrieves the request travels near a point with a radius, "
+        "ordered by distance",
     )
     def get(self, request):
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = RequestTravelSerializer(queryset, many=True)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if isinstance(queryset, QuerySet):
+            queryset = RequestTravelReadSerializer.get_values(queryset, "distance")
+
+        page = self.paginate_queryset(queryset)
+        serializer = RequestTravelReadSerializer(page)
+
+        return self.get_paginated_response(serializer.data)
 
     def get_queryset(self):
-        queryset = RequestTravel.objects.filter(
-            Q(status=RequestTravel.PENDING) and Q(expires__gte=timezone.now())
-        )
+        queryset = RequestTravel.objects.pending().with_trip_distance()
 
         return queryset
 
 
+class StreamRequestTravelApiView(GenericAPIView):
+    permission_classes = (
+        IsAuthenticated,
+        TokenHasReadWriteScope,
+        IsDriverActivePermission,
+    )
+    renderer_classes = (EventStreamRenderer, JSONRenderer)
+    filter_backends = (RequestTravelDistanceToRadiusFilter,)
+
+    @extend_schema(
+        responses={(200, "text/event-stream"): OpenApiTypes.STR},
+        parameters=[
+            OpenApiParameter(
+                name="radius",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                default=RequestTravel.MAX_RADIUS,
+                description="Radius for find request travels",
+            ),
+            OpenApiParameter(
+                name="latitude",
+                type=OpenApiTypes.FLOAT,
+                location=OpenApiParameter.QUERY,
+                required=True,
+            ),
+            OpenApiParameter(
+                name="longitude",
+                type=OpenApiTypes.FLOAT,
+                location=OpenApiParameter.QUERY,
+                required=True,
+            ),
+        ],
+        description="Streams as server-sent events the request travels near a "
+        "point with a radius, first the current ones and then the ones added or "
+        "removed. It needs an ASGI server, it fails with 501 under WSGI",
+    )
+    def get(self, request):
+        # A WSGI worker would be held for the whole stream.
+        if not isinstance(request._request, ASGIRequest):
+            raise StreamRequiresAsgi
+
+        serializer = RequestTravelQuerySerializer(
+            data={
+                "latitude": request.query_params.get("latitude", None),
+                "longitude": request.query_params.get("longitude", None),
+                "radius": request.query_params.get("radius", RequestTravel.MAX_RADIUS),
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+
+        stream = NearbyRequestTravelStream(
+            serializer.data["longitude"],
+            serializer.data["latitude"],
+            serializer.data["radius"],
+            self.get_snapshot,
+        )
+
+        response = StreamingHttpResponse(stream, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+
+        return response
+
+    def get_snapshot(self):
+        request_travels = self.filter_queryset(self.get_queryset())
+
+        return [
+            (
+                request_travel.distance.km,
+                request_travel,
+                RequestTravelSerializer(request_travel).data,
+            )
+            for request_travel in request_travels
+        ]
+
+    def get_queryset(self):
+        return RequestTravel.objects.pending().with_trip_distance()
+
+
 class ListRequestTravelUserApiView(APIView):
     permission_classes = (IsAuthenticated, TokenHasReadWriteScope)
+    stream_chunk_size = 2000
 
     @extend_schema(
-        responses={200: RequestTravelSerializer},
+        responses={200: RequestTravelSerializer(many=True)},
         parameters=[
             OpenApiParameter(
                 name="status",
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
                 description="Status of the request travel. P (Pending), T (Taked)",
-            )
+            ),
+            OpenApiParameter(
+                name="stream",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                default=False,
+                description="Streams the response, for long histories",
+            ),
         ],
         description="Retrieves all request travels of the user",
     )
     def get(self, request):
         user = request.user
 
-        filter = RequestTravelFilter(request.GET, queryset=user.req_travels.all())
+        filter = RequestTravelFilter(
+            request.GET, queryset=user.req_travels.with_trip_distance()
+        )
 
         if not filter.is_valid():
             raise translate_validation(filter.errors)
 
         request_travels = filter.qs
 
+        if request.query_params.get("stream", "").lower() in ("1", "true"):
+            return self.get_streaming_response(request_travels)
+
         serializer = RequestTravelSerializer(request_travels, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def get_streaming_response(self, request_travels):
+        # The rows are fetched in chunks through a server side cursor and
+        # encoded as they are read, the memory doesn't grow with the history.
+        rows = RequestTravelReadSerializer.get_values(request_travels).iterator(
+            chunk_size=self.stream_chunk_size
+        )
+        serializer = RequestTravelReadSerializer(rows)
+        content = record_stream_queries(stream_json_array(serializer.iter_data()))
+
+        # Under ASGI a sync iterator would be read whole before being sent.
+        if isinstance(self.request._request, ASGIRequest):
+            content = sync_iterator_to_async(content)
+
+        return StreamingHttpResponse(content, content_type="application/json")
+
 
 class CreateRequestTravelApiView(APIView):
     permission_classes = (IsAuthenticated, TokenHasReadWriteScope)
+    throttle_scope = "request_travel_create"
 
     @extend_schema(
         request=RequestTravelCreationSerializer,
         responses={201: RequestTravelSerializer},
         description="Create a request travel",
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
     )
+    @idempotent
     def post(self, request):
         user = self.request.user
 
@@ -132,6 +262,41 @@ class CreateRequestTravelApiView(APIView):
         return Response(data, status=status.HTTP_201_CREATED)
 
 
+class BulkCreateRequestTravelApiView(APIView):
+    permission_classes = (IsAuthenticated, TokenHasReadWriteScope)
+    throttle_scope = "request_travel_bulk_create"
+
+    def get_throttle_cost(self, request) -> int:
+        # A token per request travel, the invalid bodies are rejected later.
+        return len(request.data) if isinstance(request.data, list) else 1
+
+    @extend_schema(
+        request=RequestTravelCreationSerializer(many=True),
+        responses={201: RequestTravelBulkCreationResultSerializer},
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
+        description="Create a list of request travels, returns their ids",
+    )
+    @idempotent
+    def post(self, request):
+        serializer = RequestTravelCreationSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.REQUEST_TRAVEL_BULK_CREATE["MAX_BATCH_SIZE"],
+        )
+        serializer.is_valid(raise_exception=True)
+
+        request_travels = bulk_create_request_travels(
+            request.user, serializer.validated_data
+        )
+
+        data = RequestTravelBulkCreationResultSerializer(
+            {"ids": [request_travel.id for request_travel in request_travels]}
+        ).data
+
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
 class RequestTravelApiView(APIView):
     permission_classes = (IsAuthenticated, TokenHasReadWriteScope)
 
@@ -7,6 +7,7 @@ from oauth2_provider.contrib.rest_framework.permissions import TokenHasReadWrite
 
 from drf_spectacular.utils import extend_schema
 
+from apps.idempotency import IDEMPOTENCY_KEY_PARAMETER, idempotent
 from apps.travels.api.serializers.travel_serializers import (
     TravelSerializer,
     TakeRequestTravelSerializer,
@@ -19,7 +20,6 @@ from apps.travels.services import (
     finish_travel,
 )
 from apps.travels.permissions import IsDriverActivePermission
-from apps.travels.tasks import send_email_to_users
 
 
 class TakeRequestTravelApiView(APIView):
@@ -28,11 +28,14 @@ class TakeRequestTravelApiView(APIView):
         TokenHasReadWriteScope,
         IsDriverActivePermission,
     )
+    throttle_scope = "travel_take"
 
     @extend_schema(
         request=TakeRequestTravelSerializer,
         responses={200: TravelSerializer},
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
     )
+    @idempotent
     def post(self, request, request_travel_id: int):
         serializer = TakeRequestTravelSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -45,14 +48,6 @@ class TakeRequestTravelApiView(APIView):
         travel = take_request_travel(
             request_travel_id, request.user.id, long, lat, vehicle_id
         )
-        send_email_to_users.delay(
-            "Your travel request has been taken!",
-            "Your travel request has been taken by {0}, the travel id is {1}".format(
-                travel.driver.driver_name, travel.id
-            ),
-            [travel.user.email],
-        )
-
         return Response(TravelSerializer(travel).data, status=status.HTTP_200_OK)
 
 
@@ -74,14 +69,6 @@ class CancelTravelApiView(APIView):
     @extend_schema(responses={200: TravelSerializer}, request=None)
     def post(self, request, travel_id: int):
         travel = cancel_travel(travel_id, request.user.id)
-        send_email_to_users.delay(
-            "Your travel has been cancelled!",
-            "Your travel has been cancelled by {0}".format(
-                request.user.get_full_name()
-            ),
-            [travel.user.email, travel.driver.user.email],
-        )
-
         return Response(TravelSerializer(travel).data, status=status.HTTP_200_OK)
 
 
@@ -91,17 +78,6 @@ class FinishTravelApiView(APIView):
     @extend_schema(responses={200: ConfirmationTravelSerializer}, request=None)
     def post(self, request, travel_id: int):
         confirmation_travel = finish_travel(travel_id, request.user.id)
-        msg = (
-            "Your travel has been confirmed by {0}. Travel is done."
-            if confirmation_travel.check_driver and confirmation_travel.check_user
-            else "Your travel has been confirmed by {0}."
-        )
-
-        send_email_to_users.delay(
-            "Your travel has been confirmed!",
-            msg.format(request.user.get_full_name()),
-            [confirmation_travel.user.email, confirmation_travel.driver.user.email],
-        )
 
         return Response(
             ConfirmationTravelSerializer(confirmation_travel).data,
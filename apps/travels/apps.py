@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TravelsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.travels"
+
+    def ready(self):
+        from apps.travels import signals  # noqa: F401
@@ -0,0 +1,165 @@
+import logging
+
+from datetime import timedelta
+from uuid import UUID
+
+from django.conf import settings
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.measure import D
+from django.db import transaction
+from django.utils import timezone
+
+from apps.drivers.models import Drivers
+from apps.travels.events import publish_dispatch_offer
+from apps.travels.exceptions import DispatchOfferDoesNotFound
+from apps.travels.models import DispatchOffer, RequestTravel, Travel
+
+logger = logging.getLogger(__name__)
+
+
+def find_nearest_drivers(request_travel: RequestTravel, k: int) -> list[Drivers]:
+    """Returns the ``k`` nearest active and idle drivers to the request travel
+    origin by their last known location, annotated with their ``distance``."""
+    config = settings.REQUEST_TRAVEL_DISPATCH
+    located_since = timezone.now() - timedelta(seconds=config["LOCATION_MAX_AGE"])
+
+    return list(
+        Drivers.objects.filter(
+            is_active=True,
+            status=Drivers.ACTIVE,
+            location__updated_time__gte=located_since,
+            location__point__distance_lte=(
+                request_travel.origin,
+                D(km=config["RADIUS"]),
+            ),
+        )
+        .exclude(user_id=request_travel.user_id)
+        .exclude(travels__status=Travel.IN_COURSE)
+        .exclude(offers__status=DispatchOffer.OFFERED)
+        .annotate(distance=Distance("location__point", request_travel.origin))
+        .order_by("distance")[:k]
+    )
+
+
+def create_dispatch_offers(
+    request_travel: RequestTravel, drivers: list[Drivers]
+) -> list[DispatchOffer]:
+    return DispatchOffer.objects.bulk_create(
+        [
+            DispatchOffer(
+                request_travel=request_travel,
+                driver=driver,
+                rank=rank,
+                distance=driver.distance.m,
+            )
+            for rank, driver in enumerate(drivers)
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def dispatch_request_travel(request_travel_id: int) -> DispatchOffer | None:
+    """Offers the request travel to its next ranked driver once the current
+    offer expired or was rejected, the ranking is made on the first call.
+
+    Returns the new offer, or ``None`` if the current offer is still open or
+    there is nobody left to offer the request travel.
+    """
+    current_time = timezone.now()
+    request_travel = (
+        RequestTravel.objects.pending().filter(id=request_travel_id).first()
+    )
+
+    if request_travel is None:
+        # Taken, expired or deleted in the meantime.
+        offers = DispatchOffer.objects.filter(request_travel_id=request_travel_id)
+        offers.open().update(status=DispatchOffer.CANCELLED)
+
+        return None
+
+    # The drivers are ranked without locks, the spatial query doesn't block
+    # the takes of the request travel.
+    drivers = None
+
+    if not request_travel.offers.exists():
+        drivers = find_nearest_drivers(
+            request_travel, settings.REQUEST_TRAVEL_DISPATCH["CANDIDATES"]
+        )
+
+    with transaction.atomic():
+        # A take holding the row settles the offers itself, it's skipped.
+        request_travel = (
+            RequestTravel.objects.pending()
+            .select_for_update(skip_locked=True, of=("self",))
+            .filter(id=request_travel_id)
+            .first()
+        )
+
+        if request_travel is None:
+            return None
+
+        if drivers is not None:
+            create_dispatch_offers(request_travel, drivers)
+
+        offers = list(request_travel.offers.open().order_by("rank"))
+
+        for offer in offers:
+            if offer.status != DispatchOffer.OFFERED:
+                continue
+
+            if offer.expires > current_time:
+                return None
+
+            offer.status = DispatchOffer.EXPIRED
+            offer.save(update_fields=["status"])
+
+        for offer in offers:
+            if offer.status != DispatchOffer.QUEUED:
+                continue
+
+            offer.status = DispatchOffer.OFFERED
+            offer.expires = current_time + timedelta(
+                seconds=settings.REQUEST_TRAVEL_DISPATCH["OFFER_TIMEOUT"]
+            )
+            offer.save(update_fields=["status", "expires"])
+            offer.request_travel = request_travel
+
+            publish_dispatch_offer(offer)
+
+            logger.info(
+                f"Request travel {request_travel_id} offered to driver "
+                f"{offer.driver_id} (rank {offer.rank})"
+            )
+
+            return offer
+
+    logger.info(f"Request travel {request_travel_id} has no drivers left to offer")
+
+    return None
+
+
+def get_open_dispatch_offer(offer_id: int, user_id: UUID) -> DispatchOffer:
+    try:
+        return DispatchOffer.objects.select_related("request_travel").get(
+            id=offer_id,
+            driver__user_id=user_id,
+            status=DispatchOffer.OFFERED,
+            expires__gt=timezone.now(),
+        )
+    except DispatchOffer.DoesNotExist:
+        raise DispatchOfferDoesNotFound
+
+
+def reject_dispatch_offer(offer_id: int, user_id: UUID) -> DispatchOffer:
+    offer = get_open_dispatch_offer(offer_id, user_id)
+
+    updated = DispatchOffer.objects.filter(
+        id=offer.id, status=DispatchOffer.OFFERED
+    ).update(status=DispatchOffer.REJECTED)
+
+    if not updated:
+        raise DispatchOfferDoesNotFound
+
+    offer.status = DispatchOffer.REJECTED
+
+    return offer
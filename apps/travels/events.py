@@ -0,0 +1,262 @@
+import json
+import time
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.db import transaction
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.events import get_broker
+from apps.travels.models import DispatchOffer, RequestTravel, Travel
+from apps.travels.geo import grid_cell, grid_cells_in_radius, haversine_km
+from apps.travels.api.serializers.request_travel_serializer import (
+    RequestTravelSerializer,
+)
+from apps.travels.api.serializers.travel_serializers import TravelSerializer
+from apps.travels.api.serializers.dispatch_serializers import DispatchOfferSerializer
+
+REQUEST_TRAVELS_CHANNEL = "request_travels:{0}:{1}"
+
+TRAVEL_TAKEN = "taken"
+TRAVEL_CANCELLED = "cancelled"
+TRAVEL_CONFIRMED = "confirmed"
+TRAVEL_FINISHED = "finished"
+
+
+def get_driver_channel(driver_id) -> str:
+    return "driver:{0}".format(driver_id)
+
+
+def get_travel_channel(travel_id: int) -> str:
+    return "travel:{0}".format(travel_id)
+
+
+def get_request_travel_channel(request_travel_id: int) -> str:
+    return "request_travel:{0}".format(request_travel_id)
+
+
+def publish_travel_event(event: str, travel: Travel, **data) -> None:
+    """Publishes the travel state transition once the current transaction
+    commits.
+
+    The ``taken`` event creates the travel, nobody can be subscribed to its
+    channel yet, so it's published to the channel of its request travel where
+    the rider waits for it.
+    """
+    message = {"event": event, "travel": TravelSerializer(travel).data, **data}
+
+    if event == TRAVEL_TAKEN:
+        channel = get_request_travel_channel(travel.request_travel_id)
+    else:
+        channel = get_travel_channel(travel.id)
+
+    transaction.on_commit(lambda: get_broker().publish(channel, message))
+
+
+def get_request_travels_channel(long: float, lat: float) -> str:
+    """Channel of the request travels with the origin in the grid cell of the
+    point, the streams only subscribe to the cells around them."""
+    return REQUEST_TRAVELS_CHANNEL.format(
+        *grid_cell(long, lat, settings.REQUEST_TRAVEL_STREAM["CELL_SIZE"])
+    )
+
+
+def get_request_travels_channels(long: float, lat: float, radius_km: float):
+    return [
+        REQUEST_TRAVELS_CHANNEL.format(*cell)
+        for cell in grid_cells_in_radius(
+            long, lat, radius_km, settings.REQUEST_TRAVEL_STREAM["CELL_SIZE"]
+        )
+    ]
+
+
+def _get_request_travel_added(request_travel: RequestTravel) -> dict:
+    long, lat = request_travel.origin.coords
+
+    return {
+        "id": request_travel.id,
+        "longitude": long,
+        "latitude": lat,
+        "expires": request_travel.expires.isoformat(),
+        "data": RequestTravelSerializer(request_travel).data,
+    }
+
+
+def publish_request_travel_added(request_travel: RequestTravel) -> None:
+    # Serialized once here instead of once per subscriber.
+    get_broker().publish(
+        get_request_travels_channel(*request_travel.origin.coords),
+        {"event": "add", **_get_request_travel_added(request_travel)},
+    )
+
+
+def publish_request_travels_added(request_travels: list[RequestTravel]) -> None:
+    """Publishes the request travels created together in a message per grid
+    cell."""
+    items_by_channel = {}
+
+    for request_travel in request_travels:
+        channel = get_request_travels_channel(*request_travel.origin.coords)
+        items_by_channel.setdefault(channel, []).append(
+            _get_request_travel_added(request_travel)
+        )
+
+    broker = get_broker()
+
+    for channel, items in items_by_channel.items():
+        broker.publish(channel, {"event": "add_many", "items": items})
+
+
+def publish_request_travel_removed(request_travel: RequestTravel) -> None:
+    get_broker().publish(
+        get_request_travels_channel(*request_travel.origin.coords),
+        {"event": "remove", "id": request_travel.id},
+    )
+
+
+def publish_request_travels_removed(request_travels: list[RequestTravel]) -> None:
+    """Publishes the request travels deleted together in a message per grid
+    cell."""
+    ids_by_channel = {}
+
+    for request_travel in request_travels:
+        channel = get_request_travels_channel(*request_travel.origin.coords)
+        ids_by_channel.setdefault(channel, []).append(request_travel.id)
+
+    broker = get_broker()
+
+    for channel, ids in ids_by_channel.items():
+        broker.publish(channel, {"event": "remove_many", "ids": ids})
+
+
+def publish_dispatch_offer(offer: DispatchOffer) -> None:
+    """Publishes the offer to its driver once the current transaction
+    commits."""
+    message = {"event": "offer", "offer": DispatchOfferSerializer(offer).data}
+
+    transaction.on_commit(
+        lambda: get_broker().publish(get_driver_channel(offer.driver_id), message)
+    )
+
+
+def format_event(event: str, data: dict) -> str:
+    return "event: {0}\ndata: {1}\n\n".format(
+        event, json.dumps(data, cls=DjangoJSONEncoder)
+    )
+
+
+class NearbyRequestTravelStream:
+    """Server-sent events of the pending request travels in a radius.
+
+    The current request travels are sent first as ``add`` events, then the
+    request travels entering or leaving the radius as ``add`` and ``remove``
+    events. The stream ends after ``MAX_DURATION`` seconds, the clients
+    reconnect and get a fresh snapshot.
+    """
+
+    def __init__(self, long: float, lat: float, radius_km: float, get_snapshot):
+        self.long = long
+        self.lat = lat
+        self.radius_km = radius_km
+        self.get_snapshot = get_snapshot
+        self.config = settings.REQUEST_TRAVEL_STREAM
+        self._visible: dict[int, object] = {}
+
+    def __aiter__(self):
+        return self._stream()
+
+    def _add(self, request_travel_id, expires, data, distance_km):
+        self._visible[request_travel_id] = expires
+
+        return format_event("add", {"distance": distance_km, "data": data})
+
+    def _remove(self, request_travel_id):
+        del self._visible[request_travel_id]
+
+        return format_event("remove", {"id": request_travel_id})
+
+    def _remove_expired(self):
+        current_time = timezone.now()
+        expired = [
+            request_travel_id
+            for request_travel_id, expires in self._visible.items()
+            if expires < current_time
+        ]
+
+        return [self._remove(request_travel_id) for request_travel_id in expired]
+
+    def _handle(self, message):
+        if message["event"] == "add_many":
+            messages = [{"event": "add", **item} for item in message["items"]]
+        elif message["event"] == "remove_many":
+            messages = [{"event": "remove", "id": id} for id in message["ids"]]
+        else:
+            messages = [message]
+
+        events = []
+
+        for message in messages:
+            event = self._handle_one(message)
+
+            if event is not None:
+                events.append(event)
+
+        return events
+
+    def _handle_one(self, message):
+        request_travel_id = message["id"]
+
+        if message["event"] == "add":
+            distance_km = haversine_km(
+                self.long, self.lat, message["longitude"], message["latitude"]
+            )
+
+            if distance_km <= self.radius_km:
+                return self._add(
+                    request_travel_id,
+                    parse_datetime(message["expires"]),
+                    message["data"],
+                    distance_km,
+                )
+
+        if request_travel_id in self._visible:
+            return self._remove(request_travel_id)
+
+        return None
+
+    async def _stream(self):
+        subscription = get_broker().subscribe(
+            *get_request_travels_channels(self.long, self.lat, self.radius_km)
+        )
+
+        try:
+            yield "retry: {0}\n\n".format(self.config["RETRY"] * 1000)
+
+            # Subscribed before taking the snapshot so no event is lost, the
+            # events already in the snapshot are sent again.
+            for distance_km, request_travel, data in await sync_to_async(
+                self.get_snapshot
+            )():
+                yield self._add(
+                    request_travel.id, request_travel.expires, data, distance_km
+                )
+
+            deadline = time.monotonic() + self.config["MAX_DURATION"]
+
+            while not subscription.overflowed and time.monotonic() < deadline:
+                message = await subscription.get(timeout=self.config["KEEPALIVE"])
+
+                for event in self._remove_expired():
+                    yield event
+
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+
+                for event in self._handle(message):
+                    yield event
+        finally:
+            subscription.close()
@@ -37,3 +37,15 @@ class InvalidVehicleDriver(APIException):
     status_code = 400
     default_detail = _("Invalid vehicle")
     default_code = "travel_error"
+
+
+class DispatchOfferDoesNotFound(APIException):
+    status_code = 404
+    default_detail = _("Offer does not found")
+    default_code = "offer_error"
+
+
+class StreamRequiresAsgi(APIException):
+    status_code = 501
+    default_detail = _("The stream is only served by the ASGI server")
+    default_code = "stream_error"
@@ -1,3 +1,6 @@
+from copy import copy
+
+from django.contrib.gis.db.models.functions import Distance
 from django.contrib.gis.geos import Point
 from django.contrib.gis.measure import D
 
@@ -6,11 +9,22 @@ from rest_framework.filters import BaseFilterBackend
 from django_filters.filterset import FilterSet
 
 from apps.travels.models import RequestTravel
+from apps.travels.spatial_index import (
+    get_request_travel_index,
+    warm_request_travel_index_async,
+)
 from apps.travels.api.serializers.request_travel_serializer import (
     RequestTravelQuerySerializer,
 )
 
 
+class SphereDistance(Distance):
+    """Spherical distance on geography, it matches the haversine distance used
+    by the spatial index so both can share the same ordering."""
+
+    template = "%(function)s(%(expressions)s, false)"
+
+
 class RequestTravelDistanceToRadiusFilter(BaseFilterBackend):
     latitude_param = "latitude"
     longitude_param = "longitude"
@@ -39,10 +53,35 @@ class RequestTravelDistanceToRadiusFilter(BaseFilterBackend):
         point = self._get_filter_point(serializer.data)
         radius = serializer.data.get(self.radius_param)
 
-        queryset = queryset.filter(origin__distance_lte=(point, D(km=radius)))
+        # The index only holds pending, non expired request travels, so when it
+        # is warm the database queryset is not evaluated at all.
+        index = get_request_travel_index()
+
+        if index is not None:
+            results = index.query(point.x, point.y, radius)
+
+            if results is not None:
+                return [
+                    self._with_distance(request_travel, D(km=distance))
+                    for distance, request_travel in results
+                ]
+
+            # The request doesn't wait for the reload, it's served by PostGIS.
+            warm_request_travel_index_async(index)
+
+        queryset = queryset.filter(origin__distance_lte=(point, D(km=radius))).annotate(
+            distance=SphereDistance("origin", point)
+        )
 
         return queryset
 
+    def _with_distance(self, request_travel, distance):
+        # The index instances are shared between threads, annotate a copy.
+        request_travel = copy(request_travel)
+        request_travel.distance = distance
+
+        return request_travel
+
     def get_schema_operation_parameters(self, view):
         return [
             {
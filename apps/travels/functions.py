@@ -0,0 +1,14 @@
+from django.db.models import FloatField, Func
+
+
+class GeographyX(Func):
+    """Longitude of a geography point, read in SQL to skip the GEOS geometry
+    built for every row."""
+
+    function = "ST_X"
+    template = "%(function)s(%(expressions)s::geometry)"
+    output_field = FloatField()
+
+
+class GeographyY(GeographyX):
+    function = "ST_Y"
@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+# Length of a degree of latitude on the sphere used for the distances, a longer
+# degree would make the bounding boxes miss points at the edge of the radius.
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(long1: float, lat1: float, long2: float, lat2: float) -> float:
+    """Great circle distance, as ``ST_Distance(geography, geography, false)``
+    (see ``SphereDistance``)."""
+    long1, lat1, long2, lat2 = map(math.radians, (long1, lat1, long2, lat2))
+
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((long2 - long1) / 2) ** 2
+    )
+
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_km_array(long1, lat1, long2, lat2) -> np.ndarray:
+    """Element wise ``haversine_km`` of the broadcast arrays."""
+    long1, lat1, long2, lat2 = map(np.radians, (long1, lat1, long2, lat2))
+
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((long2 - long1) / 2) ** 2
+    )
+
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def haversine_matrix_km(origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+    """Distances between every ``(long, lat)`` row of ``origins`` and of
+    ``destinations``, with shape ``(len(origins), len(destinations))``."""
+    origins = np.asarray(origins, dtype=np.float64)
+    destinations = np.asarray(destinations, dtype=np.float64)
+
+    return haversine_km_array(
+        origins[:, 0, np.newaxis],
+        origins[:, 1, np.newaxis],
+        destinations[:, 0],
+        destinations[:, 1],
+    )
+
+
+def bounding_box(
+    long: float, lat: float, radius_km: float
+) -> tuple[float, float, float, float]:
+    """``(min_long, min_lat, max_long, max_lat)`` of a box holding the circle.
+
+    The longitudes are not wrapped, ``min_long`` is below -180 or ``max_long``
+    above 180 when the box crosses the antimeridian, and they span 360 degrees
+    when the box holds a pole.
+    """
+    lat_delta = radius_km / KM_PER_DEGREE
+    min_lat = max(lat - lat_delta, -90)
+    max_lat = min(lat + lat_delta, 90)
+
+    cos_lat = min(math.cos(math.radians(min_lat)), math.cos(math.radians(max_lat)))
+
+    if cos_lat <= 0 or radius_km / (KM_PER_DEGREE * cos_lat) >= 180:
+        return -180, min_lat, 180, max_lat
+
+    long_delta = radius_km / (KM_PER_DEGREE * cos_lat)
+
+    return long - long_delta, min_lat, long + long_delta, max_lat
+
+
+def grid_cell(long: float, lat: float, cell_size: float) -> tuple[int, int]:
+    """``(lat, long)`` indexes of the ``cell_size`` degrees grid cell holding
+    the point, the longitudes wrap around the antimeridian."""
+    return (
+        math.floor(lat / cell_size),
+        math.floor(long / cell_size) % math.ceil(360 / cell_size),
+    )
+
+
+def grid_cells_in_radius(long: float, lat: float, radius_km: float, cell_size: float):
+    """Yields the ``grid_cell`` of the cells overlapping the ``bounding_box``
+    of the circle."""
+    lon_cells_num = math.ceil(360 / cell_size)
+    min_long, min_lat, max_long, max_lat = bounding_box(long, lat, radius_km)
+    min_lat_cell = math.floor(min_lat / cell_size)
+    max_lat_cell = math.floor(max_lat / cell_size)
+
+    if max_long - min_long >= 360:
+        lon_cells = range(lon_cells_num)
+    else:
+        min_lon_cell = math.floor(min_long / cell_size)
+        max_lon_cell = math.floor(max_long / cell_size)
+        lon_cells = {
+            cell % lon_cells_num for cell in range(min_lon_cell, max_lon_cell + 1)
+        }
+
+    for lat_cell in range(min_lat_cell, max_lat_cell + 1):
+        for lon_cell in lon_cells:
+            yield (lat_cell, lon_cell)
+
+
+def bounding_box_mask(longs, lats, long: float, lat: float, radius_km: float):
+    """Which of the points are in the ``bounding_box`` of the circle, a cheap
+    prefilter of ``radius_mask``."""
+    min_long, min_lat, max_long, max_lat = bounding_box(long, lat, radius_km)
+    longs = np.asarray(longs)
+    lats = np.asarray(lats)
+
+    return (
+        (lats >= min_lat)
+        & (lats <= max_lat)
+        & ((longs - min_long) % 360 <= max_long - min_long)
+    )
+
+
+def radius_mask(longs, lats, long: float, lat: float, radius_km: float):
+    """Which of the points are within ``radius_km`` of ``(long, lat)``, the
+    distances are only computed for the points in the bounding box."""
+    longs = np.asarray(longs, dtype=np.float64)
+    lats = np.asarray(lats, dtype=np.float64)
+
+    mask = bounding_box_mask(longs, lats, long, lat, radius_km)
+    candidates = np.flatnonzero(mask)
+    mask[candidates] = (
+        haversine_km_array(long, lat, longs[candidates], lats[candidates]) <= radius_km
+    )
+
+    return mask
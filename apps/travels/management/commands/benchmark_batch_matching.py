@@ -0,0 +1,65 @@
+import time
+
+import numpy as np
+
+from django.core.management.base import BaseCommand
+
+from apps.travels.geo import haversine_matrix_km
+from apps.travels.matching import solve_assignment
+
+
+def greedy_assignment(cost: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Every row in order takes its nearest free column, as the first come
+    dispatch does."""
+    cost = cost.copy()
+    rows, cols = [], []
+
+    for row in range(min(cost.shape)):
+        col = cost[row].argmin()
+        rows.append(row)
+        cols.append(col)
+        cost[:, col] = np.inf
+
+    return np.array(rows), np.array(cols)
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the batch matching of synthetic request travels and drivers "
+        "spread over a city and compares its total pickup distance with the "
+        "first come matching."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000])
+        parser.add_argument("--span", type=float, default=0.2)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        span = options["span"]
+
+        for size in options["sizes"]:
+            request_travels = rng.uniform(0, span, (size, 2))
+            drivers = rng.uniform(0, span, (size, 2))
+
+            start = time.perf_counter()
+            cost = 1000 * haversine_matrix_km(request_travels, drivers)
+            matrix_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            rows, cols = solve_assignment(cost)
+            solve_elapsed = time.perf_counter() - start
+
+            greedy_rows, greedy_cols = greedy_assignment(cost)
+
+            self.stdout.write(
+                "{0}x{0}: cost matrix {1:.2f}s, assignment {2:.2f}s, mean pickup "
+                "{3:.0f}m (first come {4:.0f}m)".format(
+                    size,
+                    matrix_elapsed,
+                    solve_elapsed,
+                    cost[rows, cols].mean(),
+                    cost[greedy_rows, greedy_cols].mean(),
+                )
+            )
@@ -0,0 +1,66 @@
+import time
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.travels.models import RequestTravel
+from apps.travels.services import clear_expired_request_travels
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills the database with synthetic expired request travels and times "
+        "the expired request travels sweeper. Do not run it in production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--time-budget", type=float, default=3600)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        user, _ = get_user_model().objects.get_or_create(
+            username="benchmark_sweeper",
+            defaults={
+                "email": "benchmark_sweeper@example.com",
+                "first_name": "benchmark",
+                "last_name": "sweeper",
+            },
+        )
+        expires = timezone.now() - timedelta(hours=1)
+
+        start = time.perf_counter()
+
+        for offset in range(0, rows, 10000):
+            RequestTravel.objects.bulk_create(
+                RequestTravel(
+                    user=user,
+                    origin=Point((i % 360) - 180, (i % 180) - 90),
+                    destination=Point(0, 0),
+                    expires=expires,
+                )
+                for i in range(offset, min(offset + 10000, rows))
+            )
+
+        self.stdout.write(
+            "Inserted {0} rows in {1:.2f}s".format(rows, time.perf_counter() - start)
+        )
+
+        start = time.perf_counter()
+        deleted_num = clear_expired_request_travels(
+            batch_size=options["batch_size"], time_budget=options["time_budget"]
+        )
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            "Deleted {0} rows in {1:.2f}s ({2:.0f} rows/s)".format(
+                deleted_num, elapsed, deleted_num / elapsed if elapsed else 0
+            )
+        )
+
+        user.delete()
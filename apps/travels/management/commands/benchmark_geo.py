@@ -0,0 +1,79 @@
+import time
+
+import numpy as np
+
+from django.core.management.base import BaseCommand
+
+from apps.travels.geo import (
+    bounding_box_mask,
+    haversine_km,
+    haversine_km_array,
+    radius_mask,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the distance functions of apps.travels.geo over random points "
+        "around the world, against a loop of haversine_km."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--points", type=int, default=1_000_000)
+        parser.add_argument("--radius", type=float, default=10)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def _time(self, name, points_num, repeat, function, *args):
+        elapsed = min(self._time_once(function, *args) for _ in range(max(1, repeat)))
+
+        self.stdout.write(
+            "{0}: {1:.4f}s ({2:.0f} points/s)".format(
+                name, elapsed, points_num / elapsed if elapsed else 0
+            )
+        )
+
+    def _time_once(self, function):
+        start = time.perf_counter()
+        function()
+
+        return time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        points_num = options["points"]
+        repeat = options["repeat"]
+        radius_km = options["radius"]
+
+        longs = rng.uniform(-180, 180, points_num)
+        lats = np.degrees(np.arcsin(rng.uniform(-1, 1, points_num)))
+        long, lat = -3.7038, 40.4168
+
+        # The loop is slow, it is timed on a sample and once.
+        sample_num = min(points_num, 100_000)
+        sample = list(zip(longs[:sample_num].tolist(), lats[:sample_num].tolist()))
+        self._time(
+            "haversine_km loop",
+            sample_num,
+            1,
+            lambda: [haversine_km(long, lat, *point) for point in sample],
+        )
+
+        self._time(
+            "haversine_km_array",
+            points_num,
+            repeat,
+            lambda: haversine_km_array(long, lat, longs, lats),
+        )
+        self._time(
+            "bounding_box_mask",
+            points_num,
+            repeat,
+            lambda: bounding_box_mask(longs, lats, long, lat, radius_km),
+        )
+        self._time(
+            "radius_mask",
+            points_num,
+            repeat,
+            lambda: radius_mask(longs, lats, long, lat, radius_km),
+        )
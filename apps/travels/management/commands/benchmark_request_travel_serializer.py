@@ -0,0 +1,83 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand
+
+from apps.travels.models import RequestTravel
+from apps.travels.api.serializers.request_travel_serializer import (
+    RequestTravelReadSerializer,
+    RequestTravelSerializer,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills the database with synthetic request travels and compares the "
+        "per row cost of RequestTravelSerializer and RequestTravelReadSerializer, "
+        "including the query. Do not run it in production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def _time(self, func, repeat):
+        best = None
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        return best
+
+    def handle(self, *args, **options):
+        user, _ = get_user_model().objects.get_or_create(
+            username="benchmark_serializer",
+            defaults={
+                "email": "benchmark_serializer@example.com",
+                "first_name": "benchmark",
+                "last_name": "serializer",
+            },
+        )
+
+        try:
+            for rows in options["rows"]:
+                RequestTravel.objects.filter(user=user).delete()
+                RequestTravel.objects.bulk_create(
+                    (
+                        RequestTravel(
+                            user=user,
+                            origin=Point((i % 360) - 180, (i % 180) - 90),
+                            destination=Point(0, 0),
+                        )
+                        for i in range(rows)
+                    ),
+                    batch_size=10000,
+                )
+                queryset = RequestTravel.objects.filter(user=user)
+
+                model_time = self._time(
+                    lambda: RequestTravelSerializer(queryset.all(), many=True).data,
+                    options["repeat"],
+                )
+                read_time = self._time(
+                    lambda: RequestTravelReadSerializer(
+                        RequestTravelReadSerializer.get_values(queryset.all())
+                    ).data,
+                    options["repeat"],
+                )
+
+                self.stdout.write(
+                    "{0} rows: RequestTravelSerializer {1:.1f}us/row, "
+                    "RequestTravelReadSerializer {2:.1f}us/row ({3:.1f}x)".format(
+                        rows,
+                        model_time / rows * 1e6,
+                        read_time / rows * 1e6,
+                        model_time / read_time if read_time else 0,
+                    )
+                )
+        finally:
+            user.delete()
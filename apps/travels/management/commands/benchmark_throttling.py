@@ -0,0 +1,59 @@
+import time
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from apps.throttling import ScopedTokenBucketThrottle
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the throttle check of the request travels listing for synthetic "
+        "users, with the buckets in the process memory and, if --cache-alias is "
+        "given, in that cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--checks", type=int, default=100000)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--cache-alias", default=None)
+
+    def handle(self, *args, **options):
+        requests = [
+            SimpleNamespace(user=SimpleNamespace(id=uuid4(), is_authenticated=True))
+            for _ in range(options["users"])
+        ]
+        view = SimpleNamespace(throttle_scope="request_travel_list")
+
+        backends = [("local", None)]
+
+        if options["cache_alias"]:
+            backends.append((options["cache_alias"], options["cache_alias"]))
+
+        for name, alias in backends:
+            config = {**settings.THROTTLING, "ENABLED": True, "CACHE_ALIAS": alias}
+
+            with override_settings(THROTTLING=config):
+                self._run(name, requests, view, options["checks"])
+
+    def _run(self, name, requests, view, checks):
+        throttle = ScopedTokenBucketThrottle()
+        users_num = len(requests)
+        allowed_num = 0
+
+        start = time.perf_counter()
+
+        for i in range(checks):
+            allowed_num += throttle.allow_request(requests[i % users_num], view)
+
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            "{0}: {1:.2f}us per check, {2} of {3} allowed".format(
+                name, elapsed / checks * 1e6, allowed_num, checks
+            )
+        )
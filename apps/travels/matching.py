@@ -0,0 +1,222 @@
+import logging
+
+from datetime import timedelta
+
+import numpy as np
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.drivers.models import Drivers
+from apps.travels.events import publish_dispatch_offer
+from apps.travels.functions import GeographyX, GeographyY
+from apps.travels.geo import haversine_matrix_km
+from apps.travels.models import DispatchOffer, RequestTravel, Travel
+
+logger = logging.getLogger(__name__)
+
+
+def solve_assignment(
+    cost: np.ndarray, tolerance: float = 1.0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pairs every row with a different column (or every column with a
+    different row, whichever is fewer) at a minimum total cost.
+
+    Implements the auction algorithm with epsilon scaling, each bidding round
+    is vectorized over all the unassigned rows. The total cost is within
+    ``tolerance`` per pair of the optimum. Returns the ``(rows, cols)`` index
+    arrays of the pairs, sorted by row.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    rows_num, cols_num = cost.shape
+    size = max(rows_num, cols_num)
+
+    if not rows_num or not cols_num:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    # Squares the problem with dummy rows or columns as costly as the worst
+    # pair, the noise breaks their ties so they don't bid one at a time.
+    rng = np.random.default_rng(0)
+    benefit = rng.uniform(0, tolerance, (size, size)) - cost.max()
+    benefit[:rows_num, :cols_num] = -cost
+
+    rows = np.arange(size)
+    prices = np.zeros(size)
+    epsilon = max(tolerance, float(np.ptp(benefit)) / 8)
+
+    while True:
+        owners = np.full(size, -1)
+        assigned = np.full(size, -1)
+        bidders = rows
+
+        while bidders.size:
+            values = benefit[bidders] - prices
+            bidder_index = np.arange(bidders.size)
+            best = values.argmax(axis=1)
+            best_values = values[bidder_index, best]
+
+            if size > 1:
+                values[bidder_index, best] = -np.inf
+                second_values = values.max(axis=1)
+            else:
+                second_values = best_values
+
+            bids = prices[best] + best_values - second_values + epsilon
+
+            # The highest bid on every column wins it.
+            order = np.lexsort((bids, best))
+            is_last = np.append(best[order][1:] != best[order][:-1], True)
+            winners = order[is_last]
+            cols = best[winners]
+
+            outbid = owners[cols]
+            assigned[outbid[outbid >= 0]] = -1
+            owners[cols] = bidders[winners]
+            assigned[bidders[winners]] = cols
+            prices[cols] = bids[winners]
+
+            bidders = rows[assigned < 0]
+
+        if epsilon <= tolerance:
+            break
+
+        epsilon = max(tolerance, epsilon / 8)
+
+    cols = assigned[:rows_num]
+    is_real = cols < cols_num
+
+    return rows[:rows_num][is_real], cols[is_real]
+
+
+def get_unmatched_request_travels(limit: int) -> list[RequestTravel]:
+    """Oldest pending request travels without open offers, annotated with
+    their origin ``long`` and ``lat``."""
+    return list(
+        RequestTravel.objects.pending()
+        .with_trip_distance()
+        .exclude(offers__status__in=(DispatchOffer.QUEUED, DispatchOffer.OFFERED))
+        .annotate(long=GeographyX("origin"), lat=GeographyY("origin"))
+        .order_by("created_time")[:limit]
+    )
+
+
+def lock_unmatched_request_travels(request_travel_ids) -> set[int]:
+    """Locks the request travels still pending and without open offers, the
+    ones locked by a take in progress are skipped."""
+    return set(
+        RequestTravel.objects.pending()
+        .filter(id__in=request_travel_ids)
+        .exclude(offers__status__in=(DispatchOffer.QUEUED, DispatchOffer.OFFERED))
+        .select_for_update(skip_locked=True, of=("self",))
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+def get_idle_drivers(limit: int) -> list[tuple]:
+    """``(id, user_id, long, lat)`` of the active and idle drivers located
+    recently."""
+    config = settings.REQUEST_TRAVEL_DISPATCH
+    located_since = timezone.now() - timedelta(seconds=config["LOCATION_MAX_AGE"])
+
+    return list(
+        Drivers.objects.filter(
+            is_active=True,
+            status=Drivers.ACTIVE,
+            location__updated_time__gte=located_since,
+        )
+        .exclude(travels__status=Travel.IN_COURSE)
+        .exclude(offers__status=DispatchOffer.OFFERED)
+        .annotate(long=GeographyX("location__point"), lat=GeographyY("location__point"))
+        .values_list("id", "user_id", "long", "lat")[:limit]
+    )
+
+
+def match_request_travels() -> list[DispatchOffer]:
+    """Offers the unmatched request travels to the idle drivers at once,
+    minimizing the total distance from the drivers to the request travels
+    origins instead of offering every request travel its nearest driver.
+
+    Expires the stale offers first. Returns the created offers.
+    """
+    config = settings.REQUEST_TRAVEL_BATCH_MATCHING
+    dispatch_config = settings.REQUEST_TRAVEL_DISPATCH
+    radius_m = dispatch_config["RADIUS"] * 1000
+    current_time = timezone.now()
+
+    DispatchOffer.objects.filter(
+        status=DispatchOffer.OFFERED, expires__lte=current_time
+    ).update(status=DispatchOffer.EXPIRED)
+
+    # The candidates are read and matched without locks, so the takes and the
+    # other writers aren't blocked during the solve.
+    request_travels = get_unmatched_request_travels(config["MAX_REQUEST_TRAVELS"])
+    drivers = get_idle_drivers(config["MAX_DRIVERS"])
+
+    if not request_travels or not drivers:
+        return []
+
+    cost = 1000 * haversine_matrix_km(
+        np.array([(rt.long, rt.lat) for rt in request_travels]),
+        np.array([(long, lat) for _, _, long, lat in drivers]),
+    )
+
+    # Drivers can't take their own request travels nor be offered the same
+    # request travel twice.
+    driver_cols = {driver[0]: col for col, driver in enumerate(drivers)}
+    user_cols = {driver[1]: col for col, driver in enumerate(drivers)}
+    request_travel_rows = {rt.id: row for row, rt in enumerate(request_travels)}
+
+    for row, request_travel in enumerate(request_travels):
+        if request_travel.user_id in user_cols:
+            cost[row, user_cols[request_travel.user_id]] = np.inf
+
+    offered = DispatchOffer.objects.filter(
+        request_travel_id__in=request_travel_rows, driver_id__in=driver_cols
+    ).values_list("request_travel_id", "driver_id")
+
+    for request_travel_id, driver_id in offered:
+        cost[request_travel_rows[request_travel_id], driver_cols[driver_id]] = np.inf
+
+    # Pairs out of the radius are left unmatched.
+    cost[cost > radius_m] = 2 * radius_m
+    rows, cols = solve_assignment(cost)
+    is_matched = cost[rows, cols] <= radius_m
+    pairs = list(zip(rows[is_matched], cols[is_matched]))
+
+    if not pairs:
+        return []
+
+    expires = current_time + timedelta(seconds=dispatch_config["OFFER_TIMEOUT"])
+
+    # Only the matched request travels are locked, and just to insert their
+    # offers, the ones taken or offered since they were read are left out.
+    with transaction.atomic():
+        unmatched_ids = lock_unmatched_request_travels(
+            [request_travels[row].id for row, _ in pairs]
+        )
+        offers = DispatchOffer.objects.bulk_create(
+            [
+                DispatchOffer(
+                    request_travel=request_travels[row],
+                    driver_id=drivers[col][0],
+                    rank=0,
+                    distance=cost[row, col],
+                    status=DispatchOffer.OFFERED,
+                    expires=expires,
+                )
+                for row, col in pairs
+                if request_travels[row].id in unmatched_ids
+            ]
+        )
+
+        for offer in offers:
+            publish_dispatch_offer(offer)
+
+    logger.info(
+        f"Matched {len(offers)} of {len(request_travels)} request travels with "
+        f"{len(drivers)} idle drivers"
+    )
+
+    return offers
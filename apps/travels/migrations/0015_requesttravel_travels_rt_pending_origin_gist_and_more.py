@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:00
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("travels", "0014_alter_confirmationtravel_driver_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="requesttravel",
+            name="origin",
+            field=django.contrib.gis.db.models.fields.PointField(
+                geography=True, spatial_index=False, srid=4326
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="requesttravel",
+            index=django.contrib.postgres.indexes.GistIndex(
+                condition=models.Q(("status", "P")),
+                fields=["origin"],
+                name="travels_rt_pending_origin_gist",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="requesttravel",
+            index=models.Index(
+                fields=["status", "expires"], name="travels_rt_status_expires_idx"
+            ),
+        ),
+    ]
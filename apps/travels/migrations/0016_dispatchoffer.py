@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("drivers", "0004_driverlocation"),
+        ("travels", "0015_requesttravel_travels_rt_pending_origin_gist_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DispatchOffer",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                (
+                    "distance",
+                    models.FloatField(verbose_name="distance to the origin in meters"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("Q", "Queued"),
+                            ("O", "Offered"),
+                            ("A", "Accepted"),
+                            ("R", "Rejected"),
+                            ("E", "Expired"),
+                            ("C", "Cancelled"),
+                        ],
+                        default="Q",
+                        max_length=1,
+                        verbose_name="offer status",
+                    ),
+                ),
+                (
+                    "created_time",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("expires", models.DateTimeField(blank=True, null=True)),
+                (
+                    "driver",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="offers",
+                        to="drivers.drivers",
+                    ),
+                ),
+                (
+                    "request_travel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="offers",
+                        to="travels.requesttravel",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="dispatchoffer",
+            index=models.Index(
+                fields=["driver", "status"], name="travels_offer_driver_status_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dispatchoffer",
+            constraint=models.UniqueConstraint(
+                fields=("request_travel", "driver"),
+                name="travels_offer_unique_driver",
+            ),
+        ),
+    ]
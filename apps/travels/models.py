@@ -1,6 +1,9 @@
 from datetime import timedelta
 
 from django.contrib.gis.db import models
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.postgres.indexes import GistIndex
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.utils.timezone import now
@@ -12,6 +15,20 @@ def request_travel_exp_time():
     return now() + timedelta(minutes=RequestTravel.DELETE_TIME_MIN)
 
 
+class TripDistanceQuerySet(models.QuerySet):
+    def with_trip_distance(self):
+        # Geodesic distance on the geography fields, in meters.
+        return self.annotate(trip_distance=Distance("origin", "destination"))
+
+
+class RequestTravelQuerySet(TripDistanceQuerySet):
+    def pending(self):
+        return self.filter(status=RequestTravel.PENDING, expires__gte=now())
+
+    def expired(self):
+        return self.filter(status=RequestTravel.PENDING, expires__lte=now())
+
+
 # Create your models here.
 class RequestTravel(models.Model):
     DELETE_TIME_MIN = 30
@@ -28,7 +45,8 @@ class RequestTravel(models.Model):
     user = models.ForeignKey(
         get_user_model(), on_delete=models.CASCADE, related_name="req_travels"
     )
-    origin = models.PointField(srid=4326, geography=True)
+    # Only the pending origins are searched, by the partial index in Meta.
+    origin = models.PointField(srid=4326, geography=True, spatial_index=False)
     destination = models.PointField(srid=4326, geography=True)
     created_time = models.DateTimeField(default=now)
     status = models.CharField(
@@ -39,9 +57,19 @@ class RequestTravel(models.Model):
     )
     expires = models.DateTimeField(default=request_travel_exp_time)
 
-    @property
-    def distance_m(self):
-        return self.origin.distance(self.destination) * 1000
+    objects = RequestTravelQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GistIndex(
+                fields=["origin"],
+                condition=Q(status="P"),
+                name="travels_rt_pending_origin_gist",
+            ),
+            models.Index(
+                fields=["status", "expires"], name="travels_rt_status_expires_idx"
+            ),
+        ]
 
     @property
     def is_expired(self):
@@ -87,7 +115,8 @@ class Travel(models.Model):
         related_name="travels",
     )
 
-    origin = models.PointField(srid=4326, geography=True)
+    # Only the pending origins are searched, by the partial index in Meta.
+    origin = models.PointField(srid=4326, geography=True, spatial_index=False)
     destination = models.PointField(srid=4326, geography=True)
     taked_date = models.DateTimeField(default=now)
 
@@ -98,9 +127,7 @@ class Travel(models.Model):
         default=IN_COURSE,
     )
 
-    @property
-    def distance_m(self):
-        return self.origin.distance(self.destination) * 1000
+    objects = TripDistanceQuerySet.as_manager()
 
     def __str__(self):
         return "Travel id {0}, origin: {1}".format(self.id, self.origin.coords)
@@ -127,3 +154,61 @@ class ConfirmationTravel(models.Model):
 
     def __str__(self):
         return "ConfirmationTravel id {0}, travel: {1}".format(self.id, self.travel.id)
+
+
+class DispatchOfferQuerySet(models.QuerySet):
+    def open(self):
+        return self.filter(status__in=(DispatchOffer.QUEUED, DispatchOffer.OFFERED))
+
+
+class DispatchOffer(models.Model):
+    """A request travel offered to one of its nearest drivers, the drivers are
+    offered one at a time in ``rank`` order."""
+
+    QUEUED = "Q"
+    OFFERED = "O"
+    ACCEPTED = "A"
+    REJECTED = "R"
+    EXPIRED = "E"
+    CANCELLED = "C"
+
+    CHOICES_STATUS = (
+        (QUEUED, _("Queued")),
+        (OFFERED, _("Offered")),
+        (ACCEPTED, _("Accepted")),
+        (REJECTED, _("Rejected")),
+        (EXPIRED, _("Expired")),
+        (CANCELLED, _("Cancelled")),
+    )
+
+    request_travel = models.ForeignKey(
+        RequestTravel, on_delete=models.CASCADE, related_name="offers"
+    )
+    driver = models.ForeignKey(Drivers, on_delete=models.CASCADE, related_name="offers")
+    rank = models.PositiveSmallIntegerField()
+    distance = models.FloatField(_("distance to the origin in meters"))
+    status = models.CharField(
+        _("offer status"), max_length=1, choices=CHOICES_STATUS, default=QUEUED
+    )
+    created_time = models.DateTimeField(default=now)
+    expires = models.DateTimeField(null=True, blank=True)
+
+    objects = DispatchOfferQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["request_travel", "driver"],
+                name="travels_offer_unique_driver",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["driver", "status"], name="travels_offer_driver_status_idx"
+            )
+        ]
+
+    def __str__(self):
+        return "DispatchOffer id {0}, request travel: {1}, rank: {2}".format(
+            self.id, self.request_travel_id, self.rank
+        )
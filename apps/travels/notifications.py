@@ -0,0 +1,45 @@
+from apps.mail import make_email
+from apps.outbox.services import enqueue_task
+from apps.travels.models import ConfirmationTravel, Travel
+from apps.users.models import User
+from apps.users.tasks import send_emails_to_users
+
+
+def _enqueue_email(subject: str, message: str, recipient_list: list[str]) -> None:
+    enqueue_task(
+        send_emails_to_users.name, [make_email(subject, message, recipient_list)]
+    )
+
+
+def notify_travel_taken(travel: Travel) -> None:
+    _enqueue_email(
+        "Your travel request has been taken!",
+        "Your travel request has been taken by {0}, the travel id is {1}".format(
+            travel.driver.driver_name, travel.id
+        ),
+        [travel.user.email],
+    )
+
+
+def notify_travel_cancelled(travel: Travel, user: User) -> None:
+    _enqueue_email(
+        "Your travel has been cancelled!",
+        "Your travel has been cancelled by {0}".format(user.get_full_name()),
+        [travel.user.email, travel.driver.user.email],
+    )
+
+
+def notify_travel_confirmed(
+    confirmation_travel: ConfirmationTravel, user: User
+) -> None:
+    msg = (
+        "Your travel has been confirmed by {0}. Travel is done."
+        if confirmation_travel.check_driver and confirmation_travel.check_user
+        else "Your travel has been confirmed by {0}."
+    )
+
+    _enqueue_email(
+        "Your travel has been confirmed!",
+        msg.format(user.get_full_name()),
+        [confirmation_travel.user.email, confirmation_travel.driver.user.email],
+    )
@@ -0,0 +1,135 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from bisect import bisect_right
+
+from django.conf import settings
+from django.contrib.gis.measure import D
+from django.db.models import Q, QuerySet
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class RequestTravelDistanceCursorPagination(BasePagination):
+    """Keyset pagination over request travels ordered by ``(distance, id)``.
+
+    The items must have a ``distance`` attribute or key, as set by
+    ``RequestTravelDistanceToRadiusFilter``.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = _("Invalid cursor")
+
+    def get_page_size(self, request):
+        config = settings.REQUEST_TRAVEL_PAGINATION
+        page_size = config["PAGE_SIZE"]
+
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            pass
+
+        return max(1, min(page_size, config["MAX_PAGE_SIZE"]))
+
+    def encode_cursor(self, position: tuple[float, int]) -> str:
+        distance, request_travel_id = position
+        cursor = "{0!r}|{1}".format(distance, request_travel_id)
+
+        return urlsafe_b64encode(cursor.encode("ascii")).decode("ascii")
+
+    def decode_cursor(self, request) -> tuple[float, int] | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if encoded is None:
+            return None
+
+        try:
+            cursor = urlsafe_b64decode(encoded.encode("ascii")).decode("ascii")
+            distance, request_travel_id = cursor.split("|")
+
+            return float(distance), int(request_travel_id)
+        except (BinasciiError, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position(self, obj) -> tuple[float, int]:
+        if isinstance(obj, dict):
+            return obj["distance"].m, obj["id"]
+
+        return obj.distance.m, obj.id
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        if isinstance(queryset, QuerySet):
+            queryset = queryset.order_by("distance", "id")
+
+            if cursor is not None:
+                distance, request_travel_id = cursor
+                queryset = queryset.filter(
+                    Q(distance__gt=D(m=distance))
+                    | Q(distance=D(m=distance), id__gt=request_travel_id)
+                )
+        elif cursor is not None:
+            start = bisect_right(queryset, cursor, key=self._get_position)
+            queryset = queryset[start:]
+
+        results = list(queryset[: self.page_size + 1])
+
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        return self.page
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        cursor = self.encode_cursor(self._get_position(self.page[-1]))
+
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "schema": {"type": "string"},
+                "description": "The pagination cursor value.",
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "schema": {
+                    "type": "integer",
+                    "maximum": settings.REQUEST_TRAVEL_PAGINATION["MAX_PAGE_SIZE"],
+                    "minimum": 1,
+                },
+                "description": "Number of results to return per page.",
+            },
+        ]
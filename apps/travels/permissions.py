@@ -1,21 +1,11 @@
 from rest_framework.permissions import BasePermission
 
-from apps.drivers.models import Drivers
-from apps.drivers.service import set_user_driver_inactive
+from apps.drivers.cache import get_user_driver_eligibility
 
 
 class IsDriverActivePermission(BasePermission):
     def has_permission(self, request, view):
-        try:
-            obj = Drivers.objects.values("is_active", "vehicles").get(user=request.user)
-        except Drivers.DoesNotExist:
-            return False
-
-        if obj.get("is_active", False) and obj.get("vehicles", None) is None:
-            set_user_driver_inactive(request.user.id)
-            return False
-
-        return bool(request.user and obj.get("is_active", False))
+        return bool(request.user and get_user_driver_eligibility(request.user.id))
 
 
 class IsOwnerPermission(BasePermission):
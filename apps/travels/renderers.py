@@ -0,0 +1,40 @@
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.travels.events import format_event
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Accepts ``text/event-stream`` requests, the streams are returned as
+    ``StreamingHttpResponse`` so only the errors are rendered here."""
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return format_event("error", data).encode(self.charset)
+
+
+def stream_json_array(items, chunk_size: int = 500):
+    """Encodes ``items`` as a JSON array in chunks of ``chunk_size`` items, to
+    be sent with ``StreamingHttpResponse``."""
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    chunk = []
+    separator = "["
+
+    for item in items:
+        chunk.append(separator)
+        chunk.append(encoder.encode(item))
+        separator = ","
+
+        if len(chunk) >= chunk_size * 2:
+            yield "".join(chunk).encode()
+            chunk = []
+
+    if separator == "[":
+        chunk.append(separator)
+
+    chunk.append("]")
+
+    yield "".join(chunk).encode()
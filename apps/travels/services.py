@@ -1,14 +1,31 @@
 import logging
+import time
 
 from uuid import UUID
 
-from django.db.models import Q
+from django.conf import settings
 from django.utils import timezone
+from django.contrib.gis.db.models.functions import Distance
 from django.contrib.gis.geos import Point
 from django.contrib.gis.measure import D
-from django.db import transaction, DatabaseError
-
-from apps.travels.models import RequestTravel, Travel, ConfirmationTravel
+from django.db import connection, transaction, DatabaseError
+from django.db.models import Case, Value, When
+
+from apps.travels.models import (
+    RequestTravel,
+    Travel,
+    ConfirmationTravel,
+    DispatchOffer,
+)
+from apps.travels.events import (
+    TRAVEL_CANCELLED,
+    TRAVEL_CONFIRMED,
+    TRAVEL_FINISHED,
+    TRAVEL_TAKEN,
+    publish_request_travels_added,
+    publish_request_travels_removed,
+    publish_travel_event,
+)
 from apps.travels.exceptions import (
     RequestTravelDoesNotFound,
     DriverCantTakeRequestTravel,
@@ -17,37 +34,141 @@ from apps.travels.exceptions import (
     CannotFinishThisTravel,
     InvalidVehicleDriver,
 )
+from apps.travels.notifications import (
+    notify_travel_cancelled,
+    notify_travel_confirmed,
+    notify_travel_taken,
+)
+from apps.travels.spatial_index import get_request_travel_index
 from apps.drivers.service import get_driver_by_user_id, get_vehicle_by_id
+from apps.outbox.services import enqueue_task
 from apps.users.services import get_user_by_id
 from apps.users.models import User
 
 logger = logging.getLogger(__name__)
 
+# The travel relations read by the notifications of its members.
+TRAVEL_MEMBERS_RELATED = ("user", "driver__user")
 
-def clear_expired_request_travels():
-    expired_query = Q(status=RequestTravel.PENDING) and Q(expires__lte=timezone.now())
-    expired_queryset = RequestTravel.objects.filter(expired_query).values_list(
-        "id", flat=True
-    )
 
-    deleted_num, _ = RequestTravel.objects.filter(
-        id__in=list(expired_queryset)
-    ).delete()
+def clear_expired_request_travels(
+    batch_size: int | None = None, time_budget: float | None = None
+) -> int:
+    """Deletes the expired request travels in batches of ``batch_size`` rows,
+    each one in its own transaction, until none is left or ``time_budget``
+    seconds have passed. A later run resumes with the remaining rows.
+
+    The rows are deleted without the ``post_delete`` signals, the index and the
+    streams are updated once per batch instead of once per row."""
+    config = settings.REQUEST_TRAVEL_SWEEPER
+
+    if batch_size is None:
+        batch_size = config["BATCH_SIZE"]
+
+    if time_budget is None:
+        time_budget = config["TIME_BUDGET"]
+
+    deadline = time.monotonic() + time_budget
+    deleted_num = 0
+    last_id = 0
+
+    while True:
+        expired_ids = list(
+            RequestTravel.objects.expired()
+            .filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+
+        if not expired_ids:
+            break
+
+        with transaction.atomic():
+            # The rows taken meanwhile are skipped.
+            request_travels = list(
+                RequestTravel.objects.expired()
+                .filter(id__in=expired_ids)
+                .select_for_update(skip_locked=True)
+                .only("id", "origin")
+            )
+            batch_deleted_num = _delete_request_travels(request_travels)
+
+        deleted_num += batch_deleted_num
+        last_id = expired_ids[-1]
+
+        logger.info(
+            f"Deleted {batch_deleted_num} expired request travels "
+            f"({deleted_num} in total, last id {last_id})"
+        )
+
+        if time.monotonic() >= deadline:
+            logger.info("Expired request travels time budget exhausted")
+            break
 
     logger.info(f"Deleted {deleted_num} expired request travels")
 
     return deleted_num
 
 
+def _delete_request_travels(request_travels: list[RequestTravel]) -> int:
+    request_travel_ids = [request_travel.id for request_travel in request_travels]
+
+    # The pending request travels have no travel, only the offers cascade.
+    DispatchOffer.objects.filter(request_travel_id__in=request_travel_ids)._raw_delete(
+        DispatchOffer.objects.db
+    )
+    deleted_num = RequestTravel.objects.filter(id__in=request_travel_ids)._raw_delete(
+        RequestTravel.objects.db
+    )
+
+    index = get_request_travel_index()
+
+    if index is not None:
+        transaction.on_commit(lambda: index.remove_many(request_travel_ids))
+
+    transaction.on_commit(lambda: publish_request_travels_removed(request_travels))
+
+    return deleted_num
+
+
 def get_request_travel_by_id(request_travel_id: int) -> RequestTravel:
     try:
-        obj = RequestTravel.objects.get(id=request_travel_id)
+        obj = RequestTravel.objects.with_trip_distance().get(id=request_travel_id)
     except RequestTravel.DoesNotExist:
         raise RequestTravelDoesNotFound
 
     return obj
 
 
+def bulk_create_request_travels(
+    user: User, request_travels_data: list[dict]
+) -> list[RequestTravel]:
+    """Creates the request travels of ``user`` with a single insert.
+
+    ``bulk_create`` doesn't send ``post_save``, the spatial index, the stream
+    and the dispatch are updated here once for all the request travels instead.
+    """
+    with transaction.atomic():
+        request_travels = RequestTravel.objects.bulk_create(
+            [RequestTravel(user=user, **data) for data in request_travels_data]
+        )
+
+        index = get_request_travel_index()
+
+        if index is not None:
+            transaction.on_commit(lambda: index.add_many(request_travels))
+
+        transaction.on_commit(lambda: publish_request_travels_added(request_travels))
+
+        if settings.REQUEST_TRAVEL_DISPATCH["ENABLED"]:
+            enqueue_task(
+                "apps.travels.tasks.dispatch_request_travels",
+                [request_travel.id for request_travel in request_travels],
+            )
+
+    return request_travels
+
+
 def delete_request_travel_by_id_and_user_id(request_travel_id: int, user_id: UUID):
     try:
         RequestTravel.objects.get(id=request_travel_id, user__id=user_id).delete()
@@ -62,26 +183,45 @@ def take_request_travel(
     driver = get_driver_by_user_id(user_id)
     vehicle = get_vehicle_by_id(vehicle_id)
 
-    if vehicle.driver != driver:
+    if vehicle.driver_id != driver.id:
         raise InvalidVehicleDriver
 
-    try:
-        request_travel = RequestTravel.objects.select_related("user").get(
-            status=RequestTravel.PENDING,
-            id=request_travel_id,
-            expires__gte=timezone.now(),
-            origin__distance_lte=(driver_loc, D(km=RequestTravel.MAX_RADIUS)),
-        )
-    except RequestTravel.DoesNotExist:
-        raise RequestTravelDoesNotFound
-
-    if driver.user.id == request_travel.user.id:
-        raise DriverCantTakeRequestTravel
-
     try:
         with transaction.atomic():
+            # The request travel row is claimed with a single locking read,
+            # concurrent drivers skip the locked row and fail right away.
+            try:
+                request_travel = (
+                    RequestTravel.objects.select_related("user")
+                    .select_for_update(skip_locked=True, of=("self",))
+                    .with_trip_distance()
+                    .annotate(driver_distance=Distance("origin", driver_loc))
+                    .get(
+                        status=RequestTravel.PENDING,
+                        id=request_travel_id,
+                        expires__gte=timezone.now(),
+                        origin__distance_lte=(
+                            driver_loc,
+                            D(km=RequestTravel.MAX_RADIUS),
+                        ),
+                    )
+                )
+            except RequestTravel.DoesNotExist:
+                raise RequestTravelDoesNotFound
+
+            if driver.user_id == request_travel.user_id:
+                raise DriverCantTakeRequestTravel
+
             request_travel.status = RequestTravel.TAKED
-            request_travel.save()
+            request_travel.save(update_fields=["status"])
+
+            # The dispatch offers are settled with the request travel.
+            request_travel.offers.open().update(
+                status=Case(
+                    When(driver=driver, then=Value(DispatchOffer.ACCEPTED)),
+                    default=Value(DispatchOffer.CANCELLED),
+                )
+            )
 
             travel = Travel.objects.create(
                 user=request_travel.user,
@@ -91,6 +231,11 @@ def take_request_travel(
                 destination=request_travel.destination,
                 vehicle=vehicle,
             )
+            travel.trip_distance = request_travel.trip_distance
+            travel.driver_distance = request_travel.driver_distance
+
+            publish_travel_event(TRAVEL_TAKEN, travel)
+            notify_travel_taken(travel)
 
     except DatabaseError as e:
         logger.exception("DATABASE ERROR: %s", e, exc_info=True)
@@ -99,66 +244,135 @@ def take_request_travel(
     return travel
 
 
-def get_travel_by_id(travel_id: int) -> Travel:
+def get_travel_by_id(travel_id: int, select_related: tuple[str, ...] = ()) -> Travel:
+    queryset = Travel.objects.with_trip_distance()
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+
     try:
-        travel = Travel.objects.get(id=travel_id)
+        travel = queryset.get(id=travel_id)
     except Travel.DoesNotExist:
         raise TravelDoesNotFound
 
     return travel
 
 
-def cancel_travel(travel_id: int, user_id: UUID) -> Travel:
-    def validation_for_cancel(travel: Travel, user: User) -> bool:
-        if travel.status != Travel.IN_COURSE:
-            return False
+def get_travel_member(travel: Travel, user_id: UUID) -> User | None:
+    """Returns the user or the driver user of ``travel`` with ``user_id``, or
+    ``None`` if the user isn't part of it. The travel must be loaded with
+    ``TRAVEL_MEMBERS_RELATED``."""
+    if travel.user_id == user_id:
+        return travel.user
+
+    if travel.driver is not None and travel.driver.user_id == user_id:
+        return travel.driver.user
 
-        try:
-            if (travel.user.id == user.id) or (travel.driver.id == user.drivers.id):
-                return True
-        except User.drivers.RelatedObjectDoesNotExist:
-            return False
+    # Raises UserNotFound for the unknown users.
+    get_user_by_id(user_id)
 
-        return False
+    return None
 
-    travel = get_travel_by_id(travel_id)
-    user_deleter = get_user_by_id(user_id)
 
-    if not validation_for_cancel(travel, user_deleter):
+def cancel_travel(travel_id: int, user_id: UUID) -> Travel:
+    travel = get_travel_by_id(travel_id, select_related=TRAVEL_MEMBERS_RELATED)
+    user_deleter = get_travel_member(travel, user_id)
+
+    if user_deleter is None or travel.status != Travel.IN_COURSE:
         raise CannotCancelThisTravel
 
-    travel.status = Travel.CANCELLED
-    travel.save()
+    with transaction.atomic():
+        travel.status = Travel.CANCELLED
+        travel.save(update_fields=["status"])
+
+        publish_travel_event(TRAVEL_CANCELLED, travel)
+        notify_travel_cancelled(travel, user_deleter)
 
     return travel
 
 
+def _confirm_travel(
+    travel: Travel, check_user: bool, check_driver: bool
+) -> ConfirmationTravel | None:
+    """Adds the checks to the travel confirmation, creating it if needed, with
+    a single upsert. Returns ``None`` if the travel isn't in course.
+
+    The upsert locks the confirmation row, so the checks of concurrent
+    confirmations are merged instead of overwritten and only the last one
+    sees both checks.
+    """
+    fields = ConfirmationTravel._meta.concrete_fields
+    confirmation_table = ConfirmationTravel._meta.db_table
+    travel_table = Travel._meta.db_table
+    columns = ", ".join(field.column for field in fields)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {confirmation_table}
+                (travel_id, user_id, driver_id, check_user, check_driver, created_time)
+            SELECT id, user_id, driver_id, %s, %s, %s
+            FROM {travel_table} WHERE id = %s AND status = %s
+            ON CONFLICT (travel_id) DO UPDATE
+            SET check_user = {confirmation_table}.check_user OR EXCLUDED.check_user,
+                check_driver = {confirmation_table}.check_driver OR EXCLUDED.check_driver
+            RETURNING {columns}
+            """,
+            [check_user, check_driver, timezone.now(), travel.id, Travel.IN_COURSE],
+        )
+        row = cursor.fetchone()
+
+    if row is None:
+        return None
+
+    confirmation_travel = ConfirmationTravel.from_db(
+        connection.alias, [field.attname for field in fields], row
+    )
+    confirmation_travel.travel = travel
+    confirmation_travel.user = travel.user
+    confirmation_travel.driver = travel.driver
+
+    return confirmation_travel
+
+
 def finish_travel(travel_id: int, user_id: UUID) -> ConfirmationTravel:
-    travel = get_travel_by_id(travel_id)
-    user_finisher = get_user_by_id(user_id)
+    """Confirms the travel by one of its members and finishes it once both
+    have confirmed it, with at most two statements: the confirmation upsert
+    and the conditional status update."""
+    travel = get_travel_by_id(travel_id, select_related=TRAVEL_MEMBERS_RELATED)
+    user_finisher = get_travel_member(travel, user_id)
 
-    if travel.status != Travel.IN_COURSE:
+    if user_finisher is None or travel.status != Travel.IN_COURSE:
         raise CannotFinishThisTravel
 
-    confirmation_travel, _ = ConfirmationTravel.objects.get_or_create(
-        travel=travel, driver=travel.driver, user=travel.user
-    )
+    is_user = user_finisher.id == travel.user_id
 
-    try:
-        if user_finisher.id == travel.user.id:
-            confirmation_travel.check_user = True
-        elif user_finisher.drivers.id == travel.driver.id:
-            confirmation_travel.check_driver = True
-        else:
+    with transaction.atomic():
+        confirmation_travel = _confirm_travel(
+            travel, check_user=is_user, check_driver=not is_user
+        )
+
+        if confirmation_travel is None:
             raise CannotFinishThisTravel
 
-        confirmation_travel.save()
+        if confirmation_travel.check_user and confirmation_travel.check_driver:
+            # The travel may have been cancelled since it was read.
+            if not Travel.objects.filter(id=travel.id, status=Travel.IN_COURSE).update(
+                status=Travel.DONE
+            ):
+                raise CannotFinishThisTravel
 
-    except User.drivers.RelatedObjectDoesNotExist:
-        raise CannotFinishThisTravel
+            travel.status = Travel.DONE
+
+            publish_travel_event(TRAVEL_FINISHED, travel)
+        else:
+            publish_travel_event(
+                TRAVEL_CONFIRMED,
+                travel,
+                check_user=confirmation_travel.check_user,
+                check_driver=confirmation_travel.check_driver,
+            )
 
-    if confirmation_travel.check_user and confirmation_travel.check_driver:
-        travel.status = Travel.DONE
-        travel.save()
+        notify_travel_confirmed(confirmation_travel, user_finisher)
 
     return confirmation_travel
@@ -0,0 +1,56 @@
+from copy import copy
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.outbox.services import enqueue_task
+from apps.travels.events import (
+    publish_request_travel_added,
+    publish_request_travel_removed,
+)
+from apps.travels.models import RequestTravel
+from apps.travels.tasks import dispatch_request_travel
+from apps.travels.spatial_index import get_request_travel_index
+
+
+@receiver(post_save, sender=RequestTravel)
+def update_request_travel_index(sender, instance, **kwargs):
+    index = get_request_travel_index()
+
+    if index is not None:
+        request_travel = copy(instance)
+        transaction.on_commit(lambda: index.add(request_travel))
+
+
+@receiver(post_delete, sender=RequestTravel)
+def remove_request_travel_from_index(sender, instance, **kwargs):
+    index = get_request_travel_index()
+
+    if index is not None:
+        request_travel_id = instance.id
+        transaction.on_commit(lambda: index.remove(request_travel_id))
+
+
+@receiver(post_save, sender=RequestTravel)
+def publish_request_travel_saved(sender, instance, **kwargs):
+    if instance.status == RequestTravel.PENDING and not instance.is_expired:
+        request_travel = copy(instance)
+        transaction.on_commit(lambda: publish_request_travel_added(request_travel))
+    else:
+        request_travel = copy(instance)
+        transaction.on_commit(lambda: publish_request_travel_removed(request_travel))
+
+
+@receiver(post_delete, sender=RequestTravel)
+def publish_request_travel_deleted(sender, instance, **kwargs):
+    request_travel = copy(instance)
+    transaction.on_commit(lambda: publish_request_travel_removed(request_travel))
+
+
+@receiver(post_save, sender=RequestTravel)
+def dispatch_created_request_travel(sender, instance, created, **kwargs):
+    if created and settings.REQUEST_TRAVEL_DISPATCH["ENABLED"]:
+        # Saved with the request travel, the relay sends it once committed.
+        enqueue_task(dispatch_request_travel.name, instance.id)
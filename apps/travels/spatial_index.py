@@ -0,0 +1,249 @@
+import threading
+import time
+
+import numpy as np
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from apps.travels.geo import grid_cell, grid_cells_in_radius, haversine_km_array
+from apps.travels.models import RequestTravel
+
+
+class RequestTravelGridIndex:
+    """In-process grid of pending request travels keyed by their origin.
+
+    The index is "cold" until it is loaded and again once it is older than
+    ``refresh_seconds``, callers must fall back to PostGIS in that case.
+
+    The updates made while a load reads the database are buffered and applied
+    again over the loaded request travels, the snapshot may predate them.
+    """
+
+    def __init__(self, cell_size: float = 0.1, refresh_seconds: int = 30) -> None:
+        self.cell_size = cell_size
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._entries: dict[
+            int, tuple[tuple[int, int], tuple[float, float], RequestTravel]
+        ] = {}
+        self._loaded_at: float | None = None
+        self._updates: list[tuple[int, RequestTravel | None]] | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, request_travel_id: int) -> bool:
+        return request_travel_id in self._entries
+
+    @property
+    def is_warm(self) -> bool:
+        if self._loaded_at is None:
+            return False
+
+        return time.monotonic() - self._loaded_at < self.refresh_seconds
+
+    def _get_cell(self, long: float, lat: float) -> tuple[int, int]:
+        return grid_cell(long, lat, self.cell_size)
+
+    def load(self, request_travels) -> None:
+        """Replaces the index with ``request_travels``, a lazy iterable so the
+        updates are buffered from before the database is read."""
+        cells = {}
+        entries = {}
+
+        with self._lock:
+            self._updates = []
+
+        try:
+            for request_travel in request_travels:
+                coords = request_travel.origin.coords
+                cell = self._get_cell(*coords)
+                cells.setdefault(cell, set()).add(request_travel.id)
+                entries[request_travel.id] = (cell, coords, request_travel)
+        except BaseException:
+            with self._lock:
+                self._updates = None
+
+            raise
+
+        with self._lock:
+            self._cells = cells
+            self._entries = entries
+            self._loaded_at = time.monotonic()
+
+            for request_travel_id, request_travel in self._updates:
+                self._update(request_travel_id, request_travel)
+
+            self._updates = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cells.clear()
+            self._entries.clear()
+            self._loaded_at = None
+
+    def add(self, request_travel: RequestTravel) -> None:
+        with self._lock:
+            self._buffered_update(request_travel.id, request_travel)
+
+    def add_many(self, request_travels) -> None:
+        with self._lock:
+            for request_travel in request_travels:
+                self._buffered_update(request_travel.id, request_travel)
+
+    def remove(self, request_travel_id: int) -> None:
+        with self._lock:
+            self._buffered_update(request_travel_id, None)
+
+    def remove_many(self, request_travel_ids) -> None:
+        with self._lock:
+            for request_travel_id in request_travel_ids:
+                self._buffered_update(request_travel_id, None)
+
+    def _buffered_update(
+        self, request_travel_id: int, request_travel: RequestTravel | None
+    ) -> None:
+        self._update(request_travel_id, request_travel)
+
+        if self._updates is not None:
+            self._updates.append((request_travel_id, request_travel))
+
+    def _update(
+        self, request_travel_id: int, request_travel: RequestTravel | None
+    ) -> None:
+        self._remove(request_travel_id)
+
+        if (
+            request_travel is not None
+            and request_travel.status == RequestTravel.PENDING
+        ):
+            self._add(request_travel)
+
+    def _add(self, request_travel: RequestTravel) -> None:
+        coords = request_travel.origin.coords
+        cell = self._get_cell(*coords)
+
+        self._cells.setdefault(cell, set()).add(request_travel.id)
+        self._entries[request_travel.id] = (cell, coords, request_travel)
+
+    def _remove(self, request_travel_id: int) -> None:
+        entry = self._entries.pop(request_travel_id, None)
+
+        if entry is None:
+            return
+
+        cell, _, _ = entry
+        ids = self._cells.get(cell)
+        ids.discard(request_travel_id)
+
+        if not ids:
+            del self._cells[cell]
+
+    def _get_cells_in_radius(self, long: float, lat: float, radius_km: float):
+        return grid_cells_in_radius(long, lat, radius_km, self.cell_size)
+
+    def query(
+        self, long: float, lat: float, radius_km: float
+    ) -> list[tuple[float, RequestTravel]] | None:
+        """Returns ``(distance_km, request_travel)`` pairs sorted by distance,
+        or ``None`` if the index is cold."""
+        if not self.is_warm:
+            return None
+
+        current_time = timezone.now()
+        candidates = []
+        coords = []
+        expired = []
+
+        with self._lock:
+            for cell in self._get_cells_in_radius(long, lat, radius_km):
+                for request_travel_id in self._cells.get(cell, ()):
+                    _, origin, request_travel = self._entries[request_travel_id]
+
+                    if request_travel.expires < current_time:
+                        expired.append(request_travel_id)
+                        continue
+
+                    candidates.append(request_travel)
+                    coords.append(origin)
+
+            for request_travel_id in expired:
+                self._remove(request_travel_id)
+
+        if not candidates:
+            return []
+
+        # The distances of all the candidates are computed at once.
+        coords = np.array(coords)
+        distances = haversine_km_array(long, lat, coords[:, 0], coords[:, 1])
+
+        results = [
+            (distance, request_travel)
+            for distance, request_travel in zip(distances.tolist(), candidates)
+            if distance <= radius_km
+        ]
+        results.sort(key=lambda result: (result[0], result[1].id))
+
+        return results
+
+
+_index: RequestTravelGridIndex | None = None
+_index_lock = threading.Lock()
+# Held while a background thread warms the index, so it's reloaded once.
+_warm_lock = threading.Lock()
+
+
+def get_request_travel_index() -> RequestTravelGridIndex | None:
+    """Returns the process wide index, or ``None`` if it is disabled."""
+    global _index
+
+    config = getattr(settings, "REQUEST_TRAVEL_INDEX", {})
+
+    if not config.get("ENABLED", False):
+        return None
+
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = RequestTravelGridIndex(
+                    cell_size=config.get("CELL_SIZE", 0.1),
+                    refresh_seconds=config.get("REFRESH_SECONDS", 30),
+                )
+
+    return _index
+
+
+def warm_request_travel_index(index: RequestTravelGridIndex) -> None:
+    index.load(
+        RequestTravel.objects.pending().with_trip_distance().iterator(chunk_size=2000)
+    )
+
+
+def warm_request_travel_index_async(
+    index: RequestTravelGridIndex,
+) -> threading.Thread | None:
+    """Warms the index in a background thread, unless another thread is
+    already warming it. Returns the started thread, or ``None``."""
+    if not _warm_lock.acquire(blocking=False):
+        return None
+
+    def warm():
+        try:
+            if not index.is_warm:
+                warm_request_travel_index(index)
+        finally:
+            connection.close()
+            _warm_lock.release()
+
+    thread = threading.Thread(target=warm, name="request-travel-index", daemon=True)
+
+    try:
+        thread.start()
+    except BaseException:
+        _warm_lock.release()
+        raise
+
+    return thread
@@ -5,8 +5,9 @@ from celery import shared_task
 from django.conf import settings
 from django.core.mail import send_mail
 
-from apps.travels.models import Travel
+from apps.travels.models import Travel, RequestTravel
 from apps.travels.services import clear_expired_request_travels
+from apps.travels import dispatch, matching
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +16,52 @@ logger = logging.getLogger(__name__)
 def clear_expired_req_travels():
     clear_expired_request_travels()
 
+    # The sweep stops when its time budget runs out, continue with the rest.
+    if RequestTravel.objects.expired().exists():
+        clear_expired_req_travels.apply_async(
+            countdown=settings.REQUEST_TRAVEL_SWEEPER["RESCHEDULE_COUNTDOWN"]
+        )
+
+        return "Expired requests partially cleared"
+
     return "Expired requests cleared"
 
 
+@shared_task
+def dispatch_request_travel(request_travel_id: int):
+    offer = dispatch.dispatch_request_travel(request_travel_id)
+
+    if offer is None:
+        return "No new offer"
+
+    # Checks the offer again once it expires.
+    dispatch_request_travel.apply_async(
+        (request_travel_id,),
+        countdown=settings.REQUEST_TRAVEL_DISPATCH["OFFER_TIMEOUT"],
+    )
+
+    return "Offered to driver {0}".format(offer.driver_id)
+
+
+@shared_task
+def dispatch_request_travels(request_travel_ids: list[int]):
+    """Dispatches the request travels created together, a task for all."""
+    for request_travel_id in request_travel_ids:
+        dispatch_request_travel(request_travel_id)
+
+    return "Dispatched {0} request travels".format(len(request_travel_ids))
+
+
+@shared_task
+def match_request_travels():
+    if not settings.REQUEST_TRAVEL_BATCH_MATCHING["ENABLED"]:
+        return "Batch matching disabled"
+
+    offers = matching.match_request_travels()
+
+    return "Offered {0} request travels".format(len(offers))
+
+
 @shared_task(bind=True)
 def send_email_to_users(self, subject: str, message: str, users: list[str]):
     from_email = settings.EMAIL_HOST_USER
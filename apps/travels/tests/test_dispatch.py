@@ -0,0 +1,247 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.test import TestCase, override_settings
+from django.urls import reverse_lazy
+from django.utils import timezone
+
+from apps.drivers.models import Drivers, DriverLocation, Vehicles
+from apps.travels.dispatch import (
+    dispatch_request_travel,
+    find_nearest_drivers,
+    reject_dispatch_offer,
+)
+from apps.outbox.models import OutboxMessage
+from apps.outbox.services import relay_outbox_messages
+from apps.travels.exceptions import DispatchOfferDoesNotFound
+from apps.travels.models import DispatchOffer, RequestTravel, Travel
+from apps.travels.services import take_request_travel
+from apps.travels.tests.core import BaseViewTestCase
+
+from riding.celery import app
+
+USER_MODEL = get_user_model()
+
+DISPATCH_SETTINGS = {
+    "ENABLED": False,
+    "CANDIDATES": 2,
+    "RADIUS": 10,
+    "OFFER_TIMEOUT": 15,
+    "LOCATION_MAX_AGE": 60,
+}
+
+
+def create_driver(username, long, lat, **kwargs):
+    user = USER_MODEL.objects.create_user(
+        username=username,
+        email="{0}@gmail.com".format(username),
+        password="testpass12345",
+        first_name="test",
+        last_name="test",
+        is_active=True,
+    )
+    driver = Drivers.objects.create(user=user, is_active=True, **kwargs)
+    Vehicles.objects.create(
+        driver=driver, plate_number="1234", model="asas", year=1234, color="blue"
+    )
+    DriverLocation.objects.create(driver=driver, point=Point(long, lat))
+
+    return driver
+
+
+@override_settings(REQUEST_TRAVEL_DISPATCH=DISPATCH_SETTINGS)
+class DispatchTestCase(TestCase):
+    def setUp(self) -> None:
+        self.rider = USER_MODEL.objects.create_user(
+            username="te122stpepe",
+            email="trest21@gmail.com",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.far = create_driver("far", 0.05, 0)
+        self.near = create_driver("near", 0.01, 0)
+        self.middle = create_driver("middle", 0.02, 0)
+        self.request_travel = RequestTravel.objects.create(
+            user=self.rider, origin=Point(0, 0), destination=Point(0, 0)
+        )
+
+    def test_find_nearest_drivers(self):
+        drivers = find_nearest_drivers(self.request_travel, 5)
+
+        self.assertEqual(
+            [driver.id for driver in drivers],
+            [self.near.id, self.middle.id, self.far.id],
+        )
+        self.assertAlmostEqual(drivers[0].distance.m, 1113, delta=1)
+
+    def test_find_nearest_drivers_exclusions(self):
+        create_driver("inactive", 0, 0).set_inactive()
+        create_driver("busy", 0, 0, status=Drivers.BUSY)
+        create_driver("outside", 1, 0)
+
+        stale = create_driver("stale", 0, 0)
+        DriverLocation.objects.filter(driver=stale).update(
+            updated_time=timezone.now() - timedelta(minutes=5)
+        )
+
+        in_course = create_driver("incourse", 0, 0)
+        Travel.objects.create(
+            user=self.rider,
+            driver=in_course,
+            request_travel=RequestTravel.objects.create(
+                user=self.rider, origin=Point(0, 0), destination=Point(0, 0)
+            ),
+            origin=Point(0, 0),
+            destination=Point(0, 0),
+            vehicle=in_course.vehicles.first(),
+        )
+
+        drivers = find_nearest_drivers(self.request_travel, 10)
+
+        self.assertEqual(
+            [driver.id for driver in drivers],
+            [self.near.id, self.middle.id, self.far.id],
+        )
+
+    def test_dispatch_in_ranked_order(self):
+        offer = dispatch_request_travel(self.request_travel.id)
+
+        self.assertEqual(offer.driver_id, self.near.id)
+        self.assertEqual(offer.status, DispatchOffer.OFFERED)
+        self.assertEqual(self.request_travel.offers.count(), 2)
+
+        # The current offer is still open.
+        self.assertIsNone(dispatch_request_travel(self.request_travel.id))
+
+        DispatchOffer.objects.filter(id=offer.id).update(
+            expires=timezone.now() - timedelta(seconds=1)
+        )
+        next_offer = dispatch_request_travel(self.request_travel.id)
+
+        self.assertEqual(next_offer.driver_id, self.middle.id)
+        self.assertEqual(
+            DispatchOffer.objects.get(id=offer.id).status, DispatchOffer.EXPIRED
+        )
+
+        reject_dispatch_offer(next_offer.id, self.middle.user_id)
+
+        self.assertIsNone(dispatch_request_travel(self.request_travel.id))
+        self.assertFalse(self.request_travel.offers.open().exists())
+
+    def test_reject_other_driver_offer(self):
+        offer = dispatch_request_travel(self.request_travel.id)
+
+        with self.assertRaises(DispatchOfferDoesNotFound):
+            reject_dispatch_offer(offer.id, self.middle.user_id)
+
+    def test_take_settles_offers(self):
+        offer = dispatch_request_travel(self.request_travel.id)
+
+        take_request_travel(
+            self.request_travel.id,
+            self.near.user_id,
+            0,
+            0,
+            self.near.vehicles.first().id,
+        )
+
+        self.assertEqual(
+            DispatchOffer.objects.get(id=offer.id).status, DispatchOffer.ACCEPTED
+        )
+        self.assertEqual(self.request_travel.offers.open().count(), 0)
+        self.assertIsNone(dispatch_request_travel(self.request_travel.id))
+
+    def test_dispatch_without_drivers(self):
+        DriverLocation.objects.all().delete()
+
+        self.assertIsNone(dispatch_request_travel(self.request_travel.id))
+
+
+@override_settings(REQUEST_TRAVEL_DISPATCH=DISPATCH_SETTINGS)
+class DispatchOfferViewsTestCase(BaseViewTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        app.conf.update(CELERY_TASK_ALWAYS_EAGER=True)
+
+        self.driver = Drivers.objects.create(user=self.user, is_active=True)
+        self.vehicle = Vehicles.objects.create(
+            driver=self.driver,
+            plate_number="1234",
+            model="asas",
+            year=1234,
+            color="blue",
+        )
+        DriverLocation.objects.create(driver=self.driver, point=Point(0, 0))
+        self.other = create_driver("other", 0.01, 0)
+
+        rider = USER_MODEL.objects.create_user(
+            username="rider",
+            email="rider@gmail.com",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.request_travel = RequestTravel.objects.create(
+            user=rider, origin=Point(0, 0), destination=Point(0, 0)
+        )
+        self.offer = dispatch_request_travel(self.request_travel.id)
+
+    def test_list_offers(self):
+        res = self.client.get(
+            reverse_lazy("travels:dispatch_offer_list"),
+            headers={"Authorization": self.authorization},
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([offer["id"] for offer in res.data], [self.offer.id])
+        self.assertEqual(res.data[0]["request_travel"]["id"], self.request_travel.id)
+
+    def test_accept_offer(self):
+        res = self.client.post(
+            reverse_lazy(
+                "travels:dispatch_offer_accept", kwargs={"offer_id": self.offer.id}
+            ),
+            {"longitude": 0, "latitude": 0, "vehicle_id": self.vehicle.id},
+            headers={"Authorization": self.authorization},
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["request_travel"], self.request_travel.id)
+        self.assertEqual(
+            DispatchOffer.objects.get(id=self.offer.id).status, DispatchOffer.ACCEPTED
+        )
+
+    def test_reject_offer(self):
+        res = self.client.post(
+            reverse_lazy(
+                "travels:dispatch_offer_reject", kwargs={"offer_id": self.offer.id}
+            ),
+            headers={"Authorization": self.authorization},
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["status"], DispatchOffer.REJECTED)
+        self.assertEqual(OutboxMessage.objects.get().args, [self.request_travel.id])
+
+        relay_outbox_messages()
+
+        self.assertEqual(
+            self.request_travel.offers.get(status=DispatchOffer.OFFERED).driver_id,
+            self.other.id,
+        )
+
+    @override_settings(REQUEST_TRAVEL_DISPATCH={**DISPATCH_SETTINGS, "ENABLED": True})
+    def test_created_request_travel_enqueued(self):
+        request_travel = RequestTravel.objects.create(
+            user=self.user, origin=Point(0, 0), destination=Point(0, 0)
+        )
+
+        message = OutboxMessage.objects.get()
+
+        self.assertEqual(message.task, "apps.travels.tasks.dispatch_request_travel")
+        self.assertEqual(message.args, [request_travel.id])
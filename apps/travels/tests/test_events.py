@@ -0,0 +1,273 @@
+import asyncio
+import json
+import threading
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.gis.geos import Point
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse_lazy
+from django.utils import timezone
+
+from apps.drivers.models import Drivers, Vehicles
+from apps.events.backends import InMemoryBroker
+from apps.travels.events import (
+    NearbyRequestTravelStream,
+    get_request_travels_channel,
+    get_request_travels_channels,
+)
+from apps.travels.models import RequestTravel
+from apps.travels.tests.core import BaseViewTestCase
+
+STREAM_SETTINGS = {"KEEPALIVE": 0.05, "MAX_DURATION": 60, "RETRY": 3, "CELL_SIZE": 0.5}
+
+
+def parse_event(chunk):
+    lines = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+
+    return lines["event"], json.loads(lines["data"])
+
+
+def add_message(request_travel_id, long, lat, expires=None):
+    expires = expires or timezone.now() + timedelta(minutes=10)
+
+    return {
+        "event": "add",
+        "id": request_travel_id,
+        "longitude": long,
+        "latitude": lat,
+        "expires": expires.isoformat(),
+        "data": {"id": request_travel_id},
+    }
+
+
+class InMemoryBrokerTestCase(SimpleTestCase):
+    async def test_publish_from_another_thread(self):
+        broker = InMemoryBroker()
+        subscription = broker.subscribe("channel")
+
+        thread = threading.Thread(
+            target=broker.publish, args=("channel", {"event": "add"})
+        )
+        thread.start()
+        thread.join()
+
+        self.assertEqual(await subscription.get(timeout=1), {"event": "add"})
+        self.assertIsNone(await subscription.get(timeout=0.01))
+
+    async def test_unsubscribe(self):
+        broker = InMemoryBroker()
+        subscription = broker.subscribe("channel")
+        subscription.close()
+
+        broker.publish("channel", {"event": "add"})
+        await asyncio.sleep(0)
+
+        self.assertIsNone(await subscription.get(timeout=0.01))
+
+    async def test_overflow(self):
+        broker = InMemoryBroker(max_size=1)
+        subscription = broker.subscribe("channel")
+
+        broker.publish("channel", {"event": "add"})
+        broker.publish("channel", {"event": "add"})
+        await asyncio.sleep(0)
+
+        self.assertTrue(subscription.overflowed)
+
+
+@override_settings(REQUEST_TRAVEL_STREAM=STREAM_SETTINGS)
+class NearbyRequestTravelStreamTestCase(SimpleTestCase):
+    def setUp(self) -> None:
+        self.broker = InMemoryBroker()
+        patcher = patch("apps.travels.events.get_broker", return_value=self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _next_event(self, stream):
+        while True:
+            chunk = await anext(stream)
+
+            if chunk.startswith("event: "):
+                return parse_event(chunk)
+
+    def _get_stream(self, snapshot=()):
+        stream = NearbyRequestTravelStream(0, 0, 10, lambda: list(snapshot))
+
+        return aiter(stream)
+
+    def _publish(self, message, long=0, lat=0):
+        self.broker.publish(get_request_travels_channel(long, lat), message)
+
+    async def test_snapshot(self):
+        request_travel = RequestTravel(
+            id=1, origin=Point(0, 0), expires=timezone.now() + timedelta(minutes=1)
+        )
+        stream = self._get_stream([(0.0, request_travel, {"id": 1})])
+
+        self.assertEqual(
+            await self._next_event(stream),
+            ("add", {"distance": 0.0, "data": {"id": 1}}),
+        )
+        await stream.aclose()
+
+    async def test_add_and_remove(self):
+        stream = self._get_stream()
+        self.assertTrue((await anext(stream)).startswith("retry: "))
+
+        self._publish(add_message(1, 1, 1), 1, 1)
+        self._publish(add_message(2, 0.01, 0))
+        self._publish({"event": "remove", "id": 3})
+        self._publish({"event": "remove", "id": 2})
+
+        event, data = await self._next_event(stream)
+        self.assertEqual(event, "add")
+        self.assertEqual(data["data"], {"id": 2})
+        self.assertAlmostEqual(data["distance"], 1.11, places=2)
+
+        self.assertEqual(await self._next_event(stream), ("remove", {"id": 2}))
+        await stream.aclose()
+
+    async def test_add_many(self):
+        stream = self._get_stream()
+        await anext(stream)
+
+        items = [add_message(1, 0.2, 0), add_message(2, 0, 0)]
+        self._publish(
+            {
+                "event": "add_many",
+                "items": [
+                    {key: value for key, value in item.items() if key != "event"}
+                    for item in items
+                ],
+            },
+        )
+
+        self.assertEqual(
+            await self._next_event(stream),
+            ("add", {"distance": 0.0, "data": {"id": 2}}),
+        )
+        await stream.aclose()
+
+    async def test_remove_many(self):
+        stream = self._get_stream()
+        await anext(stream)
+
+        self._publish(add_message(1, 0, 0))
+        self._publish({"event": "remove_many", "ids": [2, 1]})
+
+        self.assertEqual((await self._next_event(stream))[0], "add")
+        self.assertEqual(await self._next_event(stream), ("remove", {"id": 1}))
+        await stream.aclose()
+
+    async def test_moved_out_of_radius(self):
+        stream = self._get_stream()
+        await anext(stream)
+
+        self._publish(add_message(1, 0, 0))
+        self._publish(add_message(1, 0.1, 0.1), 0.1, 0.1)
+
+        self.assertEqual((await self._next_event(stream))[0], "add")
+        self.assertEqual(await self._next_event(stream), ("remove", {"id": 1}))
+        await stream.aclose()
+
+    async def test_expired(self):
+        stream = self._get_stream()
+        await anext(stream)
+        expires = timezone.now() + timedelta(milliseconds=50)
+
+        self._publish(add_message(1, 0, 0, expires))
+
+        self.assertEqual((await self._next_event(stream))[0], "add")
+        self.assertEqual(await self._next_event(stream), ("remove", {"id": 1}))
+        await stream.aclose()
+
+    async def test_subscribes_to_cells_in_radius(self):
+        stream = self._get_stream()
+        await anext(stream)
+
+        self.assertEqual(
+            set(self.broker._subscriptions), set(get_request_travels_channels(0, 0, 10))
+        )
+        self.assertEqual(len(self.broker._subscriptions), 4)
+        await stream.aclose()
+
+    async def test_closed_stream_unsubscribes(self):
+        stream = self._get_stream()
+        await anext(stream)
+        await stream.aclose()
+
+        self.assertEqual(self.broker._subscriptions, {})
+
+
+class StreamRequestTravelApiViewTestCase(BaseViewTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.driver = Drivers.objects.create(user=self.user, is_active=True)
+        self.vehicle = Vehicles.objects.create(
+            driver=self.driver,
+            plate_number="1234",
+            model="asas",
+            year=1234,
+            color="blue",
+        )
+        self.url = reverse_lazy("travels:request_travel_stream")
+
+    async def test_stream(self):
+        res = await self.async_client.get(
+            self.url,
+            {"latitude": 0, "longitude": 0},
+            headers={
+                "Authorization": self.authorization,
+                "Accept": "text/event-stream",
+            },
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res.headers["Content-Type"], "text/event-stream")
+
+    async def test_stream_invalid_query(self):
+        res = await self.async_client.get(
+            self.url,
+            {"latitude": "a"},
+            headers={
+                "Authorization": self.authorization,
+                "Accept": "text/event-stream",
+            },
+        )
+
+        self.assertEqual(res.status_code, 400)
+        self.assertTrue(res.content.startswith(b"event: error\n"))
+
+    def test_stream_under_wsgi(self):
+        res = self.client.get(
+            self.url,
+            {"latitude": 0, "longitude": 0},
+            headers={"Authorization": self.authorization},
+        )
+
+        self.assertEqual(res.status_code, 501)
+
+    def test_stream_unauthenticated(self):
+        res = self.client.get(self.url, {"latitude": 0, "longitude": 0})
+
+        self.assertEqual(res.status_code, 401)
+
+    @patch("apps.travels.signals.publish_request_travel_removed")
+    @patch("apps.travels.signals.publish_request_travel_added")
+    def test_signals_publish(self, added, removed):
+        with self.captureOnCommitCallbacks(execute=True):
+            obj = RequestTravel.objects.create(
+                user=self.user, origin=Point(0, 0), destination=Point(0, 0)
+            )
+
+        self.assertEqual(added.call_args.args[0].id, obj.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.status = RequestTravel.TAKED
+            obj.save()
+
+        self.assertEqual(removed.call_args.args[0].id, obj.id)
@@ -0,0 +1,128 @@
+import numpy as np
+
+from django.db import connection
+from django.test import TestCase
+
+from apps.travels.geo import (
+    KM_PER_DEGREE,
+    bounding_box,
+    bounding_box_mask,
+    haversine_km,
+    haversine_km_array,
+    haversine_matrix_km,
+    radius_mask,
+)
+
+# (long, lat) pairs, including the antimeridian and the poles.
+POINTS = [
+    ((0, 0), (0.01, 0)),
+    ((-3.7038, 40.4168), (-3.6, 40.5)),
+    ((-66.9036, 10.4806), (-66.8, 10.3)),
+    ((179.9, 10), (-179.9, 10)),
+    ((0, 89.9), (180, 89.9)),
+    ((10, -60), (12, -61)),
+    ((-70, -33), (-58, -34)),
+]
+
+
+def random_points(size, seed=0):
+    rng = np.random.default_rng(seed)
+    longs = rng.uniform(-180, 180, size)
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, size)))
+
+    return longs, lats
+
+
+class HaversineTestCase(TestCase):
+    def test_haversine_km(self):
+        self.assertEqual(haversine_km(0, 0, 0, 0), 0)
+        self.assertAlmostEqual(haversine_km(0, 0, 1, 0), 111.19, places=1)
+        self.assertAlmostEqual(haversine_km(179.9, 0, -179.9, 0), 22.24, places=1)
+
+    def test_haversine_km_array(self):
+        longs, lats = random_points(100)
+
+        distances = haversine_km_array(1, 2, longs, lats)
+
+        for distance, long, lat in zip(distances, longs, lats):
+            self.assertAlmostEqual(distance, haversine_km(1, 2, long, lat))
+
+    def test_haversine_matrix_km(self):
+        origins = np.array([(0, 0), (179.9, 0)])
+        destinations = np.array([(1, 0), (-179.9, 0), (10, 10)])
+
+        distances = haversine_matrix_km(origins, destinations)
+
+        self.assertEqual(distances.shape, (2, 3))
+
+        for row, origin in enumerate(origins):
+            for col, destination in enumerate(destinations):
+                self.assertAlmostEqual(
+                    distances[row, col], haversine_km(*origin, *destination)
+                )
+
+    def _st_distance_km(self, origin, destination, use_spheroid):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT ST_Distance("
+                "ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography, "
+                "ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography, %s)",
+                [*origin, *destination, use_spheroid],
+            )
+
+            return cursor.fetchone()[0] / 1000
+
+    def test_matches_postgis_sphere(self):
+        for origin, destination in POINTS:
+            self.assertAlmostEqual(
+                haversine_km(*origin, *destination),
+                self._st_distance_km(origin, destination, False),
+                places=3,
+            )
+
+    def test_close_to_postgis_spheroid(self):
+        for origin, destination in POINTS:
+            expected = self._st_distance_km(origin, destination, True)
+
+            # The sphere is up to ~0.56% off the WGS 84 spheroid.
+            self.assertAlmostEqual(
+                haversine_km(*origin, *destination), expected, delta=expected * 0.006
+            )
+
+
+class RadiusMaskTestCase(TestCase):
+    def test_bounding_box(self):
+        self.assertEqual(bounding_box(0, 0, 0), (0, 0, 0, 0))
+
+        min_long, min_lat, max_long, max_lat = bounding_box(179.9, 0, 50)
+
+        self.assertLess(min_long, 179.9)
+        self.assertGreater(max_long, 180)
+        self.assertAlmostEqual(max_lat - min_lat, 100 / KM_PER_DEGREE)
+
+        self.assertEqual(bounding_box(0, 89.9, 50)[::2], (-180, 180))
+
+    def test_radius_mask(self):
+        longs, lats = random_points(100_000)
+
+        for long, lat, radius_km in (
+            (0, 0, 500),
+            (179.9, 10, 300),
+            (-179.9, -10, 300),
+            (0, 89.9, 100),
+            (10, -89, 500),
+        ):
+            expected = haversine_km_array(long, lat, longs, lats) <= radius_km
+
+            box_mask = bounding_box_mask(longs, lats, long, lat, radius_km)
+            mask = radius_mask(longs, lats, long, lat, radius_km)
+
+            self.assertTrue(expected.any())
+            self.assertTrue(box_mask[expected].all())
+            self.assertTrue(np.array_equal(mask, expected))
+
+    def test_radius_mask_edge(self):
+        lat = 50 / KM_PER_DEGREE
+
+        self.assertTrue(radius_mask([0], [lat * 0.999999], 0, 0, 50)[0])
+        self.assertFalse(radius_mask([0], [lat * 1.000001], 0, 0, 50)[0])
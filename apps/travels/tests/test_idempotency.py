@@ -0,0 +1,207 @@
+from django.urls import reverse_lazy
+from django.contrib.gis.geos import Point
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+
+from apps.idempotency import (
+    IDEMPOTENT_REPLAYED_HEADER,
+    IdempotencyKeyInProgress,
+    IdempotencyKeyReused,
+    InvalidIdempotencyKey,
+    _IN_PROGRESS,
+    _get_store,
+    _make_key,
+)
+from apps.drivers.models import Drivers, Vehicles
+from apps.travels.models import RequestTravel, Travel
+from apps.travels.exceptions import DriverCantTakeRequestTravel
+from apps.travels.tests.core import BaseViewTestCase
+
+from riding.celery import app
+
+IDEMPOTENCY_SETTINGS = {
+    "ENABLED": True,
+    "TTL": 60,
+    "LOCK_TTL": 30,
+    "CACHE_ALIAS": "default",
+}
+
+
+@override_settings(IDEMPOTENCY=IDEMPOTENCY_SETTINGS)
+class CreateRequestTravelIdempotencyTestCase(BaseViewTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        cache.clear()
+
+        self.url = reverse_lazy("travels:request_travel_create")
+        self.payload = {
+            "destination": {"type": "Point", "coordinates": [0, 0]},
+            "origin": {"type": "Point", "coordinates": [0, 0]},
+        }
+
+    def _post(self, payload, idempotency_key=None):
+        headers = {"Authorization": self.authorization}
+
+        if idempotency_key is not None:
+            headers["Idempotency-Key"] = idempotency_key
+
+        return self.client.post(self.url, data=payload, headers=headers, format="json")
+
+    def test_replay(self):
+        res = self._post(self.payload, "create-1")
+        replay = self._post(self.payload, "create-1")
+
+        self.assertEqual(res.status_code, 201)
+        self.assertNotIn(IDEMPOTENT_REPLAYED_HEADER, res.headers)
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay.headers[IDEMPOTENT_REPLAYED_HEADER], "true")
+        self.assertEqual(replay.data, res.data)
+        self.assertEqual(RequestTravel.objects.count(), 1)
+
+    def test_without_key(self):
+        self._post(self.payload)
+        self._post(self.payload)
+
+        self.assertEqual(RequestTravel.objects.count(), 2)
+
+    def test_different_keys(self):
+        self._post(self.payload, "create-1")
+        self._post(self.payload, "create-2")
+
+        self.assertEqual(RequestTravel.objects.count(), 2)
+
+    def test_key_reused(self):
+        self._post(self.payload, "create-1")
+
+        payload = {**self.payload, "origin": {"type": "Point", "coordinates": [1, 1]}}
+        res = self._post(payload, "create-1")
+
+        self.assertEqual(res.status_code, 422)
+        self.assertEqual(res.data["detail"], IdempotencyKeyReused.default_detail)
+        self.assertEqual(RequestTravel.objects.count(), 1)
+
+    def test_in_progress(self):
+        _get_store().add(_make_key(self.user.id, "create-1"), _IN_PROGRESS)
+
+        res = self._post(self.payload, "create-1")
+
+        self.assertEqual(res.status_code, 409)
+        self.assertEqual(res.data["detail"], IdempotencyKeyInProgress.default_detail)
+        self.assertEqual(RequestTravel.objects.count(), 0)
+
+    def test_invalid_key(self):
+        res = self._post(self.payload, "k" * 256)
+
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["detail"], InvalidIdempotencyKey.default_detail)
+        self.assertEqual(RequestTravel.objects.count(), 0)
+
+    def test_shared_cache(self):
+        self._post(self.payload, "create-1")
+
+        self.assertIsNotNone(cache.get(_make_key(self.user.id, "create-1")))
+
+    @override_settings(IDEMPOTENCY={**IDEMPOTENCY_SETTINGS, "CACHE_ALIAS": None})
+    def test_without_cache_alias(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self._post(self.payload, "create-1")
+
+        self.assertEqual(RequestTravel.objects.count(), 0)
+
+    @override_settings(IDEMPOTENCY={**IDEMPOTENCY_SETTINGS, "ENABLED": False})
+    def test_disabled(self):
+        self._post(self.payload, "create-1")
+        self._post(self.payload, "create-1")
+
+        self.assertEqual(RequestTravel.objects.count(), 2)
+
+
+@override_settings(IDEMPOTENCY=IDEMPOTENCY_SETTINGS)
+class TakeRequestTravelIdempotencyTestCase(BaseViewTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        cache.clear()
+
+        app.conf.update(CELERY_TASK_ALWAYS_EAGER=True)
+
+        self.driver = Drivers.objects.create(user=self.user, is_active=True)
+        self.vehicle = Vehicles.objects.create(
+            driver=self.driver,
+            plate_number="1234",
+            model="asas",
+            year=1234,
+            color="blue",
+        )
+        self.passager = get_user_model().objects.create_user(
+            username="te1212stpepe",
+            email="trest2111@gmail.com",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.payload = {"longitude": 0, "latitude": 0, "vehicle_id": self.vehicle.id}
+
+    def _take(self, request_travel, idempotency_key):
+        url = reverse_lazy(
+            "travels:travel_take_request_travel",
+            kwargs={"request_travel_id": request_travel.id},
+        )
+
+        return self.client.post(
+            path=url,
+            data=self.payload,
+            headers={
+                "Authorization": self.authorization,
+                "Idempotency-Key": idempotency_key,
+            },
+        )
+
+    def test_replay(self):
+        request_travel = RequestTravel.objects.create(
+            user=self.passager, origin=Point(0, 0), destination=Point(0, 0)
+        )
+
+        res = self._take(request_travel, "take-1")
+        replay = self._take(request_travel, "take-1")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(replay.status_code, 200)
+        self.assertEqual(replay.headers[IDEMPOTENT_REPLAYED_HEADER], "true")
+        self.assertEqual(replay.data["id"], res.data["id"])
+        self.assertEqual(Travel.objects.count(), 1)
+
+    def test_replay_failed_take(self):
+        request_travel = RequestTravel.objects.create(
+            user=self.user, origin=Point(0, 0), destination=Point(0, 0)
+        )
+
+        res = self._take(request_travel, "take-1")
+
+        with self.assertNumQueries(0):
+            replay = self._take(request_travel, "take-1")
+
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(replay.status_code, 400)
+        self.assertEqual(replay.headers[IDEMPOTENT_REPLAYED_HEADER], "true")
+        self.assertEqual(
+            replay.data["detail"], DriverCantTakeRequestTravel.default_detail
+        )
+
+    def test_key_reused_on_other_request_travel(self):
+        request_travel = RequestTravel.objects.create(
+            user=self.passager, origin=Point(0, 0), destination=Point(0, 0)
+        )
+        other_request_travel = RequestTravel.objects.create(
+            user=self.passager, origin=Point(0, 0), destination=Point(0, 0)
+        )
+
+        self._take(request_travel, "take-1")
+        res = self._take(other_request_travel, "take-1")
+
+        self.assertEqual(res.status_code, 422)
+        self.assertEqual(Travel.objects.count(), 1)
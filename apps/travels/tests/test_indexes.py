@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.travels.models import RequestTravel
+
+USER_MODEL = get_user_model()
+
+
+class RequestTravelIndexesTestCase(TestCase):
+    """The planner must use the pending rows indexes no matter how much
+    history the table has. Sequential scans are disabled because the test
+    table is too small for the planner to prefer an index on its own."""
+
+    def setUp(self) -> None:
+        user = USER_MODEL.objects.create_user(
+            username="te122stpepe",
+            email="trest21@gmail.com",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        expires = timezone.now() - timedelta(hours=1)
+
+        RequestTravel.objects.bulk_create(
+            RequestTravel(
+                user=user,
+                origin=Point(i % 10, i % 10),
+                destination=Point(0, 0),
+                status=RequestTravel.TAKED if i % 2 else RequestTravel.PENDING,
+                expires=expires,
+            )
+            for i in range(200)
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("ANALYZE travels_requesttravel")
+
+    def test_radius_query_uses_partial_gist_index(self):
+        queryset = RequestTravel.objects.pending().filter(
+            origin__distance_lte=(Point(0, 0), D(km=RequestTravel.MAX_RADIUS))
+        )
+
+        self.assertIn("travels_rt_pending_origin_gist", queryset.explain())
+
+    def test_origin_has_only_partial_gist_index(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, RequestTravel._meta.db_table
+            )
+
+        origin_indexes = [
+            name
+            for name, constraint in constraints.items()
+            if constraint["index"] and constraint["columns"] == ["origin"]
+        ]
+
+        self.assertEqual(origin_indexes, ["travels_rt_pending_origin_gist"])
+
+    def test_expired_query_uses_status_expires_index(self):
+        queryset = RequestTravel.objects.expired().values_list("id", flat=True)
+
+        self.assertIn("travels_rt_status_expires_idx", queryset.explain())
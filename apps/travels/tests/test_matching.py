@@ -0,0 +1,149 @@
+from datetime import timedelta
+from itertools import permutations
+from unittest.mock import patch
+
+import numpy as np
+
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.travels.matching import (
+    get_idle_drivers,
+    match_request_travels,
+    solve_assignment,
+)
+from apps.travels.models import DispatchOffer, RequestTravel
+from apps.travels.tests.test_dispatch import DISPATCH_SETTINGS, create_driver
+
+USER_MODEL = get_user_model()
+
+MATCHING_SETTINGS = {
+    "ENABLED": True,
+    "MAX_REQUEST_TRAVELS": 100,
+    "MAX_DRIVERS": 100,
+}
+
+
+class SolveAssignmentTestCase(TestCase):
+    def _brute_force(self, cost):
+        rows_num, cols_num = cost.shape
+
+        if rows_num > cols_num:
+            return self._brute_force(cost.T)
+
+        return min(
+            sum(cost[row, col] for row, col in enumerate(cols))
+            for cols in permutations(range(cols_num), rows_num)
+        )
+
+    def test_optimal(self):
+        rng = np.random.default_rng(0)
+
+        for _ in range(50):
+            rows_num, cols_num = map(int, rng.integers(1, 6, 2))
+            cost = rng.integers(0, 100, (rows_num, cols_num)).astype(float)
+
+            rows, cols = solve_assignment(cost)
+
+            self.assertEqual(len(rows), min(rows_num, cols_num))
+            self.assertEqual(len(set(rows)), len(rows))
+            self.assertEqual(len(set(cols)), len(cols))
+            self.assertLessEqual(
+                cost[rows, cols].sum() - self._brute_force(cost), len(rows)
+            )
+
+    def test_empty(self):
+        rows, cols = solve_assignment(np.empty((0, 3)))
+
+        self.assertEqual(len(rows), 0)
+        self.assertEqual(len(cols), 0)
+
+
+@override_settings(
+    REQUEST_TRAVEL_DISPATCH=DISPATCH_SETTINGS,
+    REQUEST_TRAVEL_BATCH_MATCHING=MATCHING_SETTINGS,
+)
+class MatchRequestTravelsTestCase(TestCase):
+    def setUp(self) -> None:
+        self.rider = USER_MODEL.objects.create_user(
+            username="te122stpepe",
+            email="trest21@gmail.com",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+
+    def _create_request_travel(self, long, lat):
+        return RequestTravel.objects.create(
+            user=self.rider, origin=Point(long, lat), destination=Point(0, 0)
+        )
+
+    def test_minimizes_total_distance(self):
+        first = self._create_request_travel(0, 0)
+        second = self._create_request_travel(0.02, 0)
+        # The first come matching offers ``near`` to the first request travel
+        # and leaves ``west`` 0.04 degrees away from the second one.
+        near = create_driver("near", 0.011, 0)
+        west = create_driver("west", -0.02, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            offers = match_request_travels()
+
+        self.assertEqual(
+            {(offer.request_travel_id, offer.driver_id) for offer in offers},
+            {(first.id, west.id), (second.id, near.id)},
+        )
+        self.assertTrue(all(offer.status == DispatchOffer.OFFERED for offer in offers))
+
+    def test_skips_offered_and_out_of_radius(self):
+        request_travel = self._create_request_travel(0, 0)
+        offered = self._create_request_travel(0, 0)
+        driver = create_driver("driver", 0.01, 0)
+        create_driver("outside", 1, 0)
+        DispatchOffer.objects.create(
+            request_travel=offered,
+            driver=create_driver("other", 0, 0),
+            rank=0,
+            distance=0,
+            status=DispatchOffer.OFFERED,
+            expires=timezone.now() + timedelta(seconds=15),
+        )
+
+        offers = match_request_travels()
+
+        self.assertEqual(
+            [(offer.request_travel_id, offer.driver_id) for offer in offers],
+            [(request_travel.id, driver.id)],
+        )
+        self.assertAlmostEqual(offers[0].distance, 1113, delta=1)
+
+        # The driver has an open offer now.
+        self.assertEqual(match_request_travels(), [])
+
+    def test_skips_taken_during_matching(self):
+        taken = self._create_request_travel(0, 0)
+        request_travel = self._create_request_travel(0.02, 0)
+        create_driver("first", 0, 0)
+        driver = create_driver("second", 0.02, 0)
+
+        def take_and_get_idle_drivers(limit):
+            # Taken after the request travels were read.
+            RequestTravel.objects.filter(id=taken.id).update(status=RequestTravel.TAKED)
+
+            return get_idle_drivers(limit)
+
+        with patch("apps.travels.matching.get_idle_drivers", take_and_get_idle_drivers):
+            offers = match_request_travels()
+
+        self.assertEqual(
+            [(offer.request_travel_id, offer.driver_id) for offer in offers],
+            [(request_travel.id, driver.id)],
+        )
+
+    def test_without_drivers(self):
+        self._create_request_travel(0, 0)
+
+        self.assertEqual(match_request_travels(), [])
@@ -47,6 +47,9 @@ class IsDriverPermissionTestCase(TestCase):
         self.assertIsNone(permission)
         self.assertTrue(d.is_active)
 
+        with self.assertNumQueries(0):
+            self.view.check_permissions(request)
+
     def test_permissions_no_vehicles(self):
         request = self.view.initialize_request(self.request)
 
@@ -1,12 +1,20 @@
+import json
+
 from datetime import timedelta
+from operator import itemgetter
+from unittest.mock import patch
 
+from django.conf import settings
+from django.test import override_settings
 from django.urls import reverse_lazy
 from django.contrib.gis.geos import Point
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
+from apps.metrics.testing import QueryBudgetTestMixin
 from apps.travels.tests.core import BaseViewTestCase
 from apps.drivers.models import Drivers, Vehicles
+from apps.outbox.models import OutboxMessage
 from apps.travels.models import RequestTravel
 from apps.travels.exceptions import RequestTravelDoesNotFound
 
@@ -52,7 +60,109 @@ class ListRequestTravelApiViewTestCase(ViewTestCase):
         )
 
         self.assertEqual(res.status_code, 200)
-        self.assertEqual(len(res.data), 2)
+        self.assertEqual(len(res.data["results"]), 2)
+        self.assertIsNone(res.data["next"])
+
+    def test_get_list_ordered_by_distance(self):
+        far = RequestTravel.objects.create(
+            user=self.user, origin=Point(0.5, 0), destination=Point(0, 0)
+        )
+        near = RequestTravel.objects.create(
+            user=self.user, origin=Point(0.1, 0), destination=Point(0, 0)
+        )
+        same = RequestTravel.objects.create(
+            user=self.user, origin=Point(0.1, 0), destination=Point(0, 0)
+        )
+
+        url = reverse_lazy("travels:request_travel_list")
+
+        res = self.client.get(
+            url,
+            {"latitude": 0, "longitude": 0},
+            headers={"Authorization": self.authorization},
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            [rt["id"] for rt in res.data["results"]], [near.id, same.id, far.id]
+        )
+
+    def test_get_list_distances(self):
+        RequestTravel.objects.create(
+            user=self.user, origin=Point(0.1, 0), destination=Point(0.1, 1)
+        )
+
+        url = reverse_lazy("travels:request_travel_list")
+
+        res = self.client.get(
+            url,
+            {"latitude": 0, "longitude": 0},
+            headers={"Authorization": self.authorization},
+        )
+        request_travel = res.data["results"][0]
+
+        self.assertAlmostEqual(request_travel["driver_distance_m"], 11119.5, delta=1)
+        self.assertAlmostEqual(request_travel["trip_distance_m"], 110574, delta=1)
+
+    def test_get_list_cursor_pagination(self):
+        ids = [
+            RequestTravel.objects.create(
+                user=self.user, origin=Point(i / 100, 0), destination=Point(0, 0)
+            ).id
+            for i in range(5)
+        ]
+
+        url = reverse_lazy("travels:request_travel_list")
+        res = self.client.get(
+            url,
+            {"latitude": 0, "longitude": 0, "page_size": 2},
+            headers={"Authorization": self.authorization},
+        )
+        retrieved_ids = [rt["id"] for rt in res.data["results"]]
+
+        while res.data["next"] is not None:
+            res = self.client.get(
+                res.data["next"], headers={"Authorization": self.authorization}
+            )
+            self.assertLessEqual(len(res.data["results"]), 2)
+            retrieved_ids += [rt["id"] for rt in res.data["results"]]
+
+        self.assertEqual(retrieved_ids, ids)
+
+    @override_settings(REQUEST_TRAVEL_PAGINATION={"PAGE_SIZE": 1, "MAX_PAGE_SIZE": 2})
+    def test_get_list_max_page_size(self):
+        for _ in range(3):
+            RequestTravel.objects.create(
+                user=self.user, origin=Point(0, 0), destination=Point(0, 0)
+            )
+
+        url = reverse_lazy("travels:request_travel_list")
+
+        res = self.client.get(
+            url,
+            {"latitude": 0, "longitude": 0},
+            headers={"Authorization": self.authorization},
+        )
+        self.assertEqual(len(res.data["results"]), 1)
+
+        res = self.client.get(
+            url,
+            {"latitude": 0, "longitude": 0, "page_size": 50},
+            headers={"Authorization": self.authorization},
+        )
+        self.assertEqual(len(res.data["results"]), 2)
+        self.assertIsNotNone(res.data["next"])
+
+    def test_get_list_invalid_cursor(self):
+        url = reverse_lazy("travels:request_travel_list")
+
+        res = self.client.get(
+            url,
+            {"latitude": 0, "longitude": 0, "cursor": "invalid"},
+            headers={"Authorization": self.authorization},
+        )
+
+        self.assertEqual(res.status_code, 404)
 
     def test_get_list_not_active_driver(self):
         self.driver.is_active = False
@@ -154,6 +264,63 @@ class ListRequestTravelUserApiViewTestCase(ViewTestCase):
         self.assertEqual(len(res.data), 1)
         self.assertEqual(res.data[0]["status"], "P")
 
+    def test_list_rt_user_stream(self):
+        url = reverse_lazy("travels:request_travel_user_list")
+
+        RequestTravel.objects.create(
+            user=self.user, origin=Point(1.5, 2.5), destination=Point(0, 0)
+        )
+        RequestTravel.objects.create(
+            user=self.user,
+            origin=Point(0, 0),
+            destination=Point(0, 0),
+            status=RequestTravel.TAKED,
+        )
+
+        res = self.client.get(
+            url, {"stream": "true"}, headers={"Authorization": self.authorization}
+        )
+        expected = self.client.get(url, headers={"Authorization": self.authorization})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.streaming)
+        self.assertEqual(
+            sorted(json.loads(b"".join(res.streaming_content)), key=itemgetter("id")),
+            sorted(expected.json(), key=itemgetter("id")),
+        )
+
+        res = self.client.get(
+            url,
+            {"stream": "true", "status": "T"},
+            headers={"Authorization": self.authorization},
+        )
+
+        self.assertEqual(len(json.loads(b"".join(res.streaming_content))), 1)
+
+    def test_list_rt_user_stream_empty(self):
+        url = reverse_lazy("travels:request_travel_user_list")
+
+        res = self.client.get(
+            url, {"stream": "true"}, headers={"Authorization": self.authorization}
+        )
+
+        self.assertEqual(json.loads(b"".join(res.streaming_content)), [])
+
+    async def test_list_rt_user_stream_asgi(self):
+        url = reverse_lazy("travels:request_travel_user_list")
+
+        await RequestTravel.objects.acreate(
+            user=self.user, origin=Point(1.5, 2.5), destination=Point(0, 0)
+        )
+
+        res = await self.async_client.get(
+            url, {"stream": "true"}, headers={"Authorization": self.authorization}
+        )
+        content = b"".join([chunk async for chunk in res.streaming_content])
+
+        self.assertTrue(res.is_async)
+        self.assertEqual(len(json.loads(content)), 1)
+
 
 class CreateRequestTravelApiViewTestCase(ViewTestCase):
     def test_create_rt(self):
@@ -177,6 +344,87 @@ class CreateRequestTravelApiViewTestCase(ViewTestCase):
         self.assertEqual(res.data["id"], RequestTravel.objects.first().id)
 
 
+class BulkCreateRequestTravelApiViewTestCase(QueryBudgetTestMixin, ViewTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.url = reverse_lazy("travels:request_travel_bulk_create")
+
+    def _post(self, payload):
+        return self.client.post(
+            self.url,
+            data=payload,
+            headers={"Authorization": self.authorization},
+            format="json",
+        )
+
+    def _make_payload(self, size):
+        return [
+            {
+                "origin": {"type": "Point", "coordinates": [i, 0]},
+                "destination": {"type": "Point", "coordinates": [0, 0]},
+            }
+            for i in range(size)
+        ]
+
+    def test_bulk_create_rt(self):
+        res = self._post(self._make_payload(3))
+
+        request_travels = RequestTravel.objects.order_by("id")
+
+        self.assertEqual(res.status_code, 201)
+        self.assertWithinQueryBudget(res)
+        self.assertEqual(res.data["ids"], [rt.id for rt in request_travels])
+        self.assertEqual(
+            [rt.origin.coords for rt in request_travels], [(0, 0), (1, 0), (2, 0)]
+        )
+        self.assertTrue(all(rt.user_id == self.user.id for rt in request_travels))
+        self.assertTrue(
+            all(rt.status == RequestTravel.PENDING for rt in request_travels)
+        )
+
+    @patch("apps.travels.services.publish_request_travels_added")
+    def test_bulk_create_rt_published(self, mock):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self._post(self._make_payload(2))
+
+        mock.assert_called_once()
+        self.assertEqual([rt.id for rt in mock.call_args.args[0]], res.data["ids"])
+
+    @override_settings(
+        REQUEST_TRAVEL_DISPATCH={**settings.REQUEST_TRAVEL_DISPATCH, "ENABLED": True}
+    )
+    @patch("apps.travels.services.publish_request_travels_added")
+    def test_bulk_create_rt_dispatched(self, mock):
+        res = self._post(self._make_payload(2))
+
+        message = OutboxMessage.objects.get()
+
+        self.assertEqual(message.task, "apps.travels.tasks.dispatch_request_travels")
+        self.assertEqual(message.args, [res.data["ids"]])
+
+    def test_bulk_create_rt_invalid(self):
+        payload = self._make_payload(2)
+        payload[1]["origin"] = {"type": "Point"}
+
+        res = self._post(payload)
+
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(RequestTravel.objects.count(), 0)
+
+    def test_bulk_create_rt_empty(self):
+        res = self._post([])
+
+        self.assertEqual(res.status_code, 400)
+
+    @override_settings(REQUEST_TRAVEL_BULK_CREATE={"MAX_BATCH_SIZE": 2})
+    def test_bulk_create_rt_too_many(self):
+        res = self._post(self._make_payload(3))
+
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(RequestTravel.objects.count(), 0)
+
+
 class RequestTravelApiViewTestCase(ViewTestCase):
     def test_get_rt(self):
         origin = Point(0, 0)
@@ -0,0 +1,75 @@
+from django.test import TestCase
+from django.contrib.gis.geos import Point
+from django.contrib.auth import get_user_model
+
+from apps.travels.models import RequestTravel
+from apps.travels.api.serializers.request_travel_serializer import (
+    RequestTravelReadSerializer,
+    RequestTravelSerializer,
+)
+
+USER_MODEL = get_user_model()
+
+
+class RequestTravelReadSerializerTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user = USER_MODEL.objects.create_user(
+            username="te122stpepe",
+            email="trest21@gmail.com",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.request_travel = RequestTravel.objects.create(
+            user=self.user, origin=Point(-58.5, -34.25), destination=Point(1.5, 2.75)
+        )
+
+    def test_same_representation_from_values(self):
+        queryset = RequestTravel.objects.with_trip_distance()
+        expected = RequestTravelSerializer(queryset, many=True).data
+
+        with self.assertNumQueries(1):
+            data = RequestTravelReadSerializer(
+                RequestTravelReadSerializer.get_values(queryset)
+            ).data
+
+        self.assertEqual(data, expected)
+
+    def test_same_representation_from_instances(self):
+        request_travel = RequestTravel.objects.with_trip_distance().get()
+        expected = RequestTravelSerializer(request_travel).data
+
+        data = RequestTravelReadSerializer([request_travel]).data
+
+        self.assertEqual(data, [expected])
+
+    def test_trip_distance(self):
+        request_travel = RequestTravel.objects.create(
+            user=self.user, origin=Point(0, 0), destination=Point(0, 1)
+        )
+
+        data = RequestTravelSerializer(
+            RequestTravel.objects.with_trip_distance().get(id=request_travel.id)
+        ).data
+
+        # Geodesic meters on the WGS84 spheroid, not degrees.
+        self.assertAlmostEqual(data["trip_distance_m"], 110574, delta=1)
+        self.assertIsNone(data["driver_distance_m"])
+
+    def test_trip_distance_not_annotated(self):
+        data = RequestTravelSerializer(self.request_travel).data
+
+        self.assertIsNone(data["trip_distance_m"])
+
+        # The read serializer falls back to the spherical distance.
+        spherical = RequestTravelReadSerializer([self.request_travel]).data[0]
+        geodesic = RequestTravelReadSerializer(
+            RequestTravelReadSerializer.get_values(RequestTravel.objects.all())
+        ).data[0]
+
+        self.assertAlmostEqual(
+            spherical["trip_distance_m"],
+            geodesic["trip_distance_m"],
+            delta=geodesic["trip_distance_m"] * 0.005,
+        )
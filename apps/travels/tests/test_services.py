@@ -1,9 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 from datetime import timedelta
+from threading import Barrier
 
 from uuid import uuid4
 
+from django.db import connection
 from django.utils import timezone
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
 from django.contrib.gis.geos import Point
 
@@ -66,6 +70,85 @@ class ClearExpiredRequestTravelsTestCase(TestCase):
         self.assertEqual(num_deleted, 3)
         self.assertEqual(RequestTravel.objects.count(), 1)
 
+    def test_clear_expired_request_travels_batches(self):
+        expires = timezone.now() - timedelta(hours=2)
+
+        for _ in range(5):
+            RequestTravel.objects.create(
+                user=self.user,
+                origin=Point(0, 0),
+                destination=Point(0, 0),
+                expires=expires,
+            )
+
+        num_deleted = clear_expired_request_travels(batch_size=2)
+
+        self.assertEqual(num_deleted, 5)
+        self.assertEqual(RequestTravel.objects.count(), 0)
+
+    @patch("apps.travels.services.time")
+    def test_clear_expired_request_travels_time_budget(self, mock):
+        mock.monotonic.side_effect = [0, 10]
+        expires = timezone.now() - timedelta(hours=2)
+
+        for _ in range(5):
+            RequestTravel.objects.create(
+                user=self.user,
+                origin=Point(0, 0),
+                destination=Point(0, 0),
+                expires=expires,
+            )
+
+        num_deleted = clear_expired_request_travels(batch_size=2, time_budget=5)
+
+        self.assertEqual(num_deleted, 2)
+        self.assertEqual(RequestTravel.objects.count(), 3)
+
+        mock.monotonic.side_effect = [0, 1, 2, 3]
+        num_deleted = clear_expired_request_travels(batch_size=2, time_budget=5)
+
+        self.assertEqual(num_deleted, 3)
+        self.assertEqual(RequestTravel.objects.count(), 0)
+
+    def test_clear_expired_request_travels_once_per_batch(self):
+        expires = timezone.now() - timedelta(hours=2)
+
+        for _ in range(3):
+            RequestTravel.objects.create(
+                user=self.user,
+                origin=Point(0, 0),
+                destination=Point(0, 0),
+                expires=expires,
+            )
+
+        with (
+            patch(
+                "apps.travels.services.publish_request_travels_removed"
+            ) as publish_mock,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            # A budget of 0 seconds stops after the first batch.
+            num_deleted = clear_expired_request_travels(batch_size=2, time_budget=0)
+
+        self.assertEqual(num_deleted, 2)
+        self.assertEqual(RequestTravel.objects.count(), 1)
+        publish_mock.assert_called_once()
+        self.assertEqual(len(publish_mock.call_args.args[0]), 2)
+
+    def test_clear_expired_request_travels_keeps_taked(self):
+        RequestTravel.objects.create(
+            user=self.user,
+            origin=Point(0, 0),
+            destination=Point(0, 0),
+            expires=timezone.now() - timedelta(hours=2),
+            status=RequestTravel.TAKED,
+        )
+
+        num_deleted = clear_expired_request_travels()
+
+        self.assertEqual(num_deleted, 0)
+        self.assertEqual(RequestTravel.objects.count(), 1)
+
 
 class GetRequestTravelByIdTestCase(TestCase):
     def setUp(self) -> None:
@@ -185,6 +268,30 @@ class TakeRequestTravelTestCase(TestCase):
         self.assertEqual(request_travel.status, RequestTravel.TAKED)
         self.assertNotEqual(travel.user.id, travel.driver.id)
 
+    def test_take_request_travel_num_queries(self):
+        passager = USER_MODEL.objects.create_user(
+            username="XXXXXXXaXXXX",
+            email="teaast@gmail.com",
+            password="teaastpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        request_travel = RequestTravel.objects.create(
+            user=passager, origin=Point(0, 0), destination=Point(0, 0)
+        )
+
+        # Driver, vehicle, savepoint, locked request travel, its status, the
+        # offers, travel, outbox message and savepoint release.
+        with self.assertNumQueries(9):
+            travel = take_request_travel(
+                request_travel.id, self.user.id, 0, 0, self.vehicle.id
+            )
+
+        with self.assertNumQueries(0):
+            travel.driver.driver_name
+            travel.user.email
+
     def test_take_request_travel_self(self):
         origin = Point(0, 0)
         dest = Point(0, 0)
@@ -225,6 +332,73 @@ class TakeRequestTravelTestCase(TestCase):
             take_request_travel(request_travel.id, self.user.id, 0, 0, vehicle2.id)
 
 
+class TakeRequestTravelConcurrencyTestCase(TransactionTestCase):
+    THREADS = 8
+
+    def setUp(self):
+        self.passager = USER_MODEL.objects.create_user(
+            username="XXXXXXXaXXXX",
+            email="teaast@gmail.com",
+            password="teaastpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.drivers = []
+
+        for i in range(self.THREADS):
+            user = USER_MODEL.objects.create_user(
+                username="driver{0}".format(i),
+                email="driver{0}@gmail.com".format(i),
+                password="testpass12345",
+                first_name="test",
+                last_name="test",
+                is_active=True,
+            )
+            driver = Drivers.objects.create(user=user, is_active=True)
+            vehicle = Vehicles.objects.create(
+                driver=driver,
+                plate_number="1234",
+                model="asas",
+                year=1234,
+                color="blue",
+            )
+            self.drivers.append((user, vehicle))
+
+    def test_take_request_travel_race(self):
+        request_travel = RequestTravel.objects.create(
+            user=self.passager, origin=Point(0, 0), destination=Point(0, 0)
+        )
+        barrier = Barrier(self.THREADS)
+
+        def take(user, vehicle):
+            try:
+                barrier.wait()
+                return take_request_travel(request_travel.id, user.id, 0, 0, vehicle.id)
+            except RequestTravelDoesNotFound as e:
+                return e
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.THREADS) as executor:
+            results = list(executor.map(lambda args: take(*args), self.drivers))
+
+        travels = [result for result in results if isinstance(result, Travel)]
+        losers = [
+            result
+            for result in results
+            if isinstance(result, RequestTravelDoesNotFound)
+        ]
+
+        self.assertEqual(len(travels), 1)
+        self.assertEqual(len(losers), self.THREADS - 1)
+        self.assertEqual(Travel.objects.count(), 1)
+        self.assertEqual(
+            RequestTravel.objects.get(id=request_travel.id).status,
+            RequestTravel.TAKED,
+        )
+
+
 class GetTravelByIdTestCase(TestCase):
     def setUp(self) -> None:
         self.user = USER_MODEL.objects.create_user(
@@ -332,6 +506,25 @@ class CancelTravelTestCase(TestCase):
         self.assertEqual(travel.status, Travel.CANCELLED)
         self.assertEqual(cancelled_travel.status, Travel.CANCELLED)
 
+    def test_cancel_travel_num_queries(self):
+        travel = Travel.objects.create(
+            user=self.user,
+            driver=self.driver,
+            request_travel=self.request_travel,
+            origin=self.request_travel.origin,
+            destination=self.request_travel.destination,
+            vehicle=self.vehicle,
+        )
+
+        # Travel with its members, savepoint, status, outbox message and
+        # savepoint release.
+        with self.assertNumQueries(5):
+            travel = cancel_travel(travel.id, self.driver.user.id)
+
+        with self.assertNumQueries(0):
+            travel.user.email
+            travel.driver.user.email
+
     def test_cant_cancel_travel_status(self):
         travel = Travel.objects.create(
             user=self.user,
@@ -472,6 +665,28 @@ class FinishTravelTestCase(TestCase):
         self.assertEqual(confirmed_travel.driver, self.driver)
         self.assertEqual(conf_travel.id, confirmed_travel.id)
 
+    def test_finish_travel_num_queries(self):
+        travel = Travel.objects.create(
+            user=self.user,
+            driver=self.driver,
+            request_travel=self.request_travel,
+            origin=self.request_travel.origin,
+            destination=self.request_travel.destination,
+            vehicle=self.vehicle,
+        )
+        ConfirmationTravel.objects.create(
+            travel=travel, user=self.user, driver=self.driver, check_driver=True
+        )
+
+        # Travel with its members, savepoint, confirmation upsert, travel status,
+        # outbox message and savepoint release.
+        with self.assertNumQueries(6):
+            confirmed_travel = finish_travel(travel.id, self.user.id)
+
+        with self.assertNumQueries(0):
+            confirmed_travel.user.email
+            confirmed_travel.driver.user.email
+
     def test_finish_travel_first_confirmation_user_id(self):
         travel = Travel.objects.create(
             user=self.user,
@@ -527,3 +742,80 @@ class FinishTravelTestCase(TestCase):
             finish_travel(travel.id, self.user_driver.id)
 
         self.assertEqual(ConfirmationTravel.objects.count(), 0)
+
+
+class FinishTravelConcurrencyTestCase(TransactionTestCase):
+    ROUNDS = 5
+
+    def setUp(self) -> None:
+        self.user = USER_MODEL.objects.create_user(
+            username="XXXXXXXXXXX",
+            email="XXXXXXXXXXXXXX",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.user_driver = USER_MODEL.objects.create_user(
+            username="XXXXXX1XXXX",
+            email="XXXXXXX1XXXXXXX",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.driver = Drivers.objects.create(user=self.user_driver, is_active=True)
+        self.vehicle = Vehicles.objects.create(
+            driver=self.driver,
+            plate_number="1234",
+            model="asas",
+            year=1234,
+            color="blue",
+        )
+
+    def _create_travel(self):
+        request_travel = RequestTravel.objects.create(
+            user=self.user, origin=Point(0, 0), destination=Point(0, 0)
+        )
+
+        return Travel.objects.create(
+            user=self.user,
+            driver=self.driver,
+            request_travel=request_travel,
+            origin=request_travel.origin,
+            destination=request_travel.destination,
+            vehicle=self.vehicle,
+        )
+
+    def test_finish_travel_race(self):
+        for _ in range(self.ROUNDS):
+            travel = self._create_travel()
+            barrier = Barrier(2)
+
+            def finish(user_id):
+                try:
+                    barrier.wait()
+                    return finish_travel(travel.id, user_id)
+                finally:
+                    connection.close()
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                results = list(
+                    executor.map(finish, (self.user.id, self.user_driver.id))
+                )
+
+            confirmation_travel = ConfirmationTravel.objects.get(travel=travel)
+
+            self.assertTrue(confirmation_travel.check_user)
+            self.assertTrue(confirmation_travel.check_driver)
+            self.assertEqual(Travel.objects.get(id=travel.id).status, Travel.DONE)
+            # Only the last confirmation sees both checks.
+            self.assertEqual(
+                [result.check_user and result.check_driver for result in results].count(
+                    True
+                ),
+                1,
+            )
+            self.assertEqual(
+                {result.id for result in results}, {confirmation_travel.id}
+            )
@@ -0,0 +1,260 @@
+import threading
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.contrib.gis.geos import Point
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from rest_framework.generics import GenericAPIView
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.travels.models import RequestTravel
+from apps.travels.filters import RequestTravelDistanceToRadiusFilter
+from apps.travels.pagination import RequestTravelDistanceCursorPagination
+from apps.travels.services import bulk_create_request_travels
+from apps.travels.spatial_index import (
+    RequestTravelGridIndex,
+    get_request_travel_index,
+    warm_request_travel_index,
+    warm_request_travel_index_async,
+)
+
+USER_MODEL = get_user_model()
+
+INDEX_SETTINGS = {"ENABLED": True, "CELL_SIZE": 0.1, "REFRESH_SECONDS": 60}
+
+
+class TestView(GenericAPIView):
+    filter_backends = (RequestTravelDistanceToRadiusFilter,)
+
+    def get_queryset(self):
+        return RequestTravel.objects.pending()
+
+
+class RequestTravelGridIndexTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user = USER_MODEL.objects.create_user(
+            username="te122stpepe",
+            email="trest21@gmail.com",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.index = RequestTravelGridIndex(cell_size=0.1, refresh_seconds=60)
+
+    def _create_request_travel(self, long, lat, **kwargs):
+        return RequestTravel.objects.create(
+            user=self.user,
+            origin=Point(long, lat),
+            destination=Point(long, lat),
+            **kwargs,
+        )
+
+    def test_query_cold(self):
+        self.assertFalse(self.index.is_warm)
+        self.assertIsNone(self.index.query(0, 0, 10))
+
+    def test_query_radius(self):
+        near = self._create_request_travel(0.05, 0.05)
+        middle = self._create_request_travel(0.3, 0)
+        far = self._create_request_travel(1, 1)
+
+        self.index.load(RequestTravel.objects.pending())
+        results = self.index.query(0, 0, 50)
+
+        self.assertTrue(self.index.is_warm)
+        self.assertEqual([rt.id for _, rt in results], [near.id, middle.id])
+        self.assertNotIn(far.id, [rt.id for _, rt in results])
+        self.assertLess(results[0][0], results[1][0])
+
+    def test_query_antimeridian(self):
+        request_travel = self._create_request_travel(-179.95, 0)
+
+        self.index.load(RequestTravel.objects.pending())
+        results = self.index.query(179.95, 0, 20)
+
+        self.assertEqual([rt.id for _, rt in results], [request_travel.id])
+
+    def test_query_skips_expired(self):
+        request_travel = self._create_request_travel(
+            0, 0, expires=timezone.now() + timedelta(minutes=1)
+        )
+        self.index.load([request_travel])
+
+        request_travel.expires = timezone.now() - timedelta(minutes=1)
+
+        self.assertEqual(self.index.query(0, 0, 10), [])
+        self.assertNotIn(request_travel.id, self.index)
+
+    def test_add_and_remove(self):
+        self.index.load([])
+        request_travel = self._create_request_travel(0, 0)
+
+        self.index.add(request_travel)
+        self.assertEqual(len(self.index.query(0, 0, 10)), 1)
+
+        request_travel.status = RequestTravel.TAKED
+        self.index.add(request_travel)
+        self.assertEqual(self.index.query(0, 0, 10), [])
+
+        request_travel.status = RequestTravel.PENDING
+        self.index.add(request_travel)
+        self.index.remove(request_travel.id)
+        self.assertEqual(len(self.index), 0)
+
+    def test_load_replays_updates(self):
+        taken = self._create_request_travel(0, 0)
+        created = self._create_request_travel(0.01, 0)
+
+        def snapshot():
+            # The signals commit while the snapshot is read.
+            yield taken
+            self.index.remove(taken.id)
+            self.index.add(created)
+
+        self.index.load(snapshot())
+
+        self.assertNotIn(taken.id, self.index)
+        self.assertIn(created.id, self.index)
+        self.assertEqual([rt.id for _, rt in self.index.query(0, 0, 10)], [created.id])
+
+        self.index.remove(created.id)
+        self.index.load([created])
+
+        self.assertIn(created.id, self.index)
+
+
+@override_settings(REQUEST_TRAVEL_INDEX=INDEX_SETTINGS)
+class RequestTravelIndexFilterTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user = USER_MODEL.objects.create_user(
+            username="te122stpepe",
+            email="trest21@gmail.com",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.factory = APIRequestFactory()
+        self.index = get_request_travel_index()
+        self.index.clear()
+
+    def tearDown(self) -> None:
+        self.index.clear()
+
+    def _filter(self):
+        view = TestView()
+        view.request = view.initialize_request(
+            self.factory.get("/", {"longitude": 0, "latitude": 0, "radius": 10})
+        )
+
+        return view.filter_queryset(view.get_queryset())
+
+    def test_filter_cold_index_falls_back_to_database(self):
+        obj = RequestTravel.objects.create(
+            user=self.user, origin=Point(0, 0), destination=Point(0, 0)
+        )
+
+        with patch("apps.travels.filters.warm_request_travel_index_async") as warm_mock:
+            filter_queryset = self._filter()
+
+        self.assertEqual([rt.id for rt in filter_queryset], [obj.id])
+        warm_mock.assert_called_once_with(self.index)
+        self.assertFalse(self.index.is_warm)
+
+    def test_filter_warm_index_without_queries(self):
+        obj = RequestTravel.objects.create(
+            user=self.user, origin=Point(0, 0), destination=Point(0, 0)
+        )
+        warm_request_travel_index(self.index)
+
+        with self.assertNumQueries(0):
+            filter_queryset = self._filter()
+
+        self.assertEqual([rt.id for rt in filter_queryset], [obj.id])
+        self.assertEqual(filter_queryset[0].distance.m, 0)
+
+    def test_paginate_warm_index(self):
+        ids = [
+            RequestTravel.objects.create(
+                user=self.user, origin=Point(i / 100, 0), destination=Point(0, 0)
+            ).id
+            for i in range(3)
+        ]
+        warm_request_travel_index(self.index)
+
+        pagination = RequestTravelDistanceCursorPagination()
+        request = Request(self.factory.get("/", {"page_size": 2}))
+        page = pagination.paginate_queryset(self._filter(), request)
+
+        self.assertEqual([rt.id for rt in page], ids[:2])
+
+        request = Request(self.factory.get(pagination.get_next_link()))
+        page = pagination.paginate_queryset(self._filter(), request)
+
+        self.assertEqual([rt.id for rt in page], ids[2:])
+        self.assertIsNone(pagination.get_next_link())
+
+    def test_warm_async_once(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def warm(index):
+            started.set()
+            release.wait(5)
+            index.load([])
+
+        with patch("apps.travels.spatial_index.warm_request_travel_index", warm):
+            thread = warm_request_travel_index_async(self.index)
+            started.wait(5)
+
+            self.assertIsNone(warm_request_travel_index_async(self.index))
+
+            release.set()
+            thread.join(5)
+
+        self.assertTrue(self.index.is_warm)
+
+    def test_signals_update_index(self):
+        self.index.load([])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            obj = RequestTravel.objects.create(
+                user=self.user, origin=Point(0, 0), destination=Point(0, 0)
+            )
+
+        self.assertIn(obj.id, self.index)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.status = RequestTravel.TAKED
+            obj.save()
+
+        self.assertNotIn(obj.id, self.index)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.status = RequestTravel.PENDING
+            obj.save()
+            obj_id = obj.id
+            obj.delete()
+
+        self.assertNotIn(obj_id, self.index)
+
+    @patch("apps.travels.services.publish_request_travels_added")
+    def test_bulk_create_updates_index(self, mock):
+        self.index.load([])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            request_travels = bulk_create_request_travels(
+                self.user,
+                [
+                    {"origin": Point(i / 100, 0), "destination": Point(0, 0)}
+                    for i in range(2)
+                ],
+            )
+
+        self.assertTrue(all(rt.id in self.index for rt in request_travels))
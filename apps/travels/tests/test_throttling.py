@@ -0,0 +1,181 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse_lazy
+
+from apps.drivers.models import Drivers, Vehicles
+from apps.throttling import ScopedTokenBucketThrottle, take_token
+from apps.travels.tests.core import BaseViewTestCase
+
+THROTTLING_SETTINGS = {
+    "ENABLED": True,
+    "MAX_SIZE": 100,
+    "CACHE_ALIAS": None,
+    "SCOPES": {
+        "request_travel_list": {"RATE": 1, "CAPACITY": 2},
+        "request_travel_bulk_create": {"RATE": 1, "CAPACITY": 4},
+        "travel_take": {"RATE": 1, "CAPACITY": 2},
+    },
+}
+
+
+class TakeTokenTestCase(SimpleTestCase):
+    def test_full_bucket(self):
+        allowed, bucket = take_token(None, 100, rate=1, capacity=3)
+
+        self.assertTrue(allowed)
+        self.assertEqual(bucket, (2, 100))
+
+    def test_empty_bucket(self):
+        allowed, bucket = take_token((0.5, 100), 100, rate=1, capacity=3)
+
+        self.assertFalse(allowed)
+        self.assertEqual(bucket, (0.5, 100))
+
+    def test_refill(self):
+        allowed, bucket = take_token((0, 100), 102.5, rate=1, capacity=3)
+
+        self.assertTrue(allowed)
+        self.assertEqual(bucket, (1.5, 102.5))
+
+    def test_refill_up_to_capacity(self):
+        allowed, bucket = take_token((0, 100), 200, rate=1, capacity=3)
+
+        self.assertTrue(allowed)
+        self.assertEqual(bucket, (2, 200))
+
+    def test_cost(self):
+        allowed, bucket = take_token((2, 100), 100, rate=1, capacity=3, cost=2)
+
+        self.assertTrue(allowed)
+        self.assertEqual(bucket, (0, 100))
+
+        allowed, bucket = take_token((1, 100), 100, rate=1, capacity=3, cost=2)
+
+        self.assertFalse(allowed)
+        self.assertEqual(bucket, (1, 100))
+
+
+@override_settings(THROTTLING=THROTTLING_SETTINGS)
+class ScopedTokenBucketThrottleTestCase(SimpleTestCase):
+    def setUp(self) -> None:
+        self.request = SimpleNamespace(
+            user=SimpleNamespace(id=uuid4(), is_authenticated=True)
+        )
+        self.view = SimpleNamespace(throttle_scope="request_travel_list")
+
+    def _allow(self, request=None, view=None):
+        throttle = ScopedTokenBucketThrottle()
+        allowed = throttle.allow_request(request or self.request, view or self.view)
+
+        return allowed, throttle.wait()
+
+    @patch("apps.throttling.time")
+    def test_throttled(self, mock):
+        mock.monotonic.return_value = 100
+
+        self.assertEqual(self._allow(), (True, None))
+        self.assertEqual(self._allow(), (True, None))
+        self.assertEqual(self._allow(), (False, 1))
+
+        mock.monotonic.return_value = 101
+
+        self.assertEqual(self._allow(), (True, None))
+
+    def test_per_user_and_scope(self):
+        self._allow()
+        self._allow()
+
+        other_request = SimpleNamespace(
+            user=SimpleNamespace(id=uuid4(), is_authenticated=True)
+        )
+        take_view = SimpleNamespace(throttle_scope="travel_take")
+
+        self.assertFalse(self._allow()[0])
+        self.assertTrue(self._allow(request=other_request)[0])
+        self.assertTrue(self._allow(view=take_view)[0])
+
+    def test_without_scope(self):
+        for view in (SimpleNamespace(), SimpleNamespace(throttle_scope="unknown")):
+            for _ in range(3):
+                self.assertTrue(self._allow(view=view)[0])
+
+    @override_settings(THROTTLING={**THROTTLING_SETTINGS, "CACHE_ALIAS": "default"})
+    def test_shared_cache(self):
+        self._allow()
+        self._allow()
+
+        self.assertFalse(self._allow()[0])
+        self.assertIsNotNone(
+            cache.get("throttle:request_travel_list:{0}".format(self.request.user.id))
+        )
+
+    @override_settings(THROTTLING={**THROTTLING_SETTINGS, "ENABLED": False})
+    def test_disabled(self):
+        for _ in range(3):
+            self.assertTrue(self._allow()[0])
+
+
+@override_settings(THROTTLING=THROTTLING_SETTINGS)
+class ThrottledViewsTestCase(BaseViewTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.driver = Drivers.objects.create(user=self.user, is_active=True)
+        self.vehicle = Vehicles.objects.create(
+            driver=self.driver,
+            plate_number="1234",
+            model="asas",
+            year=1234,
+            color="blue",
+        )
+
+    def test_request_travel_list_throttled(self):
+        url = reverse_lazy("travels:request_travel_list")
+        params = {"latitude": 0, "longitude": 0}
+        headers = {"Authorization": self.authorization}
+
+        responses = [self.client.get(url, params, headers=headers) for _ in range(3)]
+
+        self.assertEqual([res.status_code for res in responses], [200, 200, 429])
+        self.assertIn("Retry-After", responses[-1].headers)
+
+    def test_take_not_throttled_by_list(self):
+        url = reverse_lazy("travels:request_travel_list")
+        params = {"latitude": 0, "longitude": 0}
+        headers = {"Authorization": self.authorization}
+
+        for _ in range(3):
+            self.client.get(url, params, headers=headers)
+
+        take_url = reverse_lazy(
+            "travels:travel_take_request_travel", kwargs={"request_travel_id": 1}
+        )
+        res = self.client.post(
+            take_url,
+            {"longitude": 0, "latitude": 0, "vehicle_id": self.vehicle.id},
+            headers=headers,
+        )
+
+        self.assertEqual(res.status_code, 404)
+
+    def test_bulk_create_charges_per_request_travel(self):
+        url = reverse_lazy("travels:request_travel_bulk_create")
+        payload = [
+            {
+                "destination": {"type": "Point", "coordinates": [0, 0]},
+                "origin": {"type": "Point", "coordinates": [0, 0]},
+            }
+        ] * 3
+        headers = {"Authorization": self.authorization}
+
+        with patch("apps.travels.services.publish_request_travels_added"):
+            responses = [
+                self.client.post(url, payload, headers=headers, format="json")
+                for _ in range(2)
+            ]
+
+        self.assertEqual([res.status_code for res in responses], [201, 429])
@@ -3,6 +3,7 @@ from django.contrib.gis.geos import Point
 from django.contrib.auth import get_user_model
 from django.core import mail
 
+from apps.outbox.services import relay_outbox_messages
 from apps.travels.tests.core import BaseViewTestCase
 from apps.drivers.models import Drivers, Vehicles
 from apps.travels.models import RequestTravel, Travel, ConfirmationTravel
@@ -69,7 +70,12 @@ class TakeRequestTravelApiViewTestCase(ViewTestCase):
         self.assertEqual(travel.driver, self.driver)
         self.assertEqual(travel.request_travel.id, request_travel.id)
         self.assertEqual(travel.request_travel.status, RequestTravel.TAKED)
+        self.assertEqual(res.data["trip_distance_m"], 0)
+        self.assertEqual(res.data["driver_distance_m"], 0)
         self.assertEqual(Travel.objects.count(), 1)
+
+        relay_outbox_messages()
+
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].subject, "Your travel request has been taken!")
         self.assertEqual(mail.outbox[0].to, [self.user2.email])
@@ -92,6 +98,9 @@ class TakeRequestTravelApiViewTestCase(ViewTestCase):
         )
 
         self.assertEqual(res.status_code, 400)
+
+        relay_outbox_messages()
+
         self.assertEqual(len(mail.outbox), 0)
         self.assertEqual(res.data["detail"], DriverCantTakeRequestTravel.default_detail)
 
@@ -121,6 +130,7 @@ class TravelApiViewTestCase(ViewTestCase):
         self.assertEqual(res.data["user"], request_travel.user.id)
         self.assertEqual(res.data["driver"], self.driver.id)
         self.assertEqual(res.data["request_travel"], request_travel.id)
+        self.assertEqual(res.data["trip_distance_m"], 0)
 
     def test_travel_api_view_not_found(self):
         url = reverse_lazy("travels:travel_retrieve", kwargs={"travel_id": 1})
@@ -166,6 +176,9 @@ class CancelTravelApiView(ViewTestCase):
         self.assertEqual(res.data["driver"], travel.driver.id)
         self.assertEqual(res.data["status"], Travel.CANCELLED)
         self.assertEqual(Travel.objects.get(id=travel.id).status, Travel.CANCELLED)
+
+        relay_outbox_messages()
+
         self.assertEqual(len(mail.outbox), 1)
 
     def test_cancel_travel_api_view_not_found(self):
@@ -178,6 +191,9 @@ class CancelTravelApiView(ViewTestCase):
 
         self.assertEqual(res.status_code, 404)
         self.assertEqual(res.data["detail"], TravelDoesNotFound.default_detail)
+
+        relay_outbox_messages()
+
         self.assertEqual(len(mail.outbox), 0)
 
     def test_cancel_travel_api_view_not_user(self):
@@ -205,6 +221,9 @@ class CancelTravelApiView(ViewTestCase):
 
         self.assertEqual(res.status_code, 400)
         self.assertEqual(res.data["detail"], CannotCancelThisTravel.default_detail)
+
+        relay_outbox_messages()
+
         self.assertEqual(len(mail.outbox), 0)
 
 
@@ -247,6 +266,9 @@ class FinishTravelApiViewTestCase(ViewTestCase):
         self.assertEqual(res.data["check_user"], True)
         self.assertEqual(res.data["check_driver"], False)
         self.assertNotEqual(Travel.objects.get(id=travel.id).status, Travel.DONE)
+
+        relay_outbox_messages()
+
         self.assertEqual(len(mail.outbox), 1)
         self.assertNotIn("Travel is done", mail.outbox[0].body)
 
@@ -285,6 +307,9 @@ class FinishTravelApiViewTestCase(ViewTestCase):
         self.assertEqual(res.data["check_user"], True)
         self.assertEqual(res.data["check_driver"], True)
         self.assertEqual(Travel.objects.get(id=travel.id).status, Travel.DONE)
+
+        relay_outbox_messages()
+
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn("Travel is done", mail.outbox[0].body)
 
@@ -319,6 +344,9 @@ class FinishTravelApiViewTestCase(ViewTestCase):
         self.assertEqual(res.data["check_user"], False)
         self.assertEqual(res.data["check_driver"], True)
         self.assertNotEqual(Travel.objects.get(id=travel.id).status, Travel.DONE)
+
+        relay_outbox_messages()
+
         self.assertEqual(len(mail.outbox), 1)
         self.assertNotIn("Travel is done", mail.outbox[0].body)
 
@@ -355,5 +383,8 @@ class FinishTravelApiViewTestCase(ViewTestCase):
         self.assertEqual(res.data["check_user"], True)
         self.assertEqual(res.data["check_driver"], True)
         self.assertEqual(Travel.objects.get(id=travel.id).status, Travel.DONE)
+
+        relay_outbox_messages()
+
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn("Travel is done", mail.outbox[0].body)
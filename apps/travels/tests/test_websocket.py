@@ -0,0 +1,239 @@
+import asyncio
+import json
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+
+from apps.drivers.models import Drivers, Vehicles
+from apps.events import get_broker
+from apps.events.routing import WebSocketRouter
+from apps.travels.events import get_request_travel_channel, get_travel_channel
+from apps.travels.models import RequestTravel, Travel
+from apps.travels.services import (
+    cancel_travel,
+    finish_travel,
+    take_request_travel,
+)
+from apps.travels.tests.core import BaseViewTestCase
+from apps.travels.websocket import websocket_urlpatterns
+from apps.travels.api.serializers.travel_serializers import TravelSerializer
+
+
+class WebSocketCommunicator:
+    def __init__(self, path, headers=(), query_string=b""):
+        self.input = asyncio.Queue()
+        self.output = asyncio.Queue()
+        scope = {
+            "type": "websocket",
+            "path": path,
+            "headers": list(headers),
+            "query_string": query_string,
+        }
+        application = WebSocketRouter(websocket_urlpatterns)
+        self.task = asyncio.ensure_future(
+            application(scope, self.input.get, self.output.put)
+        )
+
+    async def connect(self):
+        await self.input.put({"type": "websocket.connect"})
+
+        return await self.receive()
+
+    async def receive(self):
+        return await asyncio.wait_for(self.output.get(), 1)
+
+    async def receive_json(self):
+        return json.loads((await self.receive())["text"])
+
+    async def disconnect(self):
+        await self.input.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.task, 1)
+
+
+class TravelEventsTestCase(BaseViewTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.rider = get_user_model().objects.create_user(
+            username="te1212stpepe",
+            email="trest2111@gmail.com",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.driver = Drivers.objects.create(user=self.user, is_active=True)
+        self.vehicle = Vehicles.objects.create(
+            driver=self.driver,
+            plate_number="1234",
+            model="asas",
+            year=1234,
+            color="blue",
+        )
+        request_travel = RequestTravel.objects.create(
+            user=self.rider,
+            origin=Point(0, 0),
+            destination=Point(0, 0),
+            status=RequestTravel.TAKED,
+        )
+        self.travel = Travel.objects.create(
+            user=self.rider,
+            driver=self.driver,
+            request_travel=request_travel,
+            origin=Point(0, 0),
+            destination=Point(0, 0),
+            vehicle=self.vehicle,
+        )
+        self.path = "/ws/travel/{0}/".format(self.travel.id)
+        self.headers = [(b"authorization", self.authorization.encode())]
+
+    async def test_push_events(self):
+        communicator = WebSocketCommunicator(self.path, self.headers)
+
+        self.assertEqual(await communicator.connect(), {"type": "websocket.accept"})
+
+        state = await communicator.receive_json()
+        self.assertEqual(state["event"], "state")
+        self.assertEqual(state["travel"]["id"], self.travel.id)
+
+        get_broker().publish(
+            get_travel_channel(self.travel.id), {"event": "confirmed", "travel": {}}
+        )
+        self.assertEqual((await communicator.receive_json())["event"], "confirmed")
+
+        get_broker().publish(
+            get_travel_channel(self.travel.id), {"event": "finished", "travel": {}}
+        )
+        self.assertEqual((await communicator.receive_json())["event"], "finished")
+        self.assertEqual(
+            await communicator.receive(), {"type": "websocket.close", "code": 1000}
+        )
+
+        await asyncio.wait_for(communicator.task, 1)
+
+    async def test_closes_old_connections(self):
+        communicator = WebSocketCommunicator(self.path, self.headers)
+
+        with patch("apps.events.database.close_old_connections") as mock:
+            await communicator.connect()
+
+        self.assertEqual(mock.call_count, 2)
+        await communicator.disconnect()
+
+    async def test_token_in_query_string(self):
+        communicator = WebSocketCommunicator(
+            self.path, query_string=b"access_token=secret-access-token-key"
+        )
+
+        self.assertEqual(await communicator.connect(), {"type": "websocket.accept"})
+        await communicator.receive_json()
+        await communicator.disconnect()
+
+        self.assertEqual(get_broker()._subscriptions, {})
+
+    async def test_forbidden(self):
+        communicator = WebSocketCommunicator(self.path)
+
+        self.assertEqual(
+            await communicator.connect(), {"type": "websocket.close", "code": 4403}
+        )
+
+    async def test_not_found_path(self):
+        communicator = WebSocketCommunicator("/ws/unknown/", self.headers)
+
+        self.assertEqual(
+            await communicator.connect(), {"type": "websocket.close", "code": 4404}
+        )
+
+    @patch("apps.travels.events.get_broker")
+    def test_services_publish_events(self, get_broker):
+        publish = get_broker.return_value.publish
+        channel = get_travel_channel(self.travel.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            finish_travel(self.travel.id, self.user.id)
+
+        self.assertEqual(publish.call_args.args[0], channel)
+        self.assertEqual(publish.call_args.args[1]["event"], "confirmed")
+        self.assertTrue(publish.call_args.args[1]["check_driver"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cancel_travel(self.travel.id, self.rider.id)
+
+        self.assertEqual(publish.call_args.args[1]["event"], "cancelled")
+        self.assertEqual(publish.call_args.args[1]["travel"]["status"], "C")
+
+
+class RequestTravelEventsTestCase(BaseViewTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.driver_user = get_user_model().objects.create_user(
+            username="te1212stpepe",
+            email="trest2111@gmail.com",
+            password="testpass12345",
+            first_name="test",
+            last_name="test",
+            is_active=True,
+        )
+        self.driver = Drivers.objects.create(user=self.driver_user, is_active=True)
+        self.vehicle = Vehicles.objects.create(
+            driver=self.driver,
+            plate_number="1234",
+            model="asas",
+            year=1234,
+            color="blue",
+        )
+        self.request_travel = RequestTravel.objects.create(
+            user=self.user, origin=Point(0, 0), destination=Point(0, 0)
+        )
+        self.path = "/ws/request-travel/{0}/".format(self.request_travel.id)
+        self.headers = [(b"authorization", self.authorization.encode())]
+
+    async def test_push_taken_event(self):
+        communicator = WebSocketCommunicator(self.path, self.headers)
+
+        self.assertEqual(await communicator.connect(), {"type": "websocket.accept"})
+
+        state = await communicator.receive_json()
+        self.assertEqual(state["event"], "state")
+        self.assertEqual(state["request_travel"]["id"], self.request_travel.id)
+
+        get_broker().publish(
+            get_request_travel_channel(self.request_travel.id),
+            {"event": "taken", "travel": {"id": 1}},
+        )
+        self.assertEqual(
+            await communicator.receive_json(), {"event": "taken", "travel": {"id": 1}}
+        )
+        self.assertEqual(
+            await communicator.receive(), {"type": "websocket.close", "code": 1000}
+        )
+
+        await asyncio.wait_for(communicator.task, 1)
+
+    async def test_forbidden_to_other_users(self):
+        self.request_travel.user = self.driver_user
+        await self.request_travel.asave()
+
+        communicator = WebSocketCommunicator(self.path, self.headers)
+
+        self.assertEqual(
+            await communicator.connect(), {"type": "websocket.close", "code": 4403}
+        )
+
+    @patch("apps.travels.events.get_broker")
+    def test_take_publishes_to_request_travel_channel(self, get_broker):
+        publish = get_broker.return_value.publish
+
+        with self.captureOnCommitCallbacks(execute=True):
+            travel = take_request_travel(
+                self.request_travel.id, self.driver_user.id, 0, 0, self.vehicle.id
+            )
+
+        publish.assert_any_call(
+            get_request_travel_channel(self.request_travel.id),
+            {"event": "taken", "travel": TravelSerializer(travel).data},
+        )
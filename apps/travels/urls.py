@@ -3,7 +3,9 @@ from django.urls import path
 from apps.travels.api.views.request_travel_views import (
     ListRequestTravelApiView,
     ListRequestTravelUserApiView,
+    StreamRequestTravelApiView,
     CreateRequestTravelApiView,
+    BulkCreateRequestTravelApiView,
     RequestTravelApiView,
 )
 
@@ -14,10 +16,19 @@ from apps.travels.api.views.travel_views import (
     FinishTravelApiView,
 )
 
+from apps.travels.api.views.dispatch_views import (
+    ListDispatchOfferApiView,
+    AcceptDispatchOfferApiView,
+    RejectDispatchOfferApiView,
+)
+
 app_name = "travels"
 
 urlpatterns = [
     path("rt/list/", ListRequestTravelApiView.as_view(), name="request_travel_list"),
+    path(
+        "rt/stream/", StreamRequestTravelApiView.as_view(), name="request_travel_stream"
+    ),
     path(
         "rt/user/",
         ListRequestTravelUserApiView.as_view(),
@@ -26,6 +37,11 @@ urlpatterns = [
     path(
         "rt/create/", CreateRequestTravelApiView.as_view(), name="request_travel_create"
     ),
+    path(
+        "rt/bulk-create/",
+        BulkCreateRequestTravelApiView.as_view(),
+        name="request_travel_bulk_create",
+    ),
     path(
         "rt/<int:id>/", RequestTravelApiView.as_view(), name="request_travel_get_delete"
     ),
@@ -45,4 +61,15 @@ urlpatterns = [
         FinishTravelApiView.as_view(),
         name="travel_finish",
     ),
+    path("offers/", ListDispatchOfferApiView.as_view(), name="dispatch_offer_list"),
+    path(
+        "offers/accept/<int:offer_id>/",
+        AcceptDispatchOfferApiView.as_view(),
+        name="dispatch_offer_accept",
+    ),
+    path(
+        "offers/reject/<int:offer_id>/",
+        RejectDispatchOfferApiView.as_view(),
+        name="dispatch_offer_reject",
+    ),
 ]
@@ -0,0 +1,269 @@
+import asyncio
+import json
+
+from urllib.parse import parse_qs
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.urls import path
+
+from apps.drivers.cache import get_user_driver_eligibility
+from apps.drivers.models import Drivers
+from apps.events import get_broker
+from apps.events.database import database_sync_to_async
+from apps.travels.events import (
+    TRAVEL_CANCELLED,
+    TRAVEL_FINISHED,
+    TRAVEL_TAKEN,
+    get_driver_channel,
+    get_request_travel_channel,
+    get_travel_channel,
+)
+from apps.travels.models import RequestTravel, Travel
+from apps.travels.api.serializers.request_travel_serializer import (
+    RequestTravelSerializer,
+)
+from apps.travels.api.serializers.travel_serializers import TravelSerializer
+from apps.users.services import get_user_by_access_token
+
+# Close codes, 4000 + the HTTP status code.
+CLOSE_FORBIDDEN = 4403
+CLOSE_TRY_AGAIN_LATER = 1013
+
+OVERFLOW_CHECK_SECONDS = 5
+
+
+def _get_token(scope) -> str | None:
+    """The browsers can't set headers on websockets, the token can also be
+    sent in the ``access_token`` query parameter."""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            kind, _, token = value.decode("latin-1").partition(" ")
+
+            if kind.lower() == "bearer" and token:
+                return token
+
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+
+    return query.get("access_token", [None])[0]
+
+
+def _get_active_driver_id(token: str | None):
+    if token is None:
+        return None
+
+    user = get_user_by_access_token(token, ["read", "write"])
+
+    if user is None or not get_user_driver_eligibility(user.id):
+        return None
+
+    return Drivers.objects.values_list("id", flat=True).get(user=user)
+
+
+def _get_travel_state(token: str | None, travel_id: int) -> dict | None:
+    """Returns the serialized travel if the token's user is its rider or
+    driver, otherwise ``None``."""
+    if token is None:
+        return None
+
+    user = get_user_by_access_token(token, ["read", "write"])
+
+    if user is None:
+        return None
+
+    travel = Travel.objects.select_related("driver").filter(id=travel_id).first()
+
+    if travel is None:
+        return None
+
+    if travel.user_id != user.id and (
+        travel.driver is None or travel.driver.user_id != user.id
+    ):
+        return None
+
+    return TravelSerializer(travel).data
+
+
+def _get_request_travel_state(token: str | None, request_travel_id: int) -> dict | None:
+    """Returns the serialized request travel if the token's user is its
+    rider, otherwise ``None``."""
+    if token is None:
+        return None
+
+    user = get_user_by_access_token(token, ["read", "write"])
+
+    if user is None:
+        return None
+
+    request_travel = RequestTravel.objects.filter(
+        id=request_travel_id, user=user
+    ).first()
+
+    if request_travel is None:
+        return None
+
+    return RequestTravelSerializer(request_travel).data
+
+
+async def _send_json(send, message: dict) -> None:
+    await send(
+        {
+            "type": "websocket.send",
+            "text": json.dumps(message, cls=DjangoJSONEncoder),
+        }
+    )
+
+
+async def _forward_events(subscription, receive, send, is_final) -> None:
+    """Sends the subscription events until the client disconnects or an
+    ``is_final`` event is sent."""
+    receiving = asyncio.ensure_future(receive())
+    getting = asyncio.ensure_future(subscription.get(OVERFLOW_CHECK_SECONDS))
+
+    try:
+        while True:
+            done, _ = await asyncio.wait(
+                {receiving, getting}, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if getting in done:
+                event = getting.result()
+
+                if event is not None:
+                    await _send_json(send, event)
+
+                    if is_final(event):
+                        await send({"type": "websocket.close", "code": 1000})
+                        return
+                elif subscription.overflowed:
+                    await send(
+                        {"type": "websocket.close", "code": CLOSE_TRY_AGAIN_LATER}
+                    )
+                    return
+
+                getting = asyncio.ensure_future(
+                    subscription.get(OVERFLOW_CHECK_SECONDS)
+                )
+
+            if receiving in done:
+                if receiving.result()["type"] == "websocket.disconnect":
+                    return
+
+                # The clients don't send messages, they are ignored.
+                receiving = asyncio.ensure_future(receive())
+    finally:
+        receiving.cancel()
+        getting.cancel()
+
+
+async def travel_events(scope, receive, send, travel_id: int):
+    """Pushes the state transitions of a travel to its rider and driver.
+
+    The current state is sent first as a ``state`` event, then the
+    ``confirmed``, ``cancelled`` and ``finished`` events. The connection is
+    closed after the travel is cancelled or finished.
+    """
+    message = await receive()
+
+    if message["type"] != "websocket.connect":
+        return
+
+    token = _get_token(scope)
+
+    # Subscribed before reading the state so no transition is lost.
+    subscription = get_broker().subscribe(get_travel_channel(travel_id))
+
+    try:
+        travel = await database_sync_to_async(_get_travel_state)(token, travel_id)
+
+        if travel is None:
+            await send({"type": "websocket.close", "code": CLOSE_FORBIDDEN})
+            return
+
+        await send({"type": "websocket.accept"})
+        await _send_json(send, {"event": "state", "travel": travel})
+
+        if travel["status"] != Travel.IN_COURSE:
+            await send({"type": "websocket.close", "code": 1000})
+            return
+
+        await _forward_events(
+            subscription,
+            receive,
+            send,
+            lambda event: event["event"] in (TRAVEL_CANCELLED, TRAVEL_FINISHED),
+        )
+    finally:
+        subscription.close()
+
+
+async def request_travel_events(scope, receive, send, request_travel_id: int):
+    """Pushes the ``taken`` event of a request travel to its rider.
+
+    The current request travel is sent first as a ``state`` event. The
+    ``taken`` event carries the new travel, whose events are pushed by
+    ``travel_events``, and the connection is closed after it.
+    """
+    message = await receive()
+
+    if message["type"] != "websocket.connect":
+        return
+
+    token = _get_token(scope)
+
+    # Subscribed before reading the state so the taken event isn't lost.
+    subscription = get_broker().subscribe(get_request_travel_channel(request_travel_id))
+
+    try:
+        request_travel = await database_sync_to_async(_get_request_travel_state)(
+            token, request_travel_id
+        )
+
+        if request_travel is None:
+            await send({"type": "websocket.close", "code": CLOSE_FORBIDDEN})
+            return
+
+        await send({"type": "websocket.accept"})
+        await _send_json(send, {"event": "state", "request_travel": request_travel})
+
+        if request_travel["status"] != RequestTravel.PENDING:
+            await send({"type": "websocket.close", "code": 1000})
+            return
+
+        await _forward_events(
+            subscription, receive, send, lambda event: event["event"] == TRAVEL_TAKEN
+        )
+    finally:
+        subscription.close()
+
+
+async def driver_offers(scope, receive, send):
+    """Pushes the dispatch offers to the active driver of the token."""
+    message = await receive()
+
+    if message["type"] != "websocket.connect":
+        return
+
+    driver_id = await database_sync_to_async(_get_active_driver_id)(_get_token(scope))
+
+    if driver_id is None:
+        await send({"type": "websocket.close", "code": CLOSE_FORBIDDEN})
+        return
+
+    subscription = get_broker().subscribe(get_driver_channel(driver_id))
+
+    try:
+        await send({"type": "websocket.accept"})
+        await _forward_events(subscription, receive, send, lambda event: False)
+    finally:
+        subscription.close()
+
+
+websocket_urlpatterns = [
+    path("ws/travel/<int:travel_id>/", travel_events, name="travel_events"),
+    path(
+        "ws/request-travel/<int:request_travel_id>/",
+        request_travel_events,
+        name="request_travel_events",
+    ),
+    path("ws/offers/", driver_offers, name="driver_offers"),
+]
@@ -5,13 +5,16 @@ from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
 from django.core import exceptions
 
+from apps.metrics.serializers import MeasuredSerializerMixin
 from apps.users.models import User
-from apps.users.tasks import send_verification_email
+from apps.outbox.services import enqueue_task
+from apps.users.services import get_verification_email
+from apps.users.tasks import send_emails_to_users
 
 from rest_framework import serializers
 
 
-class UserModelReadSerializer(ModelSerializer):
+class UserModelReadSerializer(MeasuredSerializerMixin, ModelSerializer):
     class Meta:
         model = User
         fields = (
@@ -69,6 +72,6 @@ class UserRegisterSerializer(ModelSerializer):
         validated_data.pop("confirm_password")
         user = get_user_model().objects.create_user(**validated_data)
 
-        send_verification_email.delay(user.id)
+        enqueue_task(send_emails_to_users.name, [get_verification_email(user)])
 
         return user
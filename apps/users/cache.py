@@ -0,0 +1,168 @@
+import hashlib
+
+from oauth2_provider.models import get_access_token_model, get_application_model
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils import timezone
+
+from apps.cache import LocalTTLCache
+
+_local_cache: LocalTTLCache | None = None
+
+
+def _get_config() -> dict:
+    return getattr(settings, "ACCESS_TOKEN_CACHE", {})
+
+
+def _get_local_cache() -> LocalTTLCache:
+    global _local_cache
+
+    if _local_cache is None:
+        config = _get_config()
+        _local_cache = LocalTTLCache(
+            max_size=config.get("MAX_SIZE", 10000),
+            ttl=config.get("LOCAL_TTL", 30),
+        )
+
+    return _local_cache
+
+
+def _get_shared_cache():
+    alias = _get_config().get("CACHE_ALIAS", None)
+
+    return caches[alias] if alias else None
+
+
+def _make_key(token: str) -> str:
+    return "access_token:{0}".format(hashlib.sha256(token.encode()).hexdigest())
+
+
+# Only these fields are cached, never the token string nor the user row with
+# its credentials. The user fields are the ones the permissions and the user
+# serializers read, the others (password, last_login, date_joined) cost a query
+# per field read.
+_ACCESS_TOKEN_FIELDS = ("id", "user_id", "application_id", "scope", "expires")
+_USER_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "is_active",
+    "is_verified",
+    "is_staff",
+    "is_superuser",
+)
+
+
+def _serialize_access_token(access_token) -> dict:
+    user = access_token.user
+    data = {field: getattr(access_token, field) for field in _ACCESS_TOKEN_FIELDS}
+    data["user"] = (
+        {field: getattr(user, field) for field in _USER_FIELDS} if user else None
+    )
+
+    return data
+
+
+def _from_db(model, data: dict):
+    # The fields left out are deferred, they are loaded if they are read.
+    field_names = [
+        field.attname for field in model._meta.concrete_fields if field.attname in data
+    ]
+
+    return model.from_db(None, field_names, [data[name] for name in field_names])
+
+
+def _deserialize_access_token(token: str, data: dict):
+    access_token = _from_db(
+        get_access_token_model(),
+        {"token": token, **{field: data[field] for field in _ACCESS_TOKEN_FIELDS}},
+    )
+    access_token.user = (
+        _from_db(get_user_model(), data["user"]) if data["user"] else None
+    )
+    access_token.application = (
+        _from_db(get_application_model(), {"id": data["application_id"]})
+        if data["application_id"] is not None
+        else None
+    )
+
+    return access_token
+
+
+def get_cached_access_token(token: str):
+    """Returns the cached access token or ``None``, rebuilt with its user and
+    application from the cached fields without queries. The other fields of
+    the user and the application are loaded if they are read."""
+    config = _get_config()
+
+    if not config.get("ENABLED", False):
+        return None
+
+    key = _make_key(token)
+    data = _get_local_cache().get(key)
+
+    if data is None:
+        shared_cache = _get_shared_cache()
+
+        if shared_cache is not None:
+            data = shared_cache.get(key)
+
+        if data is None:
+            return None
+
+        _get_local_cache().set(key, data, _get_ttl(data, "LOCAL_TTL"))
+
+    return _deserialize_access_token(token, data)
+
+
+def _get_ttl(data: dict, ttl_key: str) -> float:
+    expires_in = (data["expires"] - timezone.now()).total_seconds()
+
+    return min(_get_config().get(ttl_key, 30), expires_in)
+
+
+def cache_access_token(token: str, access_token) -> None:
+    if not _get_config().get("ENABLED", False):
+        return
+
+    data = _serialize_access_token(access_token)
+    local_ttl = _get_ttl(data, "LOCAL_TTL")
+
+    if local_ttl <= 0:
+        return
+
+    key = _make_key(token)
+    _get_local_cache().set(key, data, local_ttl)
+
+    shared_cache = _get_shared_cache()
+
+    if shared_cache is not None:
+        shared_cache.set(key, data, _get_ttl(data, "CACHE_TTL"))
+
+
+def invalidate_access_token(token: str) -> None:
+    key = _make_key(token)
+
+    _get_local_cache().delete(key)
+
+    shared_cache = _get_shared_cache()
+
+    if shared_cache is not None:
+        shared_cache.delete(key)
+
+
+def get_user_access_tokens(user_id) -> list[str]:
+    """Returns the access tokens of the user that may be cached, to invalidate
+    them once the user changes."""
+    if not _get_config().get("ENABLED", False):
+        return []
+
+    return list(
+        get_access_token_model()
+        .objects.filter(user_id=user_id)
+        .values_list("token", flat=True)
+    )
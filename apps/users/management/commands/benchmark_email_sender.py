@@ -0,0 +1,129 @@
+import socketserver
+import tempfile
+import threading
+import time
+
+from django.core.mail import get_connection, send_mail
+from django.core.management.base import BaseCommand
+
+from apps.mail import make_email, send_emails
+
+
+class SMTPStandInHandler(socketserver.StreamRequestHandler):
+    """Accepts and drops every email, ``server.connect_delay`` stands in for
+    the TCP and TLS handshakes of a remote server."""
+
+    def _reply(self, reply: str) -> None:
+        self.wfile.write(reply.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        time.sleep(self.server.connect_delay)
+        self._reply("220 localhost ESMTP stand-in")
+        in_data = False
+
+        for line in self.rfile:
+            if in_data:
+                if line.rstrip(b"\r\n") == b".":
+                    in_data = False
+                    self._reply("250 OK")
+
+                continue
+
+            command = line[:4].upper()
+
+            if command == b"EHLO":
+                self._reply("250-localhost\r\n250 8BITMIME")
+            elif command == b"DATA":
+                in_data = True
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+            elif command == b"QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("250 OK")
+
+
+class SMTPStandInServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, connect_delay: float):
+        super().__init__(("127.0.0.1", 0), SMTPStandInHandler)
+        self.connect_delay = connect_delay
+
+
+class Command(BaseCommand):
+    help = (
+        "Times sending emails with a connection per email, as send_mail does, "
+        "against a single connection per batch, over the locmem, file and SMTP "
+        "backends. The SMTP backend talks to a local stand-in server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--emails", type=int, default=1000)
+        parser.add_argument(
+            "--connect-delay",
+            type=float,
+            default=0.02,
+            help="Seconds the SMTP stand-in waits before greeting a connection.",
+        )
+
+    def _time(self, function) -> float:
+        start = time.perf_counter()
+        function()
+
+        return time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        emails_num = options["emails"]
+        emails = [
+            make_email("subject {0}".format(i), "message", ["test@example.com"])
+            for i in range(emails_num)
+        ]
+
+        server = SMTPStandInServer(options["connect_delay"])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        with tempfile.TemporaryDirectory() as file_path:
+            backends = [
+                ("locmem", "django.core.mail.backends.locmem.EmailBackend", {}),
+                (
+                    "file",
+                    "django.core.mail.backends.filebased.EmailBackend",
+                    {"file_path": file_path},
+                ),
+                (
+                    "smtp",
+                    "django.core.mail.backends.smtp.EmailBackend",
+                    {"host": "127.0.0.1", "port": server.server_address[1]},
+                ),
+            ]
+
+            for name, backend, backend_options in backends:
+                per_email = self._time(
+                    lambda: [
+                        send_mail(
+                            subject=email["subject"],
+                            message=email["message"],
+                            from_email=None,
+                            recipient_list=email["recipient_list"],
+                            connection=get_connection(backend, **backend_options),
+                        )
+                        for email in emails
+                    ]
+                )
+                batched = self._time(
+                    lambda: send_emails(
+                        emails, connection=get_connection(backend, **backend_options)
+                    )
+                )
+
+                self.stdout.write(
+                    "{0}: connection per email {1:.0f} emails/s, one connection "
+                    "{2:.0f} emails/s".format(
+                        name, emails_num / per_email, emails_num / batched
+                    )
+                )
+
+        server.shutdown()
+        server.server_close()
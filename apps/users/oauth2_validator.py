@@ -3,6 +3,8 @@ from oauth2_provider.oauth2_validators import OAuth2Validator
 from django.contrib.auth import authenticate
 from django.http import HttpRequest
 
+from apps.users.cache import get_cached_access_token, cache_access_token
+
 
 class CustomOAuth2Validator(OAuth2Validator):
     def validate_user(self, username, password, client, request, *args, **kwargs):
@@ -21,3 +23,14 @@ class CustomOAuth2Validator(OAuth2Validator):
             return True
 
         return False
+
+    def _load_access_token(self, token):
+        access_token = get_cached_access_token(token)
+
+        if access_token is None:
+            access_token = super()._load_access_token(token)
+
+            if access_token is not None:
+                cache_access_token(token, access_token)
+
+        return access_token
@@ -1,9 +1,15 @@
+from datetime import timedelta
 from uuid import UUID
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 
 from apps.users.models import User
 from apps.users.exceptions import UserNotFound
+from apps.users.oauth2_validator import CustomOAuth2Validator
+from apps.users.security import create_jwt_token
+from apps.mail import make_email
 
 
 def get_user_by_id(user_id: UUID) -> User:
@@ -15,3 +21,35 @@ def get_user_by_id(user_id: UUID) -> User:
         raise UserNotFound
 
     return user
+
+
+def get_user_by_access_token(token: str, scopes: list[str]) -> User | None:
+    """Returns the active user of a valid access token with ``scopes``, for the
+    connections outside of the rest framework authentication."""
+    access_token = CustomOAuth2Validator()._load_access_token(token)
+
+    if access_token is None or not access_token.is_valid(scopes):
+        return None
+
+    if access_token.user is None or not access_token.user.is_active:
+        return None
+
+    return access_token.user
+
+
+def get_verification_email(user: User) -> dict:
+    payload = {"user_username": user.username, "type": "_email_confirmation"}
+
+    verify_token = create_jwt_token(payload, settings.JWT_SECRET_KEY, timedelta(days=1))
+
+    message = """
+    Hello, {0}
+
+    If you want to use the API you must verify your account.
+
+    To do that make a POST request in {1} with this token:
+
+    {2}
+    """.format(user.username, reverse("users:user_verify"), verify_token)
+
+    return make_email("Email Verification!", message, [user.email])
@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from oauth2_provider.models import get_access_token_model
+
+from apps.users.cache import get_user_access_tokens, invalidate_access_token
+
+
+@receiver(post_save, sender=get_access_token_model())
+@receiver(post_delete, sender=get_access_token_model())
+def invalidate_cached_access_token(sender, instance, **kwargs):
+    token = instance.token
+
+    invalidate_access_token(token)
+    transaction.on_commit(lambda: invalidate_access_token(token))
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_cached_user_access_tokens(sender, instance, created, **kwargs):
+    # The cached tokens carry the user fields, eg: is_active. Deleting the user
+    # deletes its tokens, the receiver above invalidates them.
+    if created:
+        return
+
+    tokens = get_user_access_tokens(instance.id)
+
+    def invalidate():
+        for token in tokens:
+            invalidate_access_token(token)
+
+    invalidate()
+    transaction.on_commit(invalidate)
@@ -1,17 +1,13 @@
 import logging
 
-from datetime import timedelta
-
 from celery import shared_task
 
-from django.core.mail import send_mail
-from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.urls import reverse_lazy
 
 from oauth2_provider.models import clear_expired
 
-from apps.users.security import create_jwt_token
+from apps.mail import send_emails
+from apps.users.services import get_verification_email
 
 logger = logging.getLogger(__name__)
 
@@ -19,38 +15,38 @@ logger = logging.getLogger(__name__)
 @shared_task(bind=True)
 def send_verification_email(self, user_pk):
     user = get_user_model().objects.get(pk=user_pk)
-    payload = {"user_username": user.username, "type": "_email_confirmation"}
 
-    verify_token = create_jwt_token(payload, settings.JWT_SECRET_KEY, timedelta(days=1))
+    try:
+        failed = send_emails([get_verification_email(user)])
+    except Exception as e:
+        raise self.retry(exc=e, countdown=5)
 
-    subject = "Email Verification!"
-    from_email = settings.EMAIL_HOST_USER
-    message = """
-    Hello, {0}
+    if failed:
+        raise self.retry(countdown=5)
 
-    If you want to use the API you must verify your account.
+    logger.info("Email sent to {}".format(user.email))
 
-    To do that make a POST request in {1} with this token:
+    return "Email Sent"
 
-    {2}
-    """.format(
-        user.username, reverse_lazy("users:user_verify"), verify_token
-    )
 
+@shared_task(bind=True)
+def send_emails_to_users(self, emails: list[dict]):
+    """Sends the ``apps.mail.make_email`` emails over one connection, the
+    outbox relay coalesces the calls made within its interval. Only the
+    failed emails are retried."""
     try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=from_email,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
+        failed = send_emails(emails)
     except Exception as e:
         raise self.retry(exc=e, countdown=5)
 
-    logger.info("Email sent to {}".format(user.email))
+    sent_num = len(emails) - len(failed)
 
-    return "Email Sent"
+    logger.info("{0} emails sent".format(sent_num))
+
+    if failed:
+        raise self.retry(args=(failed,), countdown=5)
+
+    return "{0} emails sent".format(sent_num)
 
 
 @shared_task
@@ -0,0 +1,143 @@
+from datetime import timedelta
+
+from oauth2_provider.models import get_application_model, get_access_token_model
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.urls import reverse_lazy
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from apps.users.cache import _get_local_cache, _make_key, invalidate_access_token
+from apps.users.oauth2_validator import CustomOAuth2Validator
+
+TOKEN = "secret-access-token-key"
+
+
+class BaseAccessTokenTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="passwdo",
+            email="testemail@gmail.com",
+            first_name="pablo",
+            last_name="pedro",
+            is_active=True,
+        )
+        app_model = get_application_model()
+        app = app_model.objects.create(
+            client_type=app_model.CLIENT_CONFIDENTIAL,
+            authorization_grant_type=app_model.GRANT_PASSWORD,
+            name="dummy",
+            user=self.user,
+        )
+        self.access_token = get_access_token_model().objects.create(
+            user=self.user,
+            scope="read write",
+            expires=timezone.now() + timedelta(seconds=300),
+            token=TOKEN,
+            application=app,
+        )
+        self.validator = CustomOAuth2Validator()
+
+    def tearDown(self) -> None:
+        invalidate_access_token(TOKEN)
+
+
+class AccessTokenCacheTestCase(BaseAccessTokenTestCase):
+    def test_load_access_token_cached(self):
+        access_token = self.validator._load_access_token(TOKEN)
+
+        with self.assertNumQueries(0):
+            cached_access_token = self.validator._load_access_token(TOKEN)
+
+        self.assertEqual(cached_access_token.id, access_token.id)
+        self.assertEqual(cached_access_token.user, self.user)
+        self.assertEqual(cached_access_token.scope, "read write")
+        self.assertIsNot(cached_access_token.user, access_token.user)
+
+    def test_cached_fields(self):
+        self.validator._load_access_token(TOKEN)
+
+        data = _get_local_cache().get(_make_key(TOKEN))
+
+        self.assertEqual(data["user"]["id"], self.user.id)
+        self.assertNotIn("password", data["user"])
+        self.assertNotIn("token", data)
+
+        cached_access_token = self.validator._load_access_token(TOKEN)
+
+        self.assertTrue(cached_access_token.is_valid(["read", "write"]))
+        self.assertTrue(cached_access_token.user.is_active)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_access_token.user.email, self.user.email)
+
+        # The fields that aren't cached are loaded on access.
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                cached_access_token.user.date_joined, self.user.date_joined
+            )
+
+    def test_revoked_access_token(self):
+        self.validator._load_access_token(TOKEN)
+
+        self.access_token.revoke()
+
+        self.assertIsNone(self.validator._load_access_token(TOKEN))
+
+    def test_deactivated_user(self):
+        self.validator._load_access_token(TOKEN)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertIsNone(_get_local_cache().get(_make_key(TOKEN)))
+        self.assertFalse(self.validator._load_access_token(TOKEN).user.is_active)
+
+    def test_expired_access_token_not_cached(self):
+        self.access_token.expires = timezone.now() - timedelta(seconds=1)
+        self.access_token.save()
+
+        self.validator._load_access_token(TOKEN)
+
+        with self.assertNumQueries(1):
+            access_token = self.validator._load_access_token(TOKEN)
+
+        self.assertFalse(access_token.is_valid())
+
+    @override_settings(ACCESS_TOKEN_CACHE={"ENABLED": False})
+    def test_cache_disabled(self):
+        self.validator._load_access_token(TOKEN)
+
+        with self.assertNumQueries(1):
+            self.validator._load_access_token(TOKEN)
+
+
+class AuthenticatedRequestQueriesTestCase(BaseAccessTokenTestCase):
+    """Queries issued by an authenticated request with and without the cache."""
+
+    def _count_request_queries(self):
+        client = APIClient()
+
+        with CaptureQueriesContext(connection) as context:
+            res = client.get(
+                reverse_lazy("travels:request_travel_user_list"),
+                headers={"Authorization": "Bearer {0}".format(TOKEN)},
+            )
+
+        self.assertEqual(res.status_code, 200)
+
+        return len(context.captured_queries)
+
+    def test_authenticated_request_queries(self):
+        with self.settings(ACCESS_TOKEN_CACHE={"ENABLED": False}):
+            uncached = self._count_request_queries()
+
+        self._count_request_queries()
+        cached = self._count_request_queries()
+
+        self.assertEqual(cached, uncached - 1)
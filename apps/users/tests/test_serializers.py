@@ -7,6 +7,7 @@ from django.conf import settings
 
 from riding.celery import app
 
+from apps.outbox.services import relay_outbox_messages
 from apps.users.api.serializers.user_serializer import UserRegisterSerializer
 from apps.users.api.serializers.token_serializer import TokenVerificationSerializer
 
@@ -33,7 +34,11 @@ class UserRegisterSerializerTestCase(TestCase):
         q = get_user_model().objects.get(username=payload["username"])
 
         self.assertEqual(q.username, u.username)
+
+        relay_outbox_messages()
+
         self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, "Email Verification!")
 
     def test_invalid_password_match(self):
         payload = {
@@ -1,11 +1,25 @@
-from django.test import TestCase
+from unittest.mock import patch
+
+from celery.exceptions import Retry
+
+from django.test import TestCase, override_settings
 from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
 from django.contrib.auth import get_user_model
 
-from apps.users.tasks import send_verification_email
+from apps.mail import make_email
+from apps.users.tasks import send_emails_to_users, send_verification_email
 from riding.celery import app
 
 
+class FailingEmailBackend(EmailBackend):
+    def send_messages(self, messages):
+        if any(message.subject == "fail" for message in messages):
+            raise ConnectionError
+
+        return super().send_messages(messages)
+
+
 class SendVerificationEmailTestCase(TestCase):
     def setUp(self) -> None:
         app.conf.update(CELERY_TASK_ALWAYS_EAGER=True)
@@ -25,3 +39,38 @@ class SendVerificationEmailTestCase(TestCase):
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].subject, "Email Verification!")
         self.assertIn(user.username, mail.outbox[0].body)
+
+
+class SendEmailsToUsersTestCase(TestCase):
+    def setUp(self) -> None:
+        app.conf.update(CELERY_TASK_ALWAYS_EAGER=True)
+
+    def test_send_emails_to_users(self):
+        emails = [
+            make_email("subject {0}".format(i), "message", ["a@gmail.com"])
+            for i in range(3)
+        ]
+
+        result = send_emails_to_users.delay(emails)
+
+        self.assertEqual(result.get(), "3 emails sent")
+        self.assertEqual(
+            [email.subject for email in mail.outbox],
+            ["subject 0", "subject 1", "subject 2"],
+        )
+
+    @override_settings(EMAIL_BACKEND="apps.users.tests.test_tasks.FailingEmailBackend")
+    def test_retry_failed_emails(self):
+        emails = [
+            make_email(subject, "message", ["a@gmail.com"])
+            for subject in ("subject 0", "fail", "subject 2")
+        ]
+
+        with patch.object(send_emails_to_users, "retry", side_effect=Retry) as mock:
+            with self.assertRaises(Retry):
+                send_emails_to_users(emails)
+
+        mock.assert_called_once_with(args=([emails[1]],), countdown=5)
+        self.assertEqual(
+            [email.subject for email in mail.outbox], ["subject 0", "subject 2"]
+        )
@@ -8,6 +8,7 @@ from django.conf import settings
 
 from rest_framework.test import APIClient
 
+from apps.outbox.services import relay_outbox_messages
 from apps.users.security import create_jwt_token
 
 from riding.celery import app
@@ -18,7 +19,7 @@ class TestUserRegisterView(TestCase):
         self,
     ) -> None:
         self.factory = APIClient()
-        app.conf.update(CELERY_ALWAYS_EAGER=True)
+        app.conf.update(CELERY_TASK_ALWAYS_EAGER=True)
 
     def test_user_creation(self):
         payload = {
@@ -35,6 +36,8 @@ class TestUserRegisterView(TestCase):
         )
         u = get_user_model().objects.get(email=payload["email"])
 
+        relay_outbox_messages()
+
         self.assertEqual(res.status_code, 201)
         self.assertEqual(len(mail.outbox), 1)
         self.assertIsNotNone(res.data.get("username"))
@@ -13,4 +13,17 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "riding.settings.local")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up.
+from apps.events.routing import WebSocketRouter  # noqa: E402
+from apps.travels.websocket import websocket_urlpatterns  # noqa: E402
+
+websocket_application = WebSocketRouter(websocket_urlpatterns)
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        return await websocket_application(scope, receive, send)
+
+    return await django_application(scope, receive, send)
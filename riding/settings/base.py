@@ -47,6 +47,8 @@ LOCAL_APPS = [
     "apps.users.apps.UsersConfig",
     "apps.drivers.apps.DriversConfig",
     "apps.travels.apps.TravelsConfig",
+    "apps.metrics.apps.MetricsConfig",
+    "apps.outbox.apps.OutboxConfig",
 ]
 
 THIRD_APPS = [
@@ -93,6 +95,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 # middlewares
 MIDDLEWARE = [
+    "apps.metrics.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -102,6 +105,36 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# query budgets
+# Maximum queries per request by URL name, RequestMetricsMiddleware logs the
+# requests over budget and QueryBudgetTestMixin fails the tests.
+QUERY_BUDGETS = {
+    "travels:request_travel_list": 4,
+    "travels:request_travel_user_list": 2,
+    "travels:request_travel_create": 2,
+    "travels:request_travel_bulk_create": 2,
+    "travels:travel_take_request_travel": 9,
+    "travels:travel_retrieve": 2,
+    "travels:travel_cancel": 4,
+    "travels:travel_finish": 5,
+    "drivers:driver_location": 4,
+}
+
+# metrics
+# The /metrics/ endpoint only answers the requests with the "Authorization:
+# Bearer TOKEN" header and the ALLOWED_IPS clients (the Prometheus servers),
+# none by default. The client address is REMOTE_ADDR, or behind a proxy the
+# last address of the CLIENT_IP_HEADER (eg: X-Forwarded-For) the proxy sets,
+# otherwise every request through the proxy has its address. The database
+# gauges are counted at most every REFRESH_SECONDS, the scrapes in between get
+# the last counts.
+METRICS = {
+    "ALLOWED_IPS": env.list("METRICS_ALLOWED_IPS", default=[]),
+    "CLIENT_IP_HEADER": env("METRICS_CLIENT_IP_HEADER", default=None),
+    "TOKEN": env("METRICS_TOKEN", default=None),
+    "REFRESH_SECONDS": env.int("METRICS_REFRESH_SECONDS", default=60),
+}
+
 # templates
 TEMPLATES = [
     {
@@ -184,6 +217,138 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.travels.tasks.clear_expired_req_travels",
         "schedule": 7200,
     },
+    "relay_outbox": {
+        "task": "apps.outbox.tasks.relay_outbox",
+        "schedule": env.float("OUTBOX_RELAY_INTERVAL", default=1),
+    },
+    "match_request_travels": {
+        "task": "apps.travels.tasks.match_request_travels",
+        "schedule": env.int("REQUEST_TRAVEL_BATCH_MATCHING_INTERVAL", default=10),
+    },
+}
+
+# outbox
+# Celery task calls saved with the database transactions, the relay sends up to
+# BATCH_SIZE of them per run. Run the relay_outbox command or the Celery beat
+# task every RELAY_INTERVAL seconds. The calls of the COALESCED_TASKS in a run
+# are merged into one, so their emails share a single SMTP connection.
+OUTBOX = {
+    "BATCH_SIZE": env.int("OUTBOX_BATCH_SIZE", default=500),
+    "RELAY_INTERVAL": env.float("OUTBOX_RELAY_INTERVAL", default=1),
+    "COALESCED_TASKS": ["apps.users.tasks.send_emails_to_users"],
+}
+
+# request travels spatial index
+# In-process grid index used to answer the drivers radius queries without
+# PostGIS. Each process refreshes it from the database every REFRESH_SECONDS.
+# A process applies at once only the changes committed by itself, so a request
+# travel taken, cancelled or created through another worker is listed (or
+# missing) there for up to REFRESH_SECONDS, a stale take fails with 404.
+REQUEST_TRAVEL_INDEX = {
+    "ENABLED": env.bool("REQUEST_TRAVEL_INDEX_ENABLED", default=False),
+    "CELL_SIZE": env.float("REQUEST_TRAVEL_INDEX_CELL_SIZE", default=0.1),
+    "REFRESH_SECONDS": env.int("REQUEST_TRAVEL_INDEX_REFRESH_SECONDS", default=30),
+}
+
+# expired request travels sweeper
+REQUEST_TRAVEL_SWEEPER = {
+    "BATCH_SIZE": env.int("REQUEST_TRAVEL_SWEEPER_BATCH_SIZE", default=1000),
+    "TIME_BUDGET": env.int("REQUEST_TRAVEL_SWEEPER_TIME_BUDGET", default=60),
+    "RESCHEDULE_COUNTDOWN": env.int(
+        "REQUEST_TRAVEL_SWEEPER_RESCHEDULE_COUNTDOWN", default=10
+    ),
+}
+
+# request travels dispatch
+# Offers the new request travels to their CANDIDATES nearest drivers located in
+# the last LOCATION_MAX_AGE seconds within RADIUS km, one at a time for
+# OFFER_TIMEOUT seconds each.
+REQUEST_TRAVEL_DISPATCH = {
+    "ENABLED": env.bool("REQUEST_TRAVEL_DISPATCH_ENABLED", default=False),
+    "CANDIDATES": env.int("REQUEST_TRAVEL_DISPATCH_CANDIDATES", default=5),
+    "RADIUS": env.int("REQUEST_TRAVEL_DISPATCH_RADIUS", default=10),
+    "OFFER_TIMEOUT": env.int("REQUEST_TRAVEL_DISPATCH_OFFER_TIMEOUT", default=15),
+    "LOCATION_MAX_AGE": env.int("REQUEST_TRAVEL_DISPATCH_LOCATION_MAX_AGE", default=60),
+}
+
+# request travels batch matching
+# Periodically offers the request travels without offers to the idle drivers at
+# once, minimizing the total pickup distance. Uses the RADIUS, OFFER_TIMEOUT and
+# LOCATION_MAX_AGE of REQUEST_TRAVEL_DISPATCH, the matrix solved has up to
+# MAX_REQUEST_TRAVELS x MAX_DRIVERS distances.
+REQUEST_TRAVEL_BATCH_MATCHING = {
+    "ENABLED": env.bool("REQUEST_TRAVEL_BATCH_MATCHING_ENABLED", default=False),
+    "MAX_REQUEST_TRAVELS": env.int(
+        "REQUEST_TRAVEL_BATCH_MATCHING_MAX_REQUEST_TRAVELS", default=2000
+    ),
+    "MAX_DRIVERS": env.int("REQUEST_TRAVEL_BATCH_MATCHING_MAX_DRIVERS", default=2000),
+}
+
+# request travels bulk creation
+# Request travels accepted per bulk creation request.
+REQUEST_TRAVEL_BULK_CREATE = {
+    "MAX_BATCH_SIZE": env.int("REQUEST_TRAVEL_BULK_CREATE_MAX_BATCH_SIZE", default=500),
+}
+
+# request travels pagination
+REQUEST_TRAVEL_PAGINATION = {
+    "PAGE_SIZE": env.int("REQUEST_TRAVEL_PAGE_SIZE", default=20),
+    "MAX_PAGE_SIZE": env.int("REQUEST_TRAVEL_MAX_PAGE_SIZE", default=100),
+}
+
+# events broker
+# Publish/subscribe backend of the streams and websockets, the in memory broker
+# only reaches the subscribers of the same process. Use
+# apps.events.backends.RedisBroker with {"url": "redis://..."} options to reach
+# every process.
+EVENTS_BROKER = {
+    "BACKEND": env(
+        "EVENTS_BROKER_BACKEND", default="apps.events.backends.InMemoryBroker"
+    ),
+    "OPTIONS": env.json("EVENTS_BROKER_OPTIONS", default={}),
+}
+
+# request travels stream
+# Seconds between keepalive comments, before the stream is closed and before
+# the clients reconnect. The events are published per CELL_SIZE degrees grid
+# cell, each stream only receives the cells around its radius.
+REQUEST_TRAVEL_STREAM = {
+    "KEEPALIVE": env.int("REQUEST_TRAVEL_STREAM_KEEPALIVE", default=15),
+    "MAX_DURATION": env.int("REQUEST_TRAVEL_STREAM_MAX_DURATION", default=300),
+    "RETRY": env.int("REQUEST_TRAVEL_STREAM_RETRY", default=3),
+    "CELL_SIZE": env.float("REQUEST_TRAVEL_STREAM_CELL_SIZE", default=0.5),
+}
+
+# driver location
+# Points accepted per request and whether every point is kept in the track
+# besides the latest location.
+DRIVER_LOCATION = {
+    "MAX_BATCH_SIZE": env.int("DRIVER_LOCATION_MAX_BATCH_SIZE", default=100),
+    "TRACK_ENABLED": env.bool("DRIVER_LOCATION_TRACK_ENABLED", default=False),
+}
+
+# driver eligibility cache
+# LOCAL_TTL bounds how long other processes can see a stale eligibility, set
+# CACHE_ALIAS to share the entries (and their invalidation) between processes.
+DRIVER_ELIGIBILITY_CACHE = {
+    "ENABLED": env.bool("DRIVER_ELIGIBILITY_CACHE_ENABLED", default=True),
+    "MAX_SIZE": env.int("DRIVER_ELIGIBILITY_CACHE_MAX_SIZE", default=10000),
+    "LOCAL_TTL": env.int("DRIVER_ELIGIBILITY_CACHE_LOCAL_TTL", default=5),
+    "CACHE_ALIAS": env("DRIVER_ELIGIBILITY_CACHE_ALIAS", default=None),
+    "CACHE_TTL": env.int("DRIVER_ELIGIBILITY_CACHE_TTL", default=300),
+}
+
+# idempotency keys
+# Responses of the requests sent with an Idempotency-Key header are replayed to
+# the retries for TTL seconds. The keys live in the CACHE_ALIAS cache, which
+# must be shared by all the processes (a retry may reach any worker), so it's
+# required to enable it. LOCK_TTL bounds how long a crashed first request
+# blocks its retries.
+IDEMPOTENCY = {
+    "ENABLED": env.bool("IDEMPOTENCY_ENABLED", default=False),
+    "TTL": env.int("IDEMPOTENCY_TTL", default=86400),
+    "LOCK_TTL": env.int("IDEMPOTENCY_LOCK_TTL", default=30),
+    "CACHE_ALIAS": env("IDEMPOTENCY_CACHE_ALIAS", default=None),
 }
 
 # JWT
@@ -202,12 +367,59 @@ REST_FRAMEWORK = {
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    "DEFAULT_THROTTLE_CLASSES": ["apps.throttling.ScopedTokenBucketThrottle"],
+}
+
+# throttling
+# Token bucket per user and view throttle_scope, each one allows bursts of up to
+# CAPACITY requests and refills RATE requests per second. The bulk creation
+# takes a token per request travel, its CAPACITY bounds the largest batch.
+# Without CACHE_ALIAS the buckets are kept per process, so N workers allow up
+# to N times the configured budget, set it to share them between processes.
+THROTTLING = {
+    "ENABLED": env.bool("THROTTLING_ENABLED", default=True),
+    "MAX_SIZE": env.int("THROTTLING_MAX_SIZE", default=100000),
+    "CACHE_ALIAS": env("THROTTLING_CACHE_ALIAS", default=None),
+    "SCOPES": {
+        "request_travel_list": {
+            "RATE": env.float("THROTTLING_REQUEST_TRAVEL_LIST_RATE", default=1),
+            "CAPACITY": env.int("THROTTLING_REQUEST_TRAVEL_LIST_CAPACITY", default=20),
+        },
+        "request_travel_create": {
+            "RATE": env.float("THROTTLING_REQUEST_TRAVEL_CREATE_RATE", default=0.2),
+            "CAPACITY": env.int(
+                "THROTTLING_REQUEST_TRAVEL_CREATE_CAPACITY", default=10
+            ),
+        },
+        "request_travel_bulk_create": {
+            "RATE": env.float("THROTTLING_REQUEST_TRAVEL_BULK_CREATE_RATE", default=1),
+            "CAPACITY": env.int(
+                "THROTTLING_REQUEST_TRAVEL_BULK_CREATE_CAPACITY", default=500
+            ),
+        },
+        "travel_take": {
+            "RATE": env.float("THROTTLING_TRAVEL_TAKE_RATE", default=0.5),
+            "CAPACITY": env.int("THROTTLING_TRAVEL_TAKE_CAPACITY", default=10),
+        },
+    },
 }
 
 OAUTH2_PROVIDER = {
     "OAUTH2_VALIDATOR_CLASS": "apps.users.oauth2_validator.CustomOAuth2Validator"
 }
 
+# access token cache
+# Revoked tokens and the tokens of a saved user are evicted by signals, from the
+# shared cache and the local cache of the process saving them. The other
+# processes see the change after LOCAL_TTL seconds.
+ACCESS_TOKEN_CACHE = {
+    "ENABLED": env.bool("ACCESS_TOKEN_CACHE_ENABLED", default=True),
+    "MAX_SIZE": env.int("ACCESS_TOKEN_CACHE_MAX_SIZE", default=10000),
+    "LOCAL_TTL": env.int("ACCESS_TOKEN_CACHE_LOCAL_TTL", default=30),
+    "CACHE_ALIAS": env("ACCESS_TOKEN_CACHE_ALIAS", default=None),
+    "CACHE_TTL": env.int("ACCESS_TOKEN_CACHE_TTL", default=300),
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Riding API",
     "VERSION": "1.0.0",
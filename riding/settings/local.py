@@ -10,3 +10,8 @@ DEBUG = True
 ALLOWED_HOSTS = ["*"]
 
 INSTALLED_APPS += ["django_extensions"]
+
+# The local Prometheus scrapes without a token.
+METRICS["ALLOWED_IPS"] = env.list(
+    "METRICS_ALLOWED_IPS", default=["127.0.0.1", "::1"]
+)
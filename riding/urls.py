@@ -40,4 +40,5 @@ urlpatterns = [
     path("drivers/", include("apps.drivers.urls"), name="drivers"),
     path("travels/", include("apps.travels.urls"), name="travels"),
     path("auth/", include("oauth2_provider.urls", namespace="oauth2_provider")),
+    path("metrics/", include("apps.metrics.urls"), name="metrics"),
 ]